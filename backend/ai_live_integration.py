@@ -13,6 +13,7 @@ from dotenv import load_dotenv
 
 # Import our data infrastructure
 from data.manager import DataManager
+from data.models import BarSeries, RequestPriority
 from data.providers.polygon import PolygonProvider
 
 # Import AI agents
@@ -165,7 +166,7 @@ class LiveMarketAnalyzer:
         for symbol in symbols:
             try:
                 # Get real-time quote
-                quote_response = await self.data_manager.get_quote(symbol)
+                quote_response = await self.data_manager.get_quote(symbol, priority=RequestPriority.LOW)
                 if quote_response.success:
                     quote = quote_response.data
                     market_data["quotes"][symbol] = {
@@ -188,27 +189,28 @@ class LiveMarketAnalyzer:
                 end_date = date.today()
                 start_date = end_date - timedelta(days=30)
                 
-                historical_response = await self.data_manager.get_historical_data(
-                    symbol, start_date, end_date, '1d'
+                historical_response = await self.data_manager.get_bar_series(
+                    symbol, start_date, end_date, '1d', priority=RequestPriority.LOW
                 )
                 
                 if historical_response.success and historical_response.data:
                     bars = historical_response.data
+                    latest = bars[-1]
                     market_data["historical_data"][symbol] = {
                         "bars_count": len(bars),
                         "date_range": f"{start_date} to {end_date}",
                         "latest_bar": {
-                            "date": bars[-1].timestamp.date().isoformat(),
-                            "close": float(bars[-1].close_price),
-                            "volume": bars[-1].volume
-                        } if bars else None,
-                        "price_trend": self._calculate_trend(bars) if bars else None
+                            "date": latest.timestamp.date().isoformat(),
+                            "close": float(latest.close_price),
+                            "volume": latest.volume
+                        },
+                        "price_trend": self._calculate_trend(bars)
                     }
                     print(f"    ✅ {symbol} historical: {len(bars)} bars")
                 
                 # Get options chain for major ETFs
                 if symbol in ['SPY', 'QQQ', 'IWM']:
-                    options_response = await self.data_manager.get_options_chain(symbol)
+                    options_response = await self.data_manager.get_options_chain(symbol, priority=RequestPriority.LOW)
                     if options_response.success and options_response.data:
                         chain = options_response.data
                         market_data["options_chains"][symbol] = {
@@ -240,15 +242,15 @@ class LiveMarketAnalyzer:
         
         return market_data
     
-    def _calculate_trend(self, bars: List[Any]) -> Dict[str, Any]:
+    def _calculate_trend(self, bars: BarSeries) -> Dict[str, Any]:
         """Calculate trend characteristics from historical bars"""
         if len(bars) < 5:
             return {"trend": "insufficient_data"}
         
         # Simple trend analysis
-        recent_prices = [float(bar.close_price) for bar in bars[-10:]]
-        first_price = recent_prices[0]
-        last_price = recent_prices[-1]
+        recent_prices = bars.tail(10).close
+        first_price = float(recent_prices[0])
+        last_price = float(recent_prices[-1])
         
         change_percent = ((last_price - first_price) / first_price) * 100
         
@@ -257,8 +259,8 @@ class LiveMarketAnalyzer:
             "trend_strength": "strong" if abs(change_percent) > 5 else "moderate" if abs(change_percent) > 2 else "weak",
             "change_percent": round(change_percent, 2),
             "price_range": {
-                "high": max(recent_prices),
-                "low": min(recent_prices)
+                "high": float(recent_prices.max()),
+                "low": float(recent_prices.min())
             }
         }
     
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark cache codecs for DataManager Redis entries
+Compares the legacy JSON path against msgpack (optionally compressed)
+on a synthetic SPY-sized options chain
+"""
+
+import argparse
+import json
+import time
+from datetime import datetime, date, timedelta
+from decimal import Decimal
+
+from data.codecs import JsonCodec, MsgpackCodec, msgpack, zstandard, lz4_frame
+from data.models import DataResponse, OptionsChain, OptionContract, Greeks, OptionType
+
+
+def build_chain_response(contracts: int) -> DataResponse:
+    """Build a synthetic options chain response with quotes and Greeks"""
+    now = datetime.now()
+    chain = OptionsChain(underlying_symbol="SPY", underlying_price=Decimal("512.34"), timestamp=now, source="bench")
+
+    expirations = [date.today() + timedelta(days=7 * i) for i in range(1, 9)]
+    per_expiration = max(contracts // (len(expirations) * 2), 1)
+
+    for expiration in expirations:
+        exp_contracts = []
+        for i in range(per_expiration):
+            strike = Decimal(400 + i)
+            for option_type in (OptionType.CALL, OptionType.PUT):
+                exp_contracts.append(OptionContract(
+                    symbol=f"O:SPY{expiration:%y%m%d}{option_type.value[0].upper()}{int(strike * 1000):08d}",
+                    underlying_symbol="SPY",
+                    option_type=option_type,
+                    strike_price=strike,
+                    expiration_date=expiration,
+                    days_to_expiration=(expiration - date.today()).days,
+                    bid=Decimal("1.23"),
+                    ask=Decimal("1.27"),
+                    last=Decimal("1.25"),
+                    mark=Decimal("1.25"),
+                    volume=1200 + i,
+                    open_interest=5400 + i,
+                    greeks=Greeks(
+                        delta=Decimal("0.4512"),
+                        gamma=Decimal("0.0123"),
+                        theta=Decimal("-0.0871"),
+                        vega=Decimal("0.2214"),
+                        implied_volatility=Decimal("0.1834")
+                    ),
+                    timestamp=now,
+                    source="bench"
+                ))
+        chain.expirations[expiration.isoformat()] = exp_contracts
+
+    chain.total_contracts = sum(len(c) for c in chain.expirations.values())
+    return DataResponse(success=True, data=chain, source="bench", timestamp=now)
+
+
+def legacy_encode(response: DataResponse) -> bytes:
+    """Encoding used by DataManager before cache codecs"""
+    return json.dumps(response.model_dump(), default=str).encode()
+
+
+def legacy_decode(data: bytes) -> DataResponse:
+    payload = json.loads(data)
+    payload['cached'] = True
+    return DataResponse(**payload)
+
+
+def bench_codec(name, encode, decode, response: DataResponse, rounds: int):
+    """Time encode and decode+rebuild for one codec"""
+    encoded = encode(response)
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        encode(response)
+    encode_ms = (time.perf_counter() - start) / rounds * 1000
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        decode(encoded)
+    decode_ms = (time.perf_counter() - start) / rounds * 1000
+
+    print(f"  {name:<16} {len(encoded) / 1024:>10.1f} KB {encode_ms:>10.1f} ms {decode_ms:>12.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark DataManager cache codecs")
+    parser.add_argument("--contracts", type=int, default=8000, help="Contracts in the synthetic chain")
+    parser.add_argument("--rounds", type=int, default=5, help="Timing rounds per codec")
+    args = parser.parse_args()
+
+    response = build_chain_response(args.contracts)
+    print(f"🧪 Cache codec benchmark: {response.data.total_contracts} contracts, {args.rounds} rounds")
+    print(f"  {'codec':<16} {'size':>13} {'encode':>13} {'decode+model':>15}")
+
+    bench_codec("legacy json", legacy_encode, legacy_decode, response, args.rounds)
+
+    codecs = [JsonCodec()]
+    if msgpack:
+        codecs.append(MsgpackCodec())
+        if zstandard:
+            codecs.append(MsgpackCodec(compression='zstd'))
+        if lz4_frame:
+            codecs.append(MsgpackCodec(compression='lz4'))
+    else:
+        print("  ⚠️ msgpack not installed, skipping binary codecs")
+
+    for codec in codecs:
+        def encode(r, codec=codec):
+            return codec.encode(r.model_dump())
+
+        def decode(data, codec=codec):
+            payload = codec.decode(data)
+            payload['cached'] = True
+            return DataResponse(**payload)
+
+        bench_codec(codec.key_prefix, encode, decode, response, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
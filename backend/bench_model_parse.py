@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Benchmark provider payload parsing into data models
+Compares validated pydantic construction (the previous provider path)
+against the trusted construction path on synthetic Polygon payloads
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime, date, timedelta
+
+from data.models import HistoricalBar, OptionContract, Greeks, OptionType, MARKET_TIMEZONE, NUMERIC_MODE, to_price
+from data.providers.polygon import PolygonProvider
+
+
+def build_aggregate_results(count: int) -> list:
+    """Synthetic /v2/aggs results (one minute bars)"""
+    start = int(datetime(2024, 1, 2, 9, 30).timestamp() * 1000)
+    price = 470.0
+    results = []
+    for i in range(count):
+        price = max(price * (1 + random.gauss(0, 0.001)), 1.0)
+        results.append({
+            'o': round(price, 2),
+            'h': round(price * 1.001, 2),
+            'l': round(price * 0.999, 2),
+            'c': round(price * (1 + random.gauss(0, 0.0005)), 4),
+            'v': float(random.randint(1_000, 2_000_000)),
+            'vw': round(price, 4),
+            't': start + i * 60_000,
+            'n': random.randint(10, 5_000)
+        })
+    return results
+
+
+def build_chain_results(count: int) -> tuple:
+    """Synthetic /v3/reference/options/contracts and /v3/snapshot/options results"""
+    expirations = [date.today() + timedelta(days=7 * i) for i in range(1, 11)]
+    per_expiration = max(count // (len(expirations) * 2), 1)
+
+    references, snapshots = [], []
+    for expiration in expirations:
+        for i in range(per_expiration):
+            strike = 4000 + 5 * i
+            for contract_type in ('call', 'put'):
+                ticker = f"O:SPX{expiration:%y%m%d}{contract_type[0].upper()}{strike * 1000:08d}"
+                references.append({
+                    'ticker': ticker,
+                    'underlying_ticker': 'SPX',
+                    'strike_price': strike,
+                    'expiration_date': expiration.isoformat(),
+                    'contract_type': contract_type
+                })
+                snapshots.append({
+                    'details': {'ticker': ticker},
+                    'last_quote': {'bid': 12.3, 'ask': 12.7, 'midpoint': 12.5},
+                    'last_trade': {'price': 12.45},
+                    'day': {'volume': random.randint(0, 5_000), 'close': 12.45},
+                    'open_interest': random.randint(0, 20_000),
+                    'implied_volatility': 0.1834,
+                    'greeks': {'delta': 0.4512, 'gamma': 0.0123, 'theta': -0.0871, 'vega': 0.2214}
+                })
+    return references, snapshots
+
+
+def legacy_parse_bar(symbol: str, data: dict) -> HistoricalBar:
+    """Bar parsing used by PolygonProvider before trusted construction"""
+    return HistoricalBar(
+        symbol=symbol,
+        timestamp=datetime.fromtimestamp(data['t'] / 1000, MARKET_TIMEZONE),
+        open_price=to_price(data['o']),
+        high=to_price(data['h']),
+        low=to_price(data['l']),
+        close_price=to_price(data['c']),
+        volume=data['v']
+    )
+
+
+def legacy_parse_contract(reference: dict, snapshot: dict) -> OptionContract:
+    """Contract parsing and snapshot enrichment with validated models"""
+    def price(value):
+        return to_price(value) if value else None
+
+    def value(raw):
+        return to_price(raw) if raw is not None else None
+
+    expiration = datetime.strptime(reference['expiration_date'], '%Y-%m-%d').date()
+    contract = OptionContract(
+        symbol=reference['ticker'],
+        underlying_symbol='SPX',
+        option_type=OptionType.CALL if reference['contract_type'] == 'call' else OptionType.PUT,
+        strike_price=to_price(reference['strike_price']),
+        expiration_date=expiration,
+        days_to_expiration=(expiration - date.today()).days,
+        timestamp=datetime.now(),
+        source="polygon"
+    )
+
+    last_quote = snapshot['last_quote']
+    greeks = snapshot['greeks']
+    contract.bid = price(last_quote.get('bid'))
+    contract.ask = price(last_quote.get('ask'))
+    contract.last = price(snapshot['last_trade'].get('price'))
+    contract.mark = price(last_quote.get('midpoint'))
+    contract.volume = snapshot['day'].get('volume')
+    contract.open_interest = snapshot.get('open_interest')
+    contract.greeks = Greeks(
+        delta=value(greeks.get('delta')),
+        gamma=value(greeks.get('gamma')),
+        theta=value(greeks.get('theta')),
+        vega=value(greeks.get('vega')),
+        implied_volatility=value(snapshot.get('implied_volatility'))
+    )
+    return contract
+
+
+def bench(name: str, fn, items: int, rounds: int) -> float:
+    """Best-of-rounds time for fn, printed with throughput"""
+    best = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+
+    print(f"  {name:<28} {best * 1000:>10.1f} ms {items / best:>14,.0f} /s")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark provider payload parsing")
+    parser.add_argument("--bars", type=int, default=5000, help="Aggregate bars to parse")
+    parser.add_argument("--contracts", type=int, default=10000, help="Contracts in the synthetic chain")
+    parser.add_argument("--rounds", type=int, default=5, help="Timing rounds (best is reported)")
+    args = parser.parse_args()
+
+    random.seed(7)
+    provider = PolygonProvider({'api_key': 'bench'})
+    bars = build_aggregate_results(args.bars)
+    references, snapshots = build_chain_results(args.contracts)
+
+    def trusted_contracts():
+        for reference, snapshot in zip(references, snapshots):
+            contract = provider._parse_option_contract(reference, 'SPX')
+            provider._apply_option_snapshot(contract, snapshot)
+
+    print(f"🧪 Model parse benchmark ({NUMERIC_MODE} prices), best of {args.rounds} rounds")
+    print(f"  {'path':<28} {'time':>13} {'throughput':>16}")
+
+    print(f"📊 {len(bars)} Polygon aggregate bars")
+    before = bench("validated (before)", lambda: [legacy_parse_bar('SPY', bar) for bar in bars], len(bars), args.rounds)
+    after = bench("trusted (after)", lambda: [provider._parse_bar('SPY', bar) for bar in bars], len(bars), args.rounds)
+    print(f"  speedup {before / after:.2f}x")
+
+    print(f"📊 {len(references)} contract chain with snapshot quotes/greeks")
+    before = bench(
+        "validated (before)",
+        lambda: [legacy_parse_contract(reference, snapshot) for reference, snapshot in zip(references, snapshots)],
+        len(references), args.rounds
+    )
+    after = bench("trusted (after)", trusted_contracts, len(references), args.rounds)
+    print(f"  speedup {before / after:.2f}x")
+
+    # Both paths must produce the same models (timestamps aside)
+    assert legacy_parse_bar('SPY', bars[0]).model_dump() == provider._parse_bar('SPY', bars[0]).model_dump()
+    trusted = provider._parse_option_contract(references[0], 'SPX')
+    provider._apply_option_snapshot(trusted, snapshots[0])
+    assert (
+        legacy_parse_contract(references[0], snapshots[0]).model_dump(exclude={'timestamp'}) ==
+        trusted.model_dump(exclude={'timestamp'})
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,378 @@
+"""
+Cache Layer for Derivagent
+Bounded local (L1) cache, cache lifetime policies and range-aware
+historical bar storage used by the DataManager
+"""
+
+import time
+from collections import OrderedDict
+from datetime import datetime, date, timedelta, time as dt_time
+from typing import Optional, Dict, Any, Hashable, List
+
+from .models import HistoricalBar, MARKET_TIMEZONE
+
+
+MARKET_OPEN = dt_time(9, 30)
+MARKET_CLOSE = dt_time(16, 0)
+
+
+def is_market_hours(now: Optional[datetime] = None) -> bool:
+    """Check if US equity markets are in regular trading hours (holidays not considered)"""
+    now = now.astimezone(MARKET_TIMEZONE) if now else datetime.now(MARKET_TIMEZONE)
+    return now.weekday() < 5 and MARKET_OPEN <= now.time() < MARKET_CLOSE
+
+
+def market_date(now: Optional[datetime] = None) -> date:
+    """Current date in the market timezone"""
+    now = now.astimezone(MARKET_TIMEZONE) if now else datetime.now(MARKET_TIMEZONE)
+    return now.date()
+
+
+def seconds_until_market_open(now: Optional[datetime] = None) -> float:
+    """Seconds until the next regular session opens (0 during trading hours)"""
+    now = now.astimezone(MARKET_TIMEZONE) if now else datetime.now(MARKET_TIMEZONE)
+    if is_market_hours(now):
+        return 0.0
+
+    day = now.date() if now.time() < MARKET_OPEN else now.date() + timedelta(days=1)
+    while day.weekday() >= 5:
+        day += timedelta(days=1)
+
+    next_open = datetime.combine(day, MARKET_OPEN, tzinfo=MARKET_TIMEZONE)
+    return (next_open - now).total_seconds()
+
+
+class CachePolicyEngine:
+    """
+    Computes cache lifetimes per entry from the cache_policies config
+
+    Each entry gets two lifetimes:
+    - freshness TTL: how long it is served without revalidation
+    - storage TTL: how long it is kept at all (stale entries may still be
+      served while they are revalidated)
+
+    Quotes and options chains use the trading-hours or after-hours max age,
+    and after-hours entries never stay fresh past the next market open.
+    Historical bars use the intraday/daily/weekly max age for their interval;
+    ranges that ended before today are settled and use settled_ttl_seconds.
+    """
+
+    INTRADAY_INTERVALS = {'1m', '5m', '15m', '30m', '1h'}
+    WEEKLY_INTERVALS = {'1w', '1mo'}
+
+    def __init__(self, policies: Dict[str, Any], default_ttl: int = 300):
+        self.policies = policies
+        self.default_ttl = default_ttl
+
+    def freshness_ttl(
+        self,
+        data_type: str,
+        interval: Optional[str] = None,
+        end_date: Optional[date] = None,
+        now: Optional[datetime] = None
+    ) -> float:
+        """Get how long an entry stays fresh"""
+        policy = self.policies.get(data_type, {})
+        now = now.astimezone(MARKET_TIMEZONE) if now else datetime.now(MARKET_TIMEZONE)
+
+        if data_type == 'historical_data':
+            if end_date and end_date < now.date():
+                return policy.get('settled_ttl_seconds', policy.get('ttl_seconds', self.default_ttl))
+            return policy.get(self._historical_age_key(interval), policy.get('ttl_seconds', self.default_ttl))
+
+        if is_market_hours(now):
+            return policy.get('max_age_trading_hours', policy.get('ttl_seconds', self.default_ttl))
+
+        max_age = policy.get('max_age_after_hours', policy.get('ttl_seconds', self.default_ttl))
+        # Data cached overnight must not outlive the next open
+        return min(max_age, seconds_until_market_open(now))
+
+    def storage_ttl(
+        self,
+        data_type: str,
+        interval: Optional[str] = None,
+        end_date: Optional[date] = None,
+        now: Optional[datetime] = None
+    ) -> int:
+        """Get how long to keep an entry (never shorter than its freshness TTL)"""
+        policy = self.policies.get(data_type, {})
+        freshness_ttl = self.freshness_ttl(data_type, interval, end_date, now)
+        return max(int(policy.get('ttl_seconds', self.default_ttl)), int(freshness_ttl), 1)
+
+    def _historical_age_key(self, interval: Optional[str]) -> str:
+        if interval in self.INTRADAY_INTERVALS:
+            return 'max_age_intraday'
+        if interval in self.WEEKLY_INTERVALS:
+            return 'max_age_weekly'
+        return 'max_age_daily'
+
+    def describe(self) -> Dict[str, Any]:
+        """Current freshness/storage TTLs per data type, for monitoring"""
+        now = datetime.now(MARKET_TIMEZONE)
+        described = {
+            'market_hours': is_market_hours(now),
+            'quotes': {
+                'freshness_ttl': self.freshness_ttl('quotes', now=now),
+                'storage_ttl': self.storage_ttl('quotes', now=now)
+            },
+            'options_chains': {
+                'freshness_ttl': self.freshness_ttl('options_chains', now=now),
+                'storage_ttl': self.storage_ttl('options_chains', now=now)
+            }
+        }
+        for interval in ('1m', '1d', '1w'):
+            described[f'historical_data_{interval}'] = {
+                'freshness_ttl': self.freshness_ttl('historical_data', interval, now=now),
+                'storage_ttl': self.storage_ttl('historical_data', interval, now=now)
+            }
+        return described
+
+
+class LocalCache:
+    """
+    Size- and TTL-bounded in-process cache
+
+    Features:
+    - LRU eviction once max_entries is reached
+    - Per-entry expiry (capped by the cache-wide max TTL)
+    - Stores already-built model objects, so hits skip deserialization
+    - Hit/miss/eviction counters for monitoring
+    """
+
+    def __init__(self, name: str, max_entries: int = 1000, max_ttl_seconds: float = 300):
+        self.name = name
+        self.max_entries = max_entries
+        self.max_ttl_seconds = max_ttl_seconds
+
+        # key -> (expires_at, value), ordered from least to most recently used
+        self._entries: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'sets': 0,
+            'evictions': 0,
+            'expirations': 0
+        }
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get value for key, or None if missing or expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats['misses'] += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.stats['expirations'] += 1
+            self.stats['misses'] += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.stats['hits'] += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None):
+        """Store value for key, evicting the least recently used entries if full"""
+        if self.max_entries <= 0:
+            return
+
+        ttl = self.max_ttl_seconds if ttl_seconds is None else min(ttl_seconds, self.max_ttl_seconds)
+        if ttl <= 0:
+            return
+
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        self.stats['sets'] += 1
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats['evictions'] += 1
+
+    def delete(self, key: Hashable):
+        """Remove key if present"""
+        self._entries.pop(key, None)
+
+    def clear(self):
+        """Remove all entries"""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        lookups = self.stats['hits'] + self.stats['misses']
+        return {
+            **self.stats,
+            'name': self.name,
+            'size': len(self._entries),
+            'max_entries': self.max_entries,
+            'max_ttl_seconds': self.max_ttl_seconds,
+            'hit_rate': (self.stats['hits'] / max(lookups, 1)) * 100
+        }
+
+
+class BarSegment:
+    """
+    Contiguous date range of cached bars with its own expiry
+
+    Settled segments cover days that have fully closed, so their bars
+    won't change before the segment expires.
+    """
+
+    def __init__(
+        self,
+        start: date,
+        end: date,
+        bars: List[HistoricalBar],
+        expires_at: float,
+        source: Optional[str] = None,
+        settled: bool = False
+    ):
+        self.start = start
+        self.end = end
+        self.bars = bars
+        self.expires_at = expires_at
+        self.source = source
+        self.settled = settled
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'start': self.start,
+            'end': self.end,
+            'expires_at': self.expires_at,
+            'source': self.source,
+            'settled': self.settled,
+            'bars': [bar.model_dump() for bar in self.bars]
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BarSegment":
+        return cls(
+            start=_as_date(data['start']),
+            end=_as_date(data['end']),
+            bars=[HistoricalBar(**bar) for bar in data['bars']],
+            expires_at=data['expires_at'],
+            source=data.get('source'),
+            settled=data.get('settled', False)
+        )
+
+
+class BarSegmentSet:
+    """
+    Historical bars for one symbol/interval, stored as non-overlapping date segments
+
+    Any sub-range covered by unexpired segments is served locally; only the
+    uncovered gaps need to be fetched upstream and merged back in. Coverage is
+    tracked by requested date range rather than bar timestamps, so weekends and
+    holidays inside a fetched range don't show up as gaps.
+    """
+
+    def __init__(self, segments: Optional[List[BarSegment]] = None):
+        self.segments: List[BarSegment] = sorted(segments or [], key=lambda s: s.start)
+
+    def prune(self, now: Optional[float] = None):
+        """Drop expired segments"""
+        now = time.time() if now is None else now
+        self.segments = [s for s in self.segments if s.expires_at > now]
+
+    def missing_ranges(self, start: date, end: date) -> List[tuple[date, date]]:
+        """Date ranges within [start, end] not covered by any segment"""
+        gaps = []
+        cursor = start
+        for segment in self.segments:
+            if segment.end < cursor:
+                continue
+            if segment.start > end:
+                break
+            if segment.start > cursor:
+                gaps.append((cursor, segment.start - timedelta(days=1)))
+            cursor = max(cursor, segment.end + timedelta(days=1))
+            if cursor > end:
+                break
+        if cursor <= end:
+            gaps.append((cursor, end))
+        return gaps
+
+    def slice(self, start: date, end: date) -> List[HistoricalBar]:
+        """Cached bars dated within [start, end], in timestamp order"""
+        bars = []
+        for segment in self.segments:
+            if segment.end < start or segment.start > end:
+                continue
+            bars.extend(bar for bar in segment.bars if start <= bar.timestamp.date() <= end)
+        return bars
+
+    def sources(self, start: date, end: date) -> List[str]:
+        """Data sources of the segments overlapping [start, end]"""
+        return sorted({
+            s.source for s in self.segments
+            if s.source and not (s.end < start or s.start > end)
+        })
+
+    def merge(
+        self,
+        start: date,
+        end: date,
+        bars: List[HistoricalBar],
+        expires_at: float,
+        source: Optional[str] = None,
+        settled: bool = False
+    ):
+        """Insert freshly fetched bars for [start, end], replacing any overlap"""
+        kept = []
+        for segment in self.segments:
+            if segment.end < start or segment.start > end:
+                kept.append(segment)
+                continue
+            # Keep the parts of the old segment outside the new range
+            if segment.start < start:
+                kept.append(self._trim(segment, segment.start, start - timedelta(days=1)))
+            if segment.end > end:
+                kept.append(self._trim(segment, end + timedelta(days=1), segment.end))
+
+        kept.append(BarSegment(start, end, sorted(bars, key=lambda b: b.timestamp), expires_at, source, settled))
+        kept.sort(key=lambda s: s.start)
+
+        # Coalesce adjacent settled segments from the same source
+        self.segments = []
+        for segment in kept:
+            previous = self.segments[-1] if self.segments else None
+            if (previous and previous.settled and segment.settled
+                    and previous.end + timedelta(days=1) == segment.start
+                    and previous.source == segment.source):
+                previous.end = segment.end
+                previous.bars = previous.bars + segment.bars
+                previous.expires_at = min(previous.expires_at, segment.expires_at)
+            else:
+                self.segments.append(segment)
+
+    def expires_at(self) -> float:
+        """Latest expiry across segments (0 if empty)"""
+        return max((s.expires_at for s in self.segments), default=0.0)
+
+    def bar_count(self) -> int:
+        return sum(len(s.bars) for s in self.segments)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'segments': [s.to_dict() for s in self.segments]}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BarSegmentSet":
+        return cls([BarSegment.from_dict(s) for s in data.get('segments', [])])
+
+    @staticmethod
+    def _trim(segment: BarSegment, start: date, end: date) -> BarSegment:
+        bars = [bar for bar in segment.bars if start <= bar.timestamp.date() <= end]
+        return BarSegment(start, end, bars, segment.expires_at, segment.source, segment.settled)
+
+
+def _as_date(value: Any) -> date:
+    """Decode a date that may have been serialized as an ISO string"""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(value)
@@ -0,0 +1,176 @@
+"""
+Cache Codecs for Derivagent
+Serialization formats for entries stored in the shared Redis cache
+"""
+
+import json
+import logging
+from abc import ABC, abstractmethod
+from datetime import datetime, date
+from decimal import Decimal
+from typing import Any, Dict, Optional
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:  # pragma: no cover - optional dependency
+    lz4_frame = None
+
+
+logger = logging.getLogger("data.codecs")
+
+
+class CacheCodec(ABC):
+    """
+    Base class for cache serialization formats
+
+    Codecs turn plain Python structures (as produced by model_dump()) into
+    bytes and back. The key prefix carries the format and version, so
+    entries written by a different codec are never misread.
+    """
+
+    name: str = "base"
+    version: int = 1
+
+    @property
+    def key_prefix(self) -> str:
+        """Prefix for Redis keys written with this codec"""
+        return f"{self.name}:v{self.version}"
+
+    @abstractmethod
+    def encode(self, obj: Any) -> bytes:
+        """Serialize obj to bytes"""
+        pass
+
+    @abstractmethod
+    def decode(self, data: bytes) -> Any:
+        """Deserialize bytes produced by encode()"""
+        pass
+
+
+class JsonCodec(CacheCodec):
+    """Legacy JSON codec (Decimals and datetimes stored as strings)"""
+
+    name = "json"
+
+    def encode(self, obj: Any) -> bytes:
+        return json.dumps(obj, default=str).encode()
+
+    def decode(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+class MsgpackCodec(CacheCodec):
+    """
+    Compact binary codec based on msgpack
+
+    Decimals, datetimes and dates are stored as msgpack extension types and
+    decoded back to their original types, so models rebuild without string
+    parsing. Payloads above compression_min_bytes are optionally compressed
+    with zstd or lz4.
+    """
+
+    name = "msgpack"
+
+    EXT_DECIMAL = 1
+    EXT_DATETIME = 2
+    EXT_DATE = 3
+
+    # First byte of every payload
+    RAW = b'\x00'
+    ZSTD = b'\x01'
+    LZ4 = b'\x02'
+
+    def __init__(self, compression: Optional[str] = None, compression_min_bytes: int = 1024, compression_level: int = 3):
+        if msgpack is None:
+            raise ImportError("msgpack is required for the msgpack cache codec")
+
+        if compression == 'zstd' and zstandard is None:
+            raise ImportError("zstandard is required for zstd cache compression")
+        if compression == 'lz4' and lz4_frame is None:
+            raise ImportError("lz4 is required for lz4 cache compression")
+        if compression not in (None, 'zstd', 'lz4'):
+            raise ValueError(f"Unknown cache compression: {compression}")
+
+        self.compression = compression
+        self.compression_min_bytes = compression_min_bytes
+        self.compression_level = compression_level
+
+        if compression:
+            self.name = f"msgpack+{compression}"
+
+        self._zstd_compressor = zstandard.ZstdCompressor(level=compression_level) if compression == 'zstd' else None
+        self._zstd_decompressor = zstandard.ZstdDecompressor() if zstandard else None
+
+    def encode(self, obj: Any) -> bytes:
+        packed = msgpack.packb(obj, default=self._encode_ext, use_bin_type=True)
+
+        if self.compression and len(packed) >= self.compression_min_bytes:
+            if self.compression == 'zstd':
+                return self.ZSTD + self._zstd_compressor.compress(packed)
+            return self.LZ4 + lz4_frame.compress(packed)
+
+        return self.RAW + packed
+
+    def decode(self, data: bytes) -> Any:
+        header, payload = data[:1], data[1:]
+
+        if header == self.ZSTD:
+            payload = self._zstd_decompressor.decompress(payload)
+        elif header == self.LZ4:
+            payload = lz4_frame.decompress(payload)
+
+        return msgpack.unpackb(payload, ext_hook=self._decode_ext, raw=False, strict_map_key=False)
+
+    def _encode_ext(self, obj: Any):
+        if isinstance(obj, Decimal):
+            return msgpack.ExtType(self.EXT_DECIMAL, str(obj).encode())
+        if isinstance(obj, datetime):
+            return msgpack.ExtType(self.EXT_DATETIME, obj.isoformat().encode())
+        if isinstance(obj, date):
+            return msgpack.ExtType(self.EXT_DATE, obj.isoformat().encode())
+        raise TypeError(f"Cannot serialize {type(obj).__name__} for cache")
+
+    def _decode_ext(self, code: int, data: bytes):
+        if code == self.EXT_DECIMAL:
+            return Decimal(data.decode())
+        if code == self.EXT_DATETIME:
+            return datetime.fromisoformat(data.decode())
+        if code == self.EXT_DATE:
+            return date.fromisoformat(data.decode())
+        return msgpack.ExtType(code, data)
+
+
+def create_codec(config: Dict[str, Any]) -> CacheCodec:
+    """
+    Create cache codec from configuration
+
+    Falls back to the JSON codec when the configured format's optional
+    dependencies are not installed.
+    """
+    codec_format = config.get('format', 'json')
+
+    if codec_format == 'json':
+        return JsonCodec()
+
+    if codec_format == 'msgpack':
+        try:
+            return MsgpackCodec(
+                compression=config.get('compression'),
+                compression_min_bytes=config.get('compression_min_bytes', 1024),
+                compression_level=config.get('compression_level', 3)
+            )
+        except ImportError as e:
+            logger.warning(f"⚠️ {e}, falling back to JSON cache codec")
+            return JsonCodec()
+
+    raise ValueError(f"Unknown cache codec format: {codec_format}")
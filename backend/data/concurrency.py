@@ -0,0 +1,321 @@
+"""
+Concurrency Primitives for the Data Layer
+Coordinates concurrent upstream requests made through the DataManager
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, Iterator, List, Optional
+
+from .models import RequestPriority
+
+
+# Priority of the request being served; set by DataManager entry points and
+# inherited by the tasks they spawn (provider calls, rate limiter waits)
+current_request_priority: ContextVar[RequestPriority] = ContextVar(
+    'current_request_priority', default=RequestPriority.NORMAL
+)
+
+
+class _Flight:
+    """A coalesced call in flight, running at the most urgent priority waiting on it"""
+
+    def __init__(self, priority: RequestPriority):
+        self.priority = priority
+        self.future: Optional[asyncio.Future] = None
+        self._on_raise: List[Callable[[int], None]] = []
+
+    def raise_priority(self, priority: RequestPriority):
+        """Raise the call's priority, re-ranking anything it is queued on"""
+        if priority.rank >= self.priority.rank:
+            return
+        self.priority = priority
+        for callback in list(self._on_raise):
+            callback(priority.rank)
+
+
+# Coalesced call the current task is running as leader, set by SingleFlight
+_current_flight: ContextVar[Optional[_Flight]] = ContextVar('current_flight', default=None)
+
+
+def request_priority() -> RequestPriority:
+    """Priority of the request being served, raised by more urgent callers that joined it"""
+    priority = current_request_priority.get()
+    flight = _current_flight.get()
+    if flight is not None and flight.priority.rank < priority.rank:
+        return flight.priority
+    return priority
+
+
+@contextmanager
+def on_priority_raised(callback: Callable[[int], None]) -> Iterator[None]:
+    """Call callback(rank) if a more urgent caller joins the current call during the block"""
+    flight = _current_flight.get()
+    if flight is not None:
+        flight._on_raise.append(callback)
+    try:
+        yield
+    finally:
+        if flight is not None:
+            flight._on_raise.remove(callback)
+
+
+class ProviderCall:
+    """
+    Rate limiter accounting for one provider call made by the DataManager
+
+    Providers report time spent waiting on their own rate limiter here, so
+    the manager's timeout budget and latency stats cover only the upstream
+    requests, and limiter refusals aren't mistaken for provider failures.
+    """
+
+    def __init__(self):
+        self.throttled = False  # Our own rate limiter refused a request
+        self._waited = 0.0
+        self._waiters = 0
+        self._waiting_since: Optional[float] = None
+
+    @contextmanager
+    def limiter_wait(self) -> Iterator[None]:
+        """Account the enclosed time as waiting on the rate limiter"""
+        if self._waiters == 0:
+            self._waiting_since = time.monotonic()
+        self._waiters += 1
+        try:
+            yield
+        finally:
+            self._waiters -= 1
+            if self._waiters == 0:
+                self._waited += time.monotonic() - self._waiting_since
+                self._waiting_since = None
+
+    def limiter_seconds(self) -> float:
+        """Seconds spent waiting on the rate limiter so far, including a wait in progress"""
+        if self._waiting_since is None:
+            return self._waited
+        return self._waited + time.monotonic() - self._waiting_since
+
+
+# Provider call being served; set by DataManager._call_provider in the task
+# that runs the call, so providers can report rate limiter waits against it
+current_provider_call: ContextVar[Optional[ProviderCall]] = ContextVar(
+    'current_provider_call', default=None
+)
+
+
+class SingleFlight:
+    """
+    Request coalescing for concurrent identical calls
+
+    While a call for a key is in flight, later callers with the same key
+    wait for and share its result instead of issuing their own upstream request.
+    Keys don't include priority: the shared call runs at the most urgent
+    priority among its callers, raised when a more urgent caller joins.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[Hashable, _Flight] = {}
+        self.stats = {
+            'leaders': 0,
+            'coalesced': 0
+        }
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run fn() for key, or join the call already in flight for key"""
+        flight = self._in_flight.get(key)
+        if flight is not None:
+            self.stats['coalesced'] += 1
+            flight.raise_priority(request_priority())
+            # Shield so a cancelled waiter doesn't cancel the shared call
+            return await asyncio.shield(flight.future)
+
+        self.stats['leaders'] += 1
+        flight = _Flight(request_priority())
+
+        async def lead() -> Any:
+            # Runs in its own task, so this doesn't leak to the caller
+            _current_flight.set(flight)
+            return await fn()
+
+        flight.future = asyncio.ensure_future(lead())
+        self._in_flight[key] = flight
+        flight.future.add_done_callback(lambda _: self._release(key, flight))
+        return await asyncio.shield(flight.future)
+
+    def _release(self, key: Hashable, flight: _Flight):
+        if self._in_flight.get(key) is flight:
+            del self._in_flight[key]
+        # Mark exceptions as retrieved when every waiter has gone away
+        if not flight.future.cancelled():
+            flight.future.exception()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._in_flight
+
+    def in_flight(self) -> int:
+        """Number of distinct calls currently in flight"""
+        return len(self._in_flight)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get coalescing statistics"""
+        return {
+            **self.stats,
+            'in_flight': len(self._in_flight)
+        }
+
+
+class MeteredSemaphore:
+    """
+    Priority-ordered semaphore that tracks queue depth and wait times
+
+    Freed slots are handed to the waiter with the lowest priority rank
+    (FIFO within a rank), so urgent requests overtake queued background work.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._available = limit
+        self._waiters: List[list] = []  # heap of [rank, sequence, future]
+        self._sequence = itertools.count()
+        self.in_flight = 0
+        self.stats = {
+            'acquired': 0,
+            'queued': 0,
+            'max_queue_depth': 0,
+            'total_wait_seconds': 0.0,
+            'max_wait_seconds': 0.0
+        }
+
+    @property
+    def waiting(self) -> int:
+        """Requests currently queued for a slot"""
+        return len(self._waiters)
+
+    def locked(self) -> bool:
+        return self._available <= 0 or bool(self._waiters)
+
+    @asynccontextmanager
+    async def hold(self, rank: int = RequestPriority.NORMAL.rank) -> AsyncIterator[None]:
+        """Hold a slot for the duration of the block, queueing by rank if none is free"""
+        started = time.perf_counter()
+        await self._acquire(rank)
+
+        waited = time.perf_counter() - started
+        self.stats['acquired'] += 1
+        self.stats['total_wait_seconds'] += waited
+        self.stats['max_wait_seconds'] = max(self.stats['max_wait_seconds'], waited)
+
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._release()
+
+    async def _acquire(self, rank: int):
+        if not self.locked():
+            self._available -= 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        waiter = [rank, next(self._sequence), future]
+        heapq.heappush(self._waiters, waiter)
+        self.stats['queued'] += 1
+        self.stats['max_queue_depth'] = max(self.stats['max_queue_depth'], self.waiting)
+
+        def promote(new_rank: int):
+            if new_rank < waiter[0] and not future.done():
+                waiter[0] = new_rank
+                heapq.heapify(self._waiters)
+
+        try:
+            with on_priority_raised(promote):
+                await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Slot was handed over just as we were cancelled, pass it on
+                self._release()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+                heapq.heapify(self._waiters)
+            raise
+
+    def _release(self):
+        # Hand the slot straight to the next live waiter, keeping it taken
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self._available += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get slot usage and queueing statistics"""
+        acquired = self.stats['acquired']
+        return {
+            'limit': self.limit,
+            'in_flight': self.in_flight,
+            'queue_depth': self.waiting,
+            'acquired': acquired,
+            'queued': self.stats['queued'],
+            'max_queue_depth': self.stats['max_queue_depth'],
+            'avg_wait_ms': round(self.stats['total_wait_seconds'] / acquired * 1000, 2) if acquired else 0.0,
+            'max_wait_ms': round(self.stats['max_wait_seconds'] * 1000, 2)
+        }
+
+
+class ConcurrencyLimiter:
+    """
+    Bounds in-flight upstream requests globally and per key (provider)
+
+    Requests over either limit queue for a slot instead of piling onto
+    providers, so bursts turn into waiting rather than timeouts and bans.
+    Queues are served by request priority. The per-key slot is taken
+    first, so a request queued behind a busy provider doesn't hold a
+    global slot meanwhile.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int,
+        default_per_key: Optional[int] = None,
+        per_key_limits: Optional[Dict[Hashable, int]] = None
+    ):
+        self.global_slots = MeteredSemaphore(max_concurrent)
+        self.default_per_key = default_per_key or max_concurrent
+        self.per_key_limits = per_key_limits or {}
+        self._key_slots: Dict[Hashable, MeteredSemaphore] = {}
+
+    def _slots_for(self, key: Hashable) -> MeteredSemaphore:
+        slots = self._key_slots.get(key)
+        if slots is None:
+            slots = MeteredSemaphore(self.per_key_limits.get(key, self.default_per_key))
+            self._key_slots[key] = slots
+        return slots
+
+    @asynccontextmanager
+    async def slot(self, key: Hashable, priority: Optional[RequestPriority] = None) -> AsyncIterator[None]:
+        """Hold a per-key and a global slot for the duration of the block"""
+        rank = (priority or request_priority()).rank
+        async with self._slots_for(key).hold(rank):
+            async with self.global_slots.hold(rank):
+                yield
+
+    def queue_depth(self, key: Hashable) -> int:
+        """Requests queued for key's slots"""
+        slots = self._key_slots.get(key)
+        return slots.waiting if slots else 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get global and per-key queueing statistics"""
+        return {
+            'global': self.global_slots.get_stats(),
+            'per_provider': {
+                str(key): slots.get_stats()
+                for key, slots in self._key_slots.items()
+            }
+        }
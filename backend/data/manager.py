@@ -4,20 +4,34 @@ Implements hybrid data strategy with failover and caching
 """
 
 import asyncio
+import time
 import redis.asyncio as redis
-from typing import Optional, Dict, Any, List, Union
+from typing import Optional, Dict, Any, List, Union, Callable, Awaitable, Hashable, Set, Tuple
 from datetime import datetime, date, timedelta
-import json
 import logging
 from decimal import Decimal
 
-from .providers.base import BaseDataProvider, create_provider
+from .providers.base import BaseDataProvider, RedisRateLimitBackend, create_provider
+from .providers.http import HttpClientFactory
+from .providers.streaming import StreamingProvider, create_streaming_provider
+from .cache import LocalCache, CachePolicyEngine, BarSegmentSet, market_date
+from .concurrency import (
+    SingleFlight, ConcurrencyLimiter, ProviderCall,
+    current_request_priority, current_provider_call, request_priority
+)
+from .routing import CircuitBreakerRegistry, ProviderScoreboard
+from .codecs import create_codec
 from .models import (
-    Quote, OptionsChain, HistoricalBar, Position, Account, Order,
-    DataRequest, DataResponse, MarketDataType
+    Quote, OptionsChain, HistoricalBar, BarSeries, Position, Account, Order,
+    DataRequest, DataResponse, MarketDataType, RequestPriority
 )
 
 
+# Intervals served from the range-merging bar cache; weekly/monthly bars
+# depend on calendar alignment, so they are cached per exact request
+RANGE_CACHED_INTERVALS = CachePolicyEngine.INTRADAY_INTERVALS | {'1d'}
+
+
 class DataManagerError(Exception):
     """Data manager specific errors"""
     pass
@@ -29,7 +43,7 @@ class DataManager:
     
     Features:
     - Smart routing: Broker APIs → Market Data fallback
-    - Redis caching for performance
+    - Two-tier caching: in-process L1 in front of shared Redis L2
     - Data quality validation
     - Source preference management
     - Performance monitoring
@@ -48,18 +62,89 @@ class DataManager:
         self.redis_client: Optional[redis.Redis] = None
         self.cache_enabled = config.get('cache_enabled', True)
         self.default_cache_ttl = config.get('default_cache_ttl', 300)  # 5 minutes
+        self.cache_codec = create_codec(config.get('cache_codec', {}))
+        self.cache_policies = CachePolicyEngine(config.get('cache_policies', {}), self.default_cache_ttl)
+        
+        # Serve stale entries immediately and refresh them in the background
+        self.stale_while_revalidate = config.get('stale_while_revalidate', True)
+        self._revalidations: Dict[Hashable, asyncio.Task] = {}
+        
+        # In-process L1 cache (per data type), independent of Redis availability
+        local_cache_config = config.get('local_cache', {})
+        self.local_cache_enabled = self.cache_enabled and local_cache_config.get('enabled', True)
+        self.local_caches: Dict[str, LocalCache] = {
+            data_type: LocalCache(
+                name=data_type,
+                max_entries=local_cache_config.get(data_type, {}).get('max_entries', default_entries),
+                max_ttl_seconds=local_cache_config.get(data_type, {}).get('max_ttl_seconds', default_ttl)
+            )
+            for data_type, default_entries, default_ttl in (
+                ('quotes', 2000, 300),
+                ('options_chains', 100, 600),
+                ('historical_data', 500, 3600)
+            )
+        }
+        
+        # Coalesces concurrent cache misses for the same request
+        self.single_flight = SingleFlight()
+        
+        # Bounds in-flight upstream calls, globally and per provider
+        performance_config = config.get('performance', {})
+        self.concurrency = ConcurrencyLimiter(
+            max_concurrent=performance_config.get('max_concurrent_requests', 50),
+            default_per_key=performance_config.get('max_concurrent_requests_per_provider', 10),
+            per_key_limits={
+                name: provider_config['max_concurrent_requests']
+                for name, provider_config in config.get('providers', {}).items()
+                if 'max_concurrent_requests' in provider_config
+            }
+        )
+        
+        # One keep-alive connection pool shared by all provider sessions
+        self.http_client = HttpClientFactory(performance_config)
+        
+        # Serializes read-fetch-merge cycles on each symbol/interval bar cache
+        self._bar_cache_locks: Dict[tuple, asyncio.Lock] = {}
+        # Serializes read-fetch-write cycles on each underlying/expiration chain entry
+        self._options_chain_locks: Dict[tuple, asyncio.Lock] = {}
         
         # Request routing preferences
         self.routing_config = config.get('routing', {})
         self.default_market_data_provider = config.get('default_market_data_provider', 'polygon')
         
+        # Per provider/data type circuit breakers consulted by provider selection
+        self.circuit_breakers = CircuitBreakerRegistry(config.get('performance', {}))
+        
+        # Rolling latency/error/budget health used to rank providers
+        self.provider_scoreboard = ProviderScoreboard(config.get('cost_optimization', {}))
+        
+        # Opt-in hedged quote requests for latency-critical callers
+        self.hedging_config = config.get('hedging', {})
+        
+        # When to shed low-priority work instead of spending scarce provider budget
+        self.priority_config = config.get('request_priority', {})
+        
+        # Optional push feed whose quote book serves quotes without upstream requests
+        self.streaming_config = config.get('streaming', {})
+        self.streaming_provider: Optional[StreamingProvider] = None
+        
         # Performance tracking
         self.request_stats = {
             'total_requests': 0,
             'cache_hits': 0,
+            'stale_cache_hits': 0,
+            'background_revalidations': 0,
+            'historical_gap_fetches': 0,
+            'local_cache_hits': 0,
+            'redis_cache_hits': 0,
             'cache_misses': 0,
             'broker_requests': 0,
             'market_data_requests': 0,
+            'failovers': 0,
+            'hedged_requests': 0,
+            'hedge_wins': 0,
+            'shed_requests': 0,
+            'stream_hits': 0,
             'errors': 0
         }
         
@@ -73,6 +158,17 @@ class DataManager:
             # Initialize data providers
             await self._init_providers()
             
+            # Share provider rate limits across workers through Redis
+            if self.cache_enabled and self.redis_client and self.config.get('performance', {}).get('shared_rate_limits', True):
+                rate_limit_backend = RedisRateLimitBackend(self.redis_client)
+                for provider in self.providers.values():
+                    provider.set_rate_limit_backend(rate_limit_backend)
+                self.logger.info("✅ Provider rate limits shared via Redis")
+            
+            # Start the streaming quote feed
+            if self.streaming_config.get('enabled', False):
+                await self._init_streaming()
+            
             self.logger.info("✅ Data Manager initialized successfully")
             
         except Exception as e:
@@ -88,12 +184,12 @@ class DataManager:
                 port=redis_config.get('port', 6379),
                 db=redis_config.get('db', 0),
                 password=redis_config.get('password'),
-                decode_responses=True
+                decode_responses=False  # Cache codec works on bytes
             )
             
             # Test connection
             await self.redis_client.ping()
-            self.logger.info("✅ Redis cache connected")
+            self.logger.info(f"✅ Redis cache connected (codec: {self.cache_codec.key_prefix})")
             
         except Exception as e:
             self.logger.warning(f"⚠️ Redis cache unavailable: {e}")
@@ -109,6 +205,7 @@ class DataManager:
                     continue
                 
                 provider = create_provider(provider_name, provider_config)
+                provider.set_http_client(self.http_client)
                 self.providers[provider_name] = provider
                 
                 # Categorize providers
@@ -127,8 +224,35 @@ class DataManager:
             except Exception as e:
                 self.logger.error(f"❌ Failed to initialize {provider_name}: {e}")
     
+    async def _init_streaming(self):
+        """Create and start the streaming quote feed"""
+        provider_name = self.streaming_config.get('provider', self.default_market_data_provider)
+        try:
+            # Streaming settings override the provider's REST config (API key etc.)
+            provider_config = {
+                **self.config.get('providers', {}).get(provider_name, {}),
+                **self.streaming_config
+            }
+            self.streaming_provider = create_streaming_provider(provider_name, provider_config)
+            self.streaming_provider.set_http_client(self.http_client)
+            await self.streaming_provider.subscribe(self.streaming_config.get('symbols', []))
+            await self.streaming_provider.start()
+            self.logger.info(f"✅ {provider_name} streaming started")
+            
+        except Exception as e:
+            self.logger.error(f"❌ Failed to start {provider_name} streaming: {e}")
+            self.streaming_provider = None
+    
     async def shutdown(self):
         """Shutdown data manager and close connections"""
+        # Stop pending background revalidations
+        for task in list(self._revalidations.values()):
+            task.cancel()
+        
+        # Stop the streaming feed
+        if self.streaming_provider:
+            await self.streaming_provider.stop()
+        
         # Disconnect all providers
         for provider in self.providers.values():
             try:
@@ -136,6 +260,9 @@ class DataManager:
             except:
                 pass
         
+        # Close the shared HTTP connection pool
+        await self.http_client.close()
+        
         # Close Redis connection
         if self.redis_client:
             await self.redis_client.close()
@@ -149,7 +276,9 @@ class DataManager:
         symbol: str, 
         user_id: Optional[str] = None,
         account_id: Optional[str] = None,
-        source_preference: Optional[str] = None
+        source_preference: Optional[str] = None,
+        hedged: Optional[bool] = None,
+        priority: RequestPriority = RequestPriority.NORMAL
     ) -> DataResponse:
         """
         Get real-time quote with intelligent source routing
@@ -159,39 +288,38 @@ class DataManager:
             user_id: User ID for personalization
             account_id: Account ID for broker-specific data
             source_preference: Preferred data source
+            hedged: Hedge slow provider responses (defaults to hedging.enabled)
+            priority: Scheduling priority for upstream requests
         """
+        priority_token = current_request_priority.set(priority)
         try:
             self.request_stats['total_requests'] += 1
             
-            # Check cache first
-            if self.cache_enabled:
-                cached_data = await self._get_cached_quote(symbol)
-                if cached_data:
-                    self.request_stats['cache_hits'] += 1
-                    return cached_data
+            # Streamed quotes cost nothing upstream
+            streamed = self._get_streamed_quotes([symbol], source_preference)
+            if symbol in streamed:
+                return streamed[symbol]
             
-            self.request_stats['cache_misses'] += 1
+            if hedged is None:
+                hedged = self.hedging_config.get('enabled', False)
             
-            # Route request to appropriate provider
-            provider = self._select_quote_provider(symbol, account_id, source_preference)
+            flight_key = ('quote', symbol, account_id, source_preference)
+            fetch = lambda: self._fetch_quote(symbol, account_id, source_preference, hedged)
             
-            if not provider:
-                raise DataManagerError("No available providers for quote data")
-            
-            # Get quote from provider
-            response = await provider.get_quote(symbol)
-            
-            # Track request type
-            if provider.provider_name in self.broker_providers:
-                self.request_stats['broker_requests'] += 1
-            else:
-                self.request_stats['market_data_requests'] += 1
+            # Check cache first (L1, then Redis)
+            cached_data = self._serve_cached(
+                await self._get_cached_quote(symbol),
+                self.cache_policies.freshness_ttl('quotes'),
+                flight_key, fetch
+            )
+            if cached_data:
+                self.request_stats['cache_hits'] += 1
+                return cached_data
             
-            # Cache successful response
-            if response.success and self.cache_enabled:
-                await self._cache_quote(symbol, response)
+            self.request_stats['cache_misses'] += 1
             
-            return response
+            # Coalesce concurrent misses into a single upstream fetch
+            return await self.single_flight.do(flight_key, fetch)
             
         except Exception as e:
             self.request_stats['errors'] += 1
@@ -201,6 +329,124 @@ class DataManager:
                 error=str(e),
                 timestamp=datetime.now()
             )
+        finally:
+            current_request_priority.reset(priority_token)
+    
+    async def get_quotes(
+        self,
+        symbols: List[str],
+        user_id: Optional[str] = None,
+        account_id: Optional[str] = None,
+        source_preference: Optional[str] = None,
+        priority: RequestPriority = RequestPriority.NORMAL
+    ) -> Dict[str, DataResponse]:
+        """
+        Get quotes for many symbols with batched cache access
+        
+        All cache keys are read with one MGET and all writes go out in one
+        pipeline, so a batch costs two Redis round trips regardless of size.
+        Misses already being fetched join that fetch; the rest are grouped
+        per provider (skipping shed providers and open circuits) and each
+        group is fetched as one batch that concurrent get_quote calls join.
+        
+        Returns:
+            Dict mapping each requested symbol to its DataResponse
+        """
+        symbols = list(dict.fromkeys(symbols))
+        self.request_stats['total_requests'] += len(symbols)
+        results: Dict[str, DataResponse] = {}
+        
+        priority_token = current_request_priority.set(priority)
+        try:
+            # Serve what the streaming feed has, fetch the rest
+            results.update(self._get_streamed_quotes(symbols, source_preference))
+            pending = [symbol for symbol in symbols if symbol not in results]
+            
+            cached = await self._get_cached_many('quotes', {symbol: f"quote:{symbol}" for symbol in pending})
+            freshness_ttl = self.cache_policies.freshness_ttl('quotes')
+            
+            misses = []
+            for symbol in pending:
+                cached_data = self._serve_cached(
+                    cached.get(symbol),
+                    freshness_ttl,
+                    ('quote', symbol, account_id, source_preference),
+                    lambda symbol=symbol: self._fetch_quote(symbol, account_id, source_preference)
+                )
+                if cached_data:
+                    self.request_stats['cache_hits'] += 1
+                    results[symbol] = cached_data
+                else:
+                    misses.append(symbol)
+            
+            self.request_stats['cache_misses'] += len(misses)
+            
+            flight_keys = {symbol: ('quote', symbol, account_id, source_preference) for symbol in misses}
+            
+            # Misses already being fetched (by get_quote or another batch) join that fetch
+            joined = [symbol for symbol in misses if flight_keys[symbol] in self.single_flight]
+            
+            # Group the rest by the provider that would serve them
+            groups, unroutable, shed = self._group_quote_batch(
+                [symbol for symbol in misses if symbol not in joined], account_id, source_preference
+            )
+            for symbol in unroutable:
+                if shed:
+                    self.request_stats['shed_requests'] += 1
+                results[symbol] = DataResponse(
+                    success=False,
+                    error="Low-priority quotes request shed: provider budget under pressure" if shed
+                    else "No available providers for quote data",
+                    timestamp=datetime.now()
+                )
+            
+            # One upstream batch per provider, shared through per-symbol flights so
+            # concurrent get_quote calls for these symbols join it
+            flights = {}
+            for name, group in groups.items():
+                batch = asyncio.ensure_future(self._fetch_quote_batch(self.providers[name], group))
+                for symbol in group:
+                    flights[symbol] = lambda symbol=symbol, name=name, batch=batch: self._quote_from_batch(
+                        symbol, name, batch, account_id, source_preference
+                    )
+            for symbol in joined:
+                flights[symbol] = lambda symbol=symbol: self._fetch_quote(symbol, account_id, source_preference)
+            
+            fetched = await asyncio.gather(*[
+                self.single_flight.do(flight_keys[symbol], fetch)
+                for symbol, fetch in flights.items()
+            ], return_exceptions=True)
+            
+            for symbol, response in zip(flights, fetched):
+                if isinstance(response, BaseException):
+                    response = DataResponse(success=False, error=str(response), timestamp=datetime.now())
+                results[symbol] = response
+            
+            to_cache = {}
+            for symbol in misses:
+                response = results[symbol]
+                if not response.success:
+                    self.request_stats['errors'] += 1
+                elif symbol not in joined:
+                    # Joined fetches cache their own results
+                    to_cache[f"quote:{symbol}"] = response
+            
+            await self._set_cached_many('quotes', to_cache, self.cache_policies.storage_ttl('quotes'))
+            
+        except Exception as e:
+            self.logger.error(f"Failed to get batch quotes: {e}")
+            for symbol in symbols:
+                if symbol not in results:
+                    self.request_stats['errors'] += 1
+                    results[symbol] = DataResponse(
+                        success=False,
+                        error=str(e),
+                        timestamp=datetime.now()
+                    )
+        finally:
+            current_request_priority.reset(priority_token)
+        
+        return results
     
     async def get_options_chain(
         self,
@@ -209,44 +455,39 @@ class DataManager:
         strike_range: Optional[tuple[float, float]] = None,
         user_id: Optional[str] = None,
         account_id: Optional[str] = None,
-        source_preference: Optional[str] = None
+        source_preference: Optional[str] = None,
+        priority: RequestPriority = RequestPriority.NORMAL
     ) -> DataResponse:
         """Get options chain with intelligent routing"""
+        priority_token = current_request_priority.set(priority)
         try:
             self.request_stats['total_requests'] += 1
             
+            # The broadest fetched chain per underlying/expiration is cached;
+            # narrower strike ranges are sliced from it locally
+            cached_entry = await self._get_cached_options_chain(underlying, expiration)
+            cached_response, covered_range = cached_entry if cached_entry else (None, None)
+            
+            flight_key = ('options_chain', underlying, expiration, strike_range, account_id, source_preference)
+            fetch = lambda: self._fetch_widening_options_chain(
+                underlying, expiration, strike_range, account_id, source_preference
+            )
+            
             # Check cache
-            if self.cache_enabled:
-                cached_data = await self._get_cached_options_chain(underlying, expiration)
+            if cached_entry and self._strike_range_covers(covered_range, strike_range):
+                cached_data = self._serve_cached(
+                    cached_response,
+                    self.cache_policies.freshness_ttl('options_chains'),
+                    flight_key, fetch
+                )
                 if cached_data:
                     self.request_stats['cache_hits'] += 1
-                    return cached_data
+                    return self._slice_options_chain(cached_data, strike_range)
             
             self.request_stats['cache_misses'] += 1
             
-            # Route request
-            provider = self._select_options_provider(underlying, account_id, source_preference)
-            
-            if not provider:
-                raise DataManagerError("No available providers for options data")
-            
-            # Get options chain
-            response = await provider.get_options_chain(
-                underlying=underlying,
-                expiration=expiration,
-                strike_range=strike_range
-            )
-            
-            # Track and cache
-            if provider.provider_name in self.broker_providers:
-                self.request_stats['broker_requests'] += 1
-            else:
-                self.request_stats['market_data_requests'] += 1
-            
-            if response.success and self.cache_enabled:
-                await self._cache_options_chain(underlying, expiration, response)
-            
-            return response
+            response = await self.single_flight.do(flight_key, fetch)
+            return self._slice_options_chain(response, strike_range)
             
         except Exception as e:
             self.request_stats['errors'] += 1
@@ -256,6 +497,8 @@ class DataManager:
                 error=str(e),
                 timestamp=datetime.now()
             )
+        finally:
+            current_request_priority.reset(priority_token)
     
     async def get_historical_data(
         self,
@@ -263,56 +506,487 @@ class DataManager:
         start_date: date,
         end_date: date,
         interval: str = "1d",
-        source_preference: Optional[str] = None
+        source_preference: Optional[str] = None,
+        priority: RequestPriority = RequestPriority.NORMAL
     ) -> DataResponse:
         """Get historical data with source routing"""
+        priority_token = current_request_priority.set(priority)
         try:
             self.request_stats['total_requests'] += 1
             
-            # Historical data is typically cached longer
-            if self.cache_enabled:
-                cached_data = await self._get_cached_historical(symbol, start_date, end_date, interval)
-                if cached_data:
-                    self.request_stats['cache_hits'] += 1
-                    return cached_data
-            
-            self.request_stats['cache_misses'] += 1
-            
-            # Route to market data provider (brokers typically have limited historical data)
-            provider = self._select_historical_provider(source_preference)
+            # Serve any sub-range of cached bars, fetching only missing gaps
+            if interval in RANGE_CACHED_INTERVALS:
+                return await self.single_flight.do(
+                    ('historical', symbol, start_date, end_date, interval, source_preference),
+                    lambda: self._get_historical_from_bar_cache(
+                        symbol, start_date, end_date, interval, source_preference
+                    )
+                )
             
-            if not provider:
-                raise DataManagerError("No available providers for historical data")
+            flight_key = ('historical', symbol, start_date, end_date, interval, source_preference)
+            fetch = lambda: self._fetch_historical_data(symbol, start_date, end_date, interval, source_preference)
             
-            response = await provider.get_historical_data(symbol, start_date, end_date, interval)
+            # Historical data is typically cached longer
+            cached_data = self._serve_cached(
+                await self._get_cached_historical(symbol, start_date, end_date, interval),
+                self.cache_policies.freshness_ttl('historical_data', interval, end_date),
+                flight_key, fetch
+            )
+            if cached_data:
+                self.request_stats['cache_hits'] += 1
+                return cached_data
             
-            self.request_stats['market_data_requests'] += 1
+            self.request_stats['cache_misses'] += 1
             
-            # Cache with longer TTL for historical data
-            if response.success and self.cache_enabled:
-                await self._cache_historical_data(symbol, start_date, end_date, interval, response)
+            return await self.single_flight.do(flight_key, fetch)
             
+        except Exception as e:
+            self.request_stats['errors'] += 1
+            self.logger.error(f"Failed to get historical data for {symbol}: {e}")
+            return DataResponse(
+                success=False,
+                error=str(e),
+                timestamp=datetime.now()
+            )
+        finally:
+            current_request_priority.reset(priority_token)
+    
+    async def get_bar_series(
+        self,
+        symbol: str,
+        start_date: date,
+        end_date: date,
+        interval: str = "1d",
+        source_preference: Optional[str] = None,
+        priority: RequestPriority = RequestPriority.NORMAL
+    ) -> DataResponse:
+        """
+        Get historical data as a columnar BarSeries
+        
+        Range-cached intervals share the bar segment cache with
+        get_historical_data, with gaps fetched via provider.get_bar_series so
+        a cold range comes back as the provider's own columns. Other
+        intervals are converted from get_historical_data.
+        """
+        if interval not in RANGE_CACHED_INTERVALS:
+            response = await self.get_historical_data(
+                symbol, start_date, end_date, interval, source_preference, priority
+            )
+            if response.success:
+                response = response.model_copy(update={
+                    'data': BarSeries.from_bars(symbol, response.data or [], interval)
+                })
             return response
+        
+        priority_token = current_request_priority.set(priority)
+        try:
+            self.request_stats['total_requests'] += 1
+            
+            return await self.single_flight.do(
+                ('bar_series', symbol, start_date, end_date, interval, source_preference),
+                lambda: self._get_historical_from_bar_cache(
+                    symbol, start_date, end_date, interval, source_preference, as_series=True
+                )
+            )
             
         except Exception as e:
             self.request_stats['errors'] += 1
-            self.logger.error(f"Failed to get historical data for {symbol}: {e}")
+            self.logger.error(f"Failed to get bar series for {symbol}: {e}")
             return DataResponse(
                 success=False,
                 error=str(e),
                 timestamp=datetime.now()
             )
+        finally:
+            current_request_priority.reset(priority_token)
+    
+    # Upstream fetches (run once per coalesced group of concurrent misses)
+    
+    def _get_streamed_quotes(self, symbols: List[str], source_preference: Optional[str] = None) -> Dict[str, DataResponse]:
+        """
+        Serve quotes from the streaming feed's quote book
+        
+        Symbols without a fresh book entry are left out; with auto_subscribe
+        they are subscribed so later requests are served from the stream.
+        """
+        stream = self.streaming_provider
+        if not stream or (source_preference and source_preference != stream.provider_name):
+            return {}
+        
+        results = {}
+        unsubscribed = []
+        for symbol in symbols:
+            quote = stream.get_quote(symbol)
+            if quote is not None:
+                results[symbol] = DataResponse(
+                    success=True,
+                    data=quote,
+                    source=quote.source,
+                    timestamp=datetime.now(),
+                    age_seconds=stream.book.age(symbol)
+                )
+            elif symbol not in stream.subscriptions:
+                unsubscribed.append(symbol)
+        
+        self.request_stats['stream_hits'] += len(results)
+        
+        if unsubscribed and self.streaming_config.get('auto_subscribe', True):
+            self._spawn_subscription(stream, unsubscribed)
+        
+        return results
+    
+    def _spawn_subscription(self, stream: StreamingProvider, symbols: List[str]):
+        """Subscribe to symbols in the background"""
+        task = asyncio.create_task(stream.subscribe(symbols))
+        task.add_done_callback(self._on_subscription_done)
+    
+    def _on_subscription_done(self, task: asyncio.Task):
+        if not task.cancelled() and task.exception():
+            self.logger.warning(f"Stream subscription failed: {task.exception()}")
+    
+    async def _fetch_quote(
+        self,
+        symbol: str,
+        account_id: Optional[str],
+        source_preference: Optional[str],
+        hedged: bool = False
+    ) -> DataResponse:
+        """Fetch quote along the provider failover chain (optionally hedged) and cache it"""
+        fetch = self._fetch_hedged if hedged else self._fetch_with_failover
+        _, response = await fetch(
+            'quotes', symbol, account_id, source_preference,
+            lambda provider: provider.get_quote(symbol)
+        )
+        
+        # Cache successful response
+        if response.success:
+            await self._cache_quote(symbol, response)
+        
+        return response
+    
+    async def _fetch_quote_batch(self, provider: BaseDataProvider, symbols: List[str]) -> Dict[str, DataResponse]:
+        """Fetch quotes for a group of symbols from one provider (caching is done by the caller)"""
+        request_count = provider.request_count
+        tracker = ProviderCall()
+        tracker_token = current_provider_call.set(tracker)
+        started = None
+        try:
+            async with self.concurrency.slot(provider.provider_name):
+                started = time.perf_counter()
+                responses = await provider.get_quotes(symbols)
+        except Exception as e:
+            responses = {}
+            self.logger.error(f"Batch quote fetch from {provider.provider_name} failed: {e}")
+        finally:
+            current_provider_call.reset(tracker_token)
+        
+        self._record_provider_outcome(
+            provider,
+            'quotes',
+            tracker,
+            started,
+            request_count,
+            any(response.success for response in responses.values())
+        )
+        
+        # Count upstream requests actually made, batch endpoints cover many symbols each
+        upstream_requests = max(provider.request_count - request_count, 1)
+        if provider.provider_name in self.broker_providers:
+            self.request_stats['broker_requests'] += upstream_requests
+        else:
+            self.request_stats['market_data_requests'] += upstream_requests
+        
+        return {
+            symbol: responses.get(symbol) or DataResponse(
+                success=False,
+                error=f"No quote returned by {provider.provider_name}",
+                timestamp=datetime.now()
+            )
+            for symbol in symbols
+        }
+    
+    async def _quote_from_batch(
+        self,
+        symbol: str,
+        provider_name: str,
+        batch: Awaitable[Dict[str, DataResponse]],
+        account_id: Optional[str],
+        source_preference: Optional[str]
+    ) -> DataResponse:
+        """Symbol's response from a shared provider batch, failing over individually if it failed"""
+        response = (await asyncio.shield(batch))[symbol]
+        if response.success:
+            return response
+        
+        try:
+            _, response = await self._fetch_with_failover(
+                'quotes', symbol, account_id, source_preference,
+                lambda provider: provider.get_quote(symbol),
+                attempted={provider_name}
+            )
+        except DataManagerError:
+            pass  # Nothing left to fail over to, keep the batch error
+        return response
+    
+    def _group_quote_batch(
+        self,
+        symbols: List[str],
+        account_id: Optional[str],
+        source_preference: Optional[str]
+    ) -> Tuple[Dict[str, List[str]], List[str], bool]:
+        """
+        Group symbols by the first provider in their chain that can serve them
+        
+        Providers are skipped for shedding and open circuits the same way
+        as in _fetch_with_failover. Each provider's breaker is asked once per
+        batch, since the whole group goes out as one request (a half-open
+        breaker's trial covers the group rather than its first symbol).
+        
+        Returns:
+            (provider name -> symbols, symbols no provider can serve, whether any provider was shed)
+        """
+        groups: Dict[str, List[str]] = {}
+        unroutable = []
+        shed = False
+        usable: Dict[str, bool] = {}
+        for symbol in symbols:
+            for provider in self._provider_chain('quotes', symbol, account_id, source_preference):
+                name = provider.provider_name
+                if name not in usable:
+                    if self._should_shed(provider):
+                        shed = True
+                        usable[name] = False
+                    else:
+                        usable[name] = self.circuit_breakers.allow_request(name, 'quotes')
+                if usable[name]:
+                    groups.setdefault(name, []).append(symbol)
+                    break
+            else:
+                unroutable.append(symbol)
+        return groups, unroutable, shed
+    
+    async def _fetch_options_chain(
+        self,
+        underlying: str,
+        expiration: Optional[date],
+        strike_range: Optional[tuple[float, float]],
+        account_id: Optional[str],
+        source_preference: Optional[str]
+    ) -> DataResponse:
+        """Fetch options chain along the provider failover chain and cache it"""
+        _, response = await self._fetch_with_failover(
+            'options_chains', underlying, account_id, source_preference,
+            lambda provider: provider.get_options_chain(
+                underlying=underlying,
+                expiration=expiration,
+                strike_range=strike_range
+            )
+        )
+        
+        if response.success:
+            await self._cache_options_chain(underlying, expiration, strike_range, response)
+        
+        return response
+    
+    async def _fetch_widening_options_chain(
+        self,
+        underlying: str,
+        expiration: Optional[date],
+        strike_range: Optional[tuple[float, float]],
+        account_id: Optional[str],
+        source_preference: Optional[str]
+    ) -> DataResponse:
+        """
+        Fetch a chain spanning strike_range and the cached range, and cache it
+        
+        Fetches for one underlying/expiration run one at a time and take the
+        hull with the entry cached when they start. Each write is then at least
+        as wide as the entry it replaces, even when different ranges miss
+        concurrently.
+        """
+        lock = self._options_chain_locks.setdefault((underlying, expiration), asyncio.Lock())
+        
+        async with lock:
+            cached_entry = await self._get_cached_options_chain(underlying, expiration)
+            fetch_range = strike_range
+            if cached_entry:
+                cached_response, covered_range = cached_entry
+                # A fetch that ran while we waited may already cover this range
+                if (self._strike_range_covers(covered_range, strike_range)
+                        and cached_response.age_seconds <= self.cache_policies.freshness_ttl('options_chains')):
+                    return cached_response
+                fetch_range = self._strike_range_hull(strike_range, covered_range)
+            
+            return await self._fetch_options_chain(
+                underlying, expiration, fetch_range, account_id, source_preference
+            )
+    
+    async def _fetch_historical_data(
+        self,
+        symbol: str,
+        start_date: date,
+        end_date: date,
+        interval: str,
+        source_preference: Optional[str]
+    ) -> DataResponse:
+        """Fetch historical data along the provider failover chain and cache it"""
+        _, response = await self._fetch_with_failover(
+            'historical_data', symbol, None, source_preference,
+            lambda provider: provider.get_historical_data(symbol, start_date, end_date, interval)
+        )
+        
+        # Cache with longer TTL for historical data (truncated ranges are incomplete)
+        if response.success and not response.truncated:
+            await self._cache_historical_data(symbol, start_date, end_date, interval, response)
+        
+        return response
+    
+    async def _get_historical_from_bar_cache(
+        self,
+        symbol: str,
+        start_date: date,
+        end_date: date,
+        interval: str,
+        source_preference: Optional[str],
+        as_series: bool = False
+    ) -> DataResponse:
+        """
+        Serve historical bars from cached segments, fetching and stitching in gaps
+        
+        With as_series, gaps are fetched with provider.get_bar_series and the
+        response holds a BarSeries rather than List[HistoricalBar].
+        """
+        # Segments hold exchange-local bar timestamps (bars: entries used server-local ones)
+        key = f"bars2:{symbol}:{interval}"
+        lock = self._bar_cache_locks.setdefault((symbol, interval), asyncio.Lock())
+        
+        async with lock:
+            segments = await self._get_cached_bar_segments(key)
+            segments.prune()
+            gaps = segments.missing_ranges(start_date, end_date)
+            
+            if not gaps:
+                self.request_stats['cache_hits'] += 1
+                sources = segments.sources(start_date, end_date)
+                bars = segments.slice(start_date, end_date)
+                return DataResponse(
+                    success=True,
+                    data=BarSeries.from_bars(symbol, bars, interval) if as_series else bars,
+                    source=",".join(sources) if sources else None,
+                    cached=True,
+                    timestamp=datetime.now()
+                )
+            
+            self.request_stats['cache_misses'] += 1
+            
+            # Each gap fails over independently, so segments may come from different providers
+            fetched = await asyncio.gather(*[
+                self._fetch_with_failover(
+                    'historical_data', symbol, None, source_preference,
+                    lambda provider, gap_start=gap_start, gap_end=gap_end: (
+                        provider.get_bar_series if as_series else provider.get_historical_data
+                    )(symbol, gap_start, gap_end, interval)
+                )
+                for gap_start, gap_end in gaps
+            ])
+            
+            self.request_stats['historical_gap_fetches'] += len(gaps)
+            
+            sources = []
+            failed = None
+            truncated = False
+            for (gap_start, gap_end), (provider, response) in zip(gaps, fetched):
+                if not response.success:
+                    failed = failed or response
+                    continue
+                
+                # Segments hold bars, so fetched series are converted for the cache
+                bars = (response.data.to_bars() if as_series else response.data) or []
+                if response.truncated:
+                    # Only whole days before the last returned bar are known complete,
+                    # the rest of the gap stays uncovered and is fetched again later
+                    truncated = True
+                    if not bars:
+                        continue
+                    gap_end = max(bar.timestamp for bar in bars).date() - timedelta(days=1)
+                    bars = [bar for bar in bars if bar.timestamp.date() <= gap_end]
+                    if gap_end < gap_start:
+                        continue
+                
+                self._merge_bar_segment(segments, gap_start, gap_end, bars, provider.provider_name, interval)
+                if provider.provider_name not in sources:
+                    sources.append(provider.provider_name)
+            
+            # Keep the gaps that did arrive even if another one failed
+            if sources:
+                await self._cache_bar_segments(key, segments)
+            
+            if failed:
+                return failed
+            
+            if as_series and gaps == [(start_date, end_date)] and not truncated:
+                # Nothing was cached, the provider's series is the whole answer
+                data = fetched[0][1].data
+            elif as_series:
+                data = BarSeries.from_bars(symbol, segments.slice(start_date, end_date), interval)
+            else:
+                data = segments.slice(start_date, end_date)
+            
+            return DataResponse(
+                success=True,
+                data=data,
+                source=",".join(sources),
+                timestamp=datetime.now(),
+                truncated=truncated
+            )
+    
+    def _merge_bar_segment(
+        self,
+        segments: BarSegmentSet,
+        start_date: date,
+        end_date: date,
+        bars: List[HistoricalBar],
+        source: str,
+        interval: str
+    ):
+        """Merge fetched bars, splitting closed days from today's still-changing bars"""
+        today = market_date()
+        now = time.time()
+        
+        if start_date < today:
+            settled_end = min(end_date, today - timedelta(days=1))
+            ttl = self.cache_policies.freshness_ttl('historical_data', interval, settled_end)
+            segments.merge(
+                start_date, settled_end,
+                [bar for bar in bars if bar.timestamp.date() <= settled_end],
+                now + ttl, source, settled=True
+            )
+        
+        if end_date >= today:
+            live_start = max(start_date, today)
+            ttl = self.cache_policies.freshness_ttl('historical_data', interval, end_date)
+            segments.merge(
+                live_start, end_date,
+                [bar for bar in bars if bar.timestamp.date() >= live_start],
+                now + ttl, source
+            )
     
     # Account data methods (broker-only)
     
-    async def get_account_info(self, account_id: str, broker: str) -> DataResponse:
-        """Get account information from specific broker"""
+    async def get_account_info(
+        self,
+        account_id: str,
+        broker: str,
+        priority: RequestPriority = RequestPriority.CRITICAL
+    ) -> DataResponse:
+        """Get account information from specific broker (order-critical by default)"""
+        priority_token = current_request_priority.set(priority)
         try:
             provider = self.broker_providers.get(broker)
             if not provider:
                 raise DataManagerError(f"Broker {broker} not available")
             
-            return await provider.get_account_info(account_id)
+            return await self._call_provider(provider, 'account_data', provider.get_account_info(account_id))
             
         except Exception as e:
             self.logger.error(f"Failed to get account info for {account_id}: {e}")
@@ -321,15 +995,23 @@ class DataManager:
                 error=str(e),
                 timestamp=datetime.now()
             )
+        finally:
+            current_request_priority.reset(priority_token)
     
-    async def get_positions(self, account_id: str, broker: str) -> DataResponse:
-        """Get positions from specific broker"""
+    async def get_positions(
+        self,
+        account_id: str,
+        broker: str,
+        priority: RequestPriority = RequestPriority.CRITICAL
+    ) -> DataResponse:
+        """Get positions from specific broker (order-critical by default)"""
+        priority_token = current_request_priority.set(priority)
         try:
             provider = self.broker_providers.get(broker)
             if not provider:
                 raise DataManagerError(f"Broker {broker} not available")
             
-            return await provider.get_positions(account_id)
+            return await self._call_provider(provider, 'account_data', provider.get_positions(account_id))
             
         except Exception as e:
             self.logger.error(f"Failed to get positions for {account_id}: {e}")
@@ -338,189 +1020,685 @@ class DataManager:
                 error=str(e),
                 timestamp=datetime.now()
             )
+        finally:
+            current_request_priority.reset(priority_token)
     
     # Provider selection logic
     
-    def _select_quote_provider(
-        self, 
-        symbol: str, 
-        account_id: Optional[str], 
-        source_preference: Optional[str]
-    ) -> Optional[BaseDataProvider]:
-        """Select best provider for quote data"""
+    async def _call_provider(
+        self,
+        provider: BaseDataProvider,
+        data_type: str,
+        call: Awaitable[DataResponse],
+        timeout: Optional[float] = None
+    ) -> DataResponse:
+        """
+        Await a provider call within the concurrency limits and record its outcome
         
-        # If user specifies preference, try that first
-        if source_preference and source_preference in self.providers:
-            provider = self.providers[source_preference]
-            if provider.is_connected:
-                return provider
+        The timeout covers time queued for a slot and the upstream requests,
+        but not time spent waiting on the provider's rate limiter (which has
+        its own max wait), so a slow refill doesn't use up the failover budget.
+        Outcomes go to the circuit breaker and scoreboard only once the call
+        actually started, and not when our own limiter refused it, so local
+        queueing and throttling aren't blamed on the provider.
+        """
+        request_count = provider.request_count
+        tracker = ProviderCall()
+        started: Optional[float] = None
         
-        # If account_id provided, try broker first for account-specific pricing
-        if account_id:
-            for broker_name, provider in self.broker_providers.items():
-                if provider.is_connected and account_id in provider.connected_accounts:
-                    return provider
-        
-        # Fall back to market data providers
-        # Try default first
-        if self.default_market_data_provider in self.market_data_providers:
-            provider = self.market_data_providers[self.default_market_data_provider]
-            if provider.is_connected:
-                return provider
+        async def run() -> DataResponse:
+            nonlocal started
+            # Runs in its own task, so this doesn't leak to the caller
+            current_provider_call.set(tracker)
+            try:
+                async with self.concurrency.slot(provider.provider_name):
+                    started = time.perf_counter()
+                    return await call
+            finally:
+                # Avoid "never awaited" warnings when cancelled while queued
+                call.close()
         
-        # Try any available market data provider
-        for provider in self.market_data_providers.values():
-            if provider.is_connected:
-                return provider
+        task = asyncio.ensure_future(run())
+        try:
+            if timeout is not None:
+                deadline = time.monotonic() + timeout
+                while not task.done():
+                    # Rate limiter waits extend the deadline
+                    remaining = deadline + tracker.limiter_seconds() - time.monotonic()
+                    if remaining <= 0:
+                        raise asyncio.TimeoutError()
+                    await asyncio.wait({task}, timeout=remaining)
+            response = await task
+        except Exception:
+            self._record_provider_outcome(provider, data_type, tracker, started, request_count, False)
+            raise
+        finally:
+            # Our caller was cancelled (or timed out), don't leave the call running
+            task.cancel()
         
-        return None
+        self._record_provider_outcome(provider, data_type, tracker, started, request_count, response.success)
+        return response
     
-    def _select_options_provider(
-        self, 
-        underlying: str, 
-        account_id: Optional[str], 
-        source_preference: Optional[str]
+    def _record_provider_outcome(
+        self,
+        provider: BaseDataProvider,
+        data_type: str,
+        tracker: ProviderCall,
+        started: Optional[float],
+        request_count: int,
+        success: bool
+    ):
+        """Feed a provider call outcome to its circuit breaker and the routing scoreboard"""
+        if started is None or tracker.throttled:
+            return
+        
+        self.circuit_breakers.record(provider.provider_name, data_type, success)
+        self.provider_scoreboard.record(
+            provider.provider_name,
+            data_type,
+            max(time.perf_counter() - started - tracker.limiter_seconds(), 0),
+            success,
+            requests=provider.request_count - request_count
+        )
+    
+    async def _fetch_with_failover(
+        self,
+        data_type: str,
+        symbol: str,
+        account_id: Optional[str],
+        source_preference: Optional[str],
+        call: Callable[[BaseDataProvider], Awaitable[DataResponse]],
+        attempted: Optional[Set[str]] = None
+    ) -> Tuple[BaseDataProvider, DataResponse]:
+        """
+        Run a request along the provider failover chain
+        
+        Failed or timed-out attempts move on to the next provider, up to
+        routing.max_retry_attempts retries within the data type's failover budget.
+        
+        Args:
+            call: Builds the provider request, e.g. lambda p: p.get_quote(symbol)
+            attempted: Providers already tried by the caller (counted as attempts)
+        
+        Returns:
+            (provider, response) for the last provider tried
+        """
+        attempted = attempted or set()
+        max_attempts = 1 + self.routing_config.get('max_retry_attempts', 3) if self.routing_config.get('fallback_enabled', True) else 1
+        deadline = time.monotonic() + self._failover_budget(data_type)
+        
+        attempts = len(attempted)
+        last: Optional[Tuple[BaseDataProvider, DataResponse]] = None
+        shed = False
+        
+        for provider in self._provider_chain(data_type, symbol, account_id, source_preference):
+            if attempts >= max_attempts:
+                break
+            
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            
+            if provider.provider_name in attempted:
+                continue
+            
+            if self._should_shed(provider):
+                shed = True
+                continue
+            
+            if not self.circuit_breakers.allow_request(provider.provider_name, data_type):
+                continue
+            
+            if attempts:
+                self.request_stats['failovers'] += 1
+                self.logger.info(f"🔀 Failing over {data_type} for {symbol} to {provider.provider_name}")
+            attempts += 1
+            
+            self._count_provider_request(provider)
+            
+            try:
+                response = await self._call_provider(provider, data_type, call(provider), timeout=remaining)
+            except Exception as e:
+                error = "Timed out within failover budget" if isinstance(e, asyncio.TimeoutError) else str(e)
+                response = DataResponse(
+                    success=False,
+                    error=f"{provider.provider_name}: {error}",
+                    timestamp=datetime.now()
+                )
+            
+            last = (provider, response)
+            if response.success:
+                break
+        
+        if last is None:
+            if shed:
+                self.request_stats['shed_requests'] += 1
+                raise DataManagerError(f"Low-priority {data_type.replace('_', ' ')} request shed: provider budget under pressure")
+            raise DataManagerError(f"No available providers for {data_type.replace('_', ' ')}")
+        
+        return last
+    
+    async def _fetch_hedged(
+        self,
+        data_type: str,
+        symbol: str,
+        account_id: Optional[str],
+        source_preference: Optional[str],
+        call: Callable[[BaseDataProvider], Awaitable[DataResponse]]
+    ) -> Tuple[BaseDataProvider, DataResponse]:
+        """
+        Run a request as a hedged pair of providers
+        
+        If the primary hasn't answered within its p95 latency (clamped to
+        hedging.min_delay_ms/max_delay_ms), the same request goes to the next
+        provider in the chain with spare rate-limit budget. The first
+        successful response wins and the other call is cancelled. If both
+        fail, the rest of the failover chain is tried.
+        """
+        chain = self._provider_chain(data_type, symbol, account_id, source_preference)
+        primary = None
+        for provider in chain:
+            if not self._should_shed(provider) and self.circuit_breakers.allow_request(provider.provider_name, data_type):
+                primary = provider
+                break
+        
+        if primary is None:
+            # Let the failover path report shedding or missing providers
+            return await self._fetch_with_failover(data_type, symbol, account_id, source_preference, call)
+        
+        timeout = self._failover_budget(data_type)
+        
+        def launch(provider: BaseDataProvider) -> asyncio.Future:
+            self._count_provider_request(provider)
+            return asyncio.ensure_future(self._call_provider(provider, data_type, call(provider), timeout=timeout))
+        
+        tasks = {launch(primary): primary}
+        done, _ = await asyncio.wait(tasks, timeout=self._hedge_delay(primary, data_type))
+        
+        if not done:
+            hedge = self._select_hedge_provider(chain, primary, data_type)
+            if hedge:
+                self.request_stats['hedged_requests'] += 1
+                self.logger.debug(f"Hedging {data_type} for {symbol}: {primary.provider_name} -> {hedge.provider_name}")
+                tasks[launch(hedge)] = hedge
+        
+        last: Optional[Tuple[BaseDataProvider, DataResponse]] = None
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    provider = tasks[task]
+                    try:
+                        response = task.result()
+                    except Exception as e:
+                        response = DataResponse(
+                            success=False,
+                            error=f"{provider.provider_name}: {e}",
+                            timestamp=datetime.now()
+                        )
+                    
+                    last = (provider, response)
+                    if response.success:
+                        if provider is not primary:
+                            self.request_stats['hedge_wins'] += 1
+                        return last
+        finally:
+            # Cancel the loser (or both, if our caller was cancelled)
+            for task in pending:
+                task.cancel()
+        
+        # Neither answered successfully, continue down the chain
+        try:
+            return await self._fetch_with_failover(
+                data_type, symbol, account_id, source_preference, call,
+                attempted={provider.provider_name for provider in tasks.values()}
+            )
+        except DataManagerError:
+            return last
+    
+    def _failover_budget(self, data_type: str) -> float:
+        """
+        Seconds a request for data_type may spend on provider calls
+        
+        routing.failover_budget_seconds is either one budget for everything
+        or per data type with a "default", since paginated chain and history
+        loads need longer than a single quote.
+        """
+        budget = self.routing_config.get('failover_budget_seconds', 15)
+        if isinstance(budget, dict):
+            return budget.get(data_type, budget.get('default', 15))
+        return budget
+    
+    def _hedge_delay(self, provider: BaseDataProvider, data_type: str) -> float:
+        """Seconds to wait on a provider before hedging, from its latency percentile"""
+        percentile = self.hedging_config.get('delay_percentile', 0.95)
+        delay = self.provider_scoreboard.latency_percentile(provider.provider_name, data_type, percentile)
+        if delay is None:
+            delay = self.hedging_config.get('default_delay_ms', 500) / 1000
+        
+        min_delay = self.hedging_config.get('min_delay_ms', 50) / 1000
+        max_delay = self.hedging_config.get('max_delay_ms', 2000) / 1000
+        return min(max(delay, min_delay), max_delay)
+    
+    def _select_hedge_provider(
+        self,
+        chain: List[BaseDataProvider],
+        primary: BaseDataProvider,
+        data_type: str
     ) -> Optional[BaseDataProvider]:
-        """Select best provider for options data"""
+        """Next provider in the chain with spare rate-limit budget to hedge to"""
+        min_budget = self.hedging_config.get('min_budget_remaining', 0.3)
         
-        # Similar logic to quote provider but prioritize brokers for options
-        if source_preference and source_preference in self.providers:
-            provider = self.providers[source_preference]
-            if provider.is_connected:
+        for provider in chain:
+            if provider is primary:
+                continue
+            budget = self.provider_scoreboard.budget_remaining(provider)
+            if budget is not None and budget < min_budget:
+                continue
+            if not self._should_shed(provider) and self.circuit_breakers.allow_request(provider.provider_name, data_type):
                 return provider
+        return None
+    
+    def _should_shed(self, provider: BaseDataProvider) -> bool:
+        """
+        Check whether the current request should skip provider to save its budget
         
-        # Brokers often have better options data
-        if account_id:
-            for broker_name, provider in self.broker_providers.items():
-                if provider.is_connected and account_id in provider.connected_accounts:
-                    return provider
+        Only LOW priority work is shed, when the provider's rate-limit budget
+        is nearly spent or its request queue is already deep.
+        """
+        if request_priority() != RequestPriority.LOW or not self.priority_config.get('shed_low_priority', True):
+            return False
         
-        # Market data providers as fallback
-        for provider in self.market_data_providers.values():
-            if provider.is_connected:
-                return provider
+        budget = self.provider_scoreboard.budget_remaining(provider)
+        if budget is not None and budget < self.priority_config.get('shed_budget_threshold', 0.25):
+            return True
         
-        return None
+        return self.concurrency.queue_depth(provider.provider_name) >= self.priority_config.get('shed_queue_depth', 10)
     
-    def _select_historical_provider(self, source_preference: Optional[str]) -> Optional[BaseDataProvider]:
-        """Select provider for historical data (prefer market data providers)"""
+    def _count_provider_request(self, provider: BaseDataProvider):
+        """Track request type"""
+        if provider.provider_name in self.broker_providers:
+            self.request_stats['broker_requests'] += 1
+        else:
+            self.request_stats['market_data_requests'] += 1
+    
+    def _provider_chain(
+        self,
+        data_type: str,
+        symbol: Optional[str],
+        account_id: Optional[str],
+        source_preference: Optional[str]
+    ) -> List[BaseDataProvider]:
+        """
+        Ordered failover chain of connected providers for a request
         
-        if source_preference and source_preference in self.providers:
-            provider = self.providers[source_preference]
-            if provider.is_connected:
-                return provider
+        Order: source preference, account broker, symbol_routing preferred
+        and fallback providers, then the remaining market data providers
+        ranked by the scoreboard (the default provider is only passed over
+        on quality, not cost).
+        Historical data skips brokers unless requested.
+        """
+        names: List[str] = []
         
-        # Market data providers typically have better historical data
-        if self.default_market_data_provider in self.market_data_providers:
-            provider = self.market_data_providers[self.default_market_data_provider]
-            if provider.is_connected:
-                return provider
+        # If user specifies preference, try that first
+        if source_preference:
+            names.append(source_preference)
         
-        for provider in self.market_data_providers.values():
-            if provider.is_connected:
-                return provider
+        # Brokers first for account-specific pricing
+        if account_id and data_type != 'historical_data':
+            names.extend(
+                name for name, provider in self.broker_providers.items()
+                if account_id in provider.connected_accounts
+            )
         
-        return None
+        # Per-symbol routing from config
+        symbol_routing = self.config.get('symbol_routing', {}).get(symbol.lower(), {}) if symbol else {}
+        routed = [symbol_routing.get('preferred_provider')] + symbol_routing.get('fallback_providers', [])
+        names.extend(
+            name for name in routed
+            if name and (data_type != 'historical_data' or name not in self.broker_providers)
+        )
+        
+        chain = []
+        for name in dict.fromkeys(names):
+            provider = self.providers.get(name)
+            if provider and provider.is_connected:
+                chain.append(provider)
+        
+        # Fall back to market data providers, best scoring first
+        fallbacks = []
+        for name in dict.fromkeys([self.default_market_data_provider, *self.market_data_providers]):
+            provider = self.market_data_providers.get(name)
+            if provider and provider.is_connected and provider not in chain:
+                fallbacks.append(provider)
+        chain.extend(self.provider_scoreboard.rank(fallbacks, data_type, default=self.default_market_data_provider))
+        return chain
     
     # Caching methods
     
-    async def _get_cached_quote(self, symbol: str) -> Optional[DataResponse]:
-        """Get cached quote data"""
-        if not self.redis_client:
+    def _serve_cached(
+        self,
+        cached: Optional[DataResponse],
+        freshness_ttl: float,
+        flight_key: Hashable,
+        fetch: Callable[[], Awaitable[DataResponse]]
+    ) -> Optional[DataResponse]:
+        """
+        Decide whether a cached response can be served
+        
+        Fresh entries are served as-is. Stale entries are served when
+        stale-while-revalidate is on, with a background refresh scheduled.
+        """
+        if cached is None:
+            return None
+        
+        if cached.age_seconds <= freshness_ttl:
+            return cached
+        
+        if not self.stale_while_revalidate:
             return None
         
+        self.request_stats['stale_cache_hits'] += 1
+        self._revalidate_in_background(flight_key, fetch)
+        return cached
+    
+    def _revalidate_in_background(self, flight_key: Hashable, fetch: Callable[[], Awaitable[DataResponse]]):
+        """Refresh a stale entry without blocking the caller"""
+        if flight_key in self._revalidations or flight_key in self.single_flight:
+            return  # Already being fetched
+        
+        self.request_stats['background_revalidations'] += 1
+        # Background refreshes run at low priority (the task copies the context now)
+        priority_token = current_request_priority.set(RequestPriority.LOW)
         try:
-            key = f"quote:{symbol}"
-            cached = await self.redis_client.get(key)
+            task = asyncio.create_task(self.single_flight.do(flight_key, fetch))
+        finally:
+            current_request_priority.reset(priority_token)
+        self._revalidations[flight_key] = task
+        task.add_done_callback(lambda done: self._on_revalidation_done(flight_key, done))
+    
+    def _on_revalidation_done(self, flight_key: Hashable, task: asyncio.Task):
+        self._revalidations.pop(flight_key, None)
+        if not task.cancelled() and task.exception():
+            self.logger.warning(f"Background revalidation failed: {task.exception()}")
+    
+    async def _get_cached(self, data_type: str, key: str) -> Optional[DataResponse]:
+        """Get cached response (fresh or stale) from L1, falling back to Redis (L2)"""
+        entry = await self._get_cached_entry(data_type, key)
+        return entry[0] if entry else None
+    
+    async def _get_cached_entry(self, data_type: str, key: str) -> Optional[tuple[DataResponse, Dict[str, Any]]]:
+        """Get cached response and its cache metadata from L1, falling back to Redis (L2)"""
+        local_cache = self.local_caches[data_type] if self.local_cache_enabled else None
+        
+        if local_cache is not None:
+            cached = local_cache.get(key)
+            if cached is not None:
+                self.request_stats['local_cache_hits'] += 1
+                response, meta = cached
+                return self._with_age(response), meta
+        
+        if not self.cache_enabled or not self.redis_client:
+            return None
+        
+        try:
+            redis_key = self._redis_key(key)
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                pipe.get(redis_key)
+                pipe.ttl(redis_key)
+                cached, remaining_ttl = await pipe.execute()
+            
             if cached:
-                data = json.loads(cached)
-                return DataResponse(**data, cached=True)
+                data = self.cache_codec.decode(cached)
+                meta = data.pop('_cache_meta', None) or {}
+                data['cached'] = True
+                response = DataResponse(**data)
+                self.request_stats['redis_cache_hits'] += 1
+                
+                # Promote to L1 for the remainder of the Redis TTL
+                if local_cache is not None and remaining_ttl and remaining_ttl > 0:
+                    local_cache.set(key, (response, meta), remaining_ttl)
+                
+                return self._with_age(response), meta
         except Exception as e:
             self.logger.debug(f"Cache read error: {e}")
         
         return None
     
-    async def _cache_quote(self, symbol: str, response: DataResponse):
-        """Cache quote data"""
-        if not self.redis_client:
-            return
+    async def _get_cached_many(self, data_type: str, keys: Dict[str, str]) -> Dict[str, DataResponse]:
+        """
+        Get many cached responses at once
+        
+        Args:
+            keys: Mapping of caller identifier (e.g. symbol) to cache key
+        
+        Returns:
+            Mapping of identifier to cached response, for hits only
+        """
+        local_cache = self.local_caches[data_type] if self.local_cache_enabled else None
+        results: Dict[str, DataResponse] = {}
+        remaining = {}
+        
+        for name, key in keys.items():
+            cached = local_cache.get(key) if local_cache is not None else None
+            if cached is not None:
+                self.request_stats['local_cache_hits'] += 1
+                results[name] = self._with_age(cached[0])
+            else:
+                remaining[name] = key
+        
+        if not remaining or not self.cache_enabled or not self.redis_client:
+            return results
         
         try:
-            key = f"quote:{symbol}"
-            # Cache quotes for shorter time (real-time data)
-            ttl = 30  # 30 seconds for quotes
+            names = list(remaining)
+            redis_keys = [self._redis_key(remaining[name]) for name in names]
             
-            # Convert response to cacheable format
-            cache_data = response.dict()
-            await self.redis_client.setex(key, ttl, json.dumps(cache_data, default=str))
+            # One round trip: MGET plus TTLs for L1 promotion
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                pipe.mget(redis_keys)
+                for redis_key in redis_keys:
+                    pipe.ttl(redis_key)
+                values, *remaining_ttls = await pipe.execute()
             
-        except Exception as e:
-            self.logger.debug(f"Cache write error: {e}")
-    
-    async def _get_cached_options_chain(self, underlying: str, expiration: Optional[date]) -> Optional[DataResponse]:
-        """Get cached options chain"""
-        if not self.redis_client:
-            return None
-        
-        try:
-            exp_str = expiration.isoformat() if expiration else "all"
-            key = f"options:{underlying}:{exp_str}"
-            cached = await self.redis_client.get(key)
-            if cached:
-                data = json.loads(cached)
-                return DataResponse(**data, cached=True)
+            for name, cached, remaining_ttl in zip(names, values, remaining_ttls):
+                if not cached:
+                    continue
+                
+                data = self.cache_codec.decode(cached)
+                meta = data.pop('_cache_meta', None) or {}
+                data['cached'] = True
+                response = DataResponse(**data)
+                self.request_stats['redis_cache_hits'] += 1
+                
+                if local_cache is not None and remaining_ttl and remaining_ttl > 0:
+                    local_cache.set(remaining[name], (response, meta), remaining_ttl)
+                
+                results[name] = self._with_age(response)
         except Exception as e:
             self.logger.debug(f"Cache read error: {e}")
         
-        return None
+        return results
     
-    async def _cache_options_chain(self, underlying: str, expiration: Optional[date], response: DataResponse):
-        """Cache options chain data"""
-        if not self.redis_client:
+    def _with_age(self, cached: DataResponse) -> DataResponse:
+        """Copy of a cached response stamped with its current age"""
+        age = (datetime.now() - cached.timestamp).total_seconds()
+        return cached.model_copy(update={'age_seconds': max(age, 0.0)})
+    
+    async def _set_cached(
+        self,
+        data_type: str,
+        key: str,
+        response: DataResponse,
+        ttl: int,
+        meta: Optional[Dict[str, Any]] = None
+    ):
+        """Cache response (plus optional cache metadata) in L1 and Redis (L2) for ttl seconds"""
+        meta = meta or {}
+        
+        if self.local_cache_enabled:
+            self.local_caches[data_type].set(key, (response.model_copy(update={'cached': True}), meta), ttl)
+        
+        if not self.cache_enabled or not self.redis_client:
             return
         
         try:
-            exp_str = expiration.isoformat() if expiration else "all"
-            key = f"options:{underlying}:{exp_str}"
-            ttl = 300  # 5 minutes for options chains
-            
-            cache_data = response.dict()
-            await self.redis_client.setex(key, ttl, json.dumps(cache_data, default=str))
+            # Convert response to cacheable format
+            cache_data = response.model_dump()
+            if meta:
+                cache_data['_cache_meta'] = meta
+            cache_data = self.cache_codec.encode(cache_data)
+            await self.redis_client.setex(self._redis_key(key), ttl, cache_data)
             
         except Exception as e:
             self.logger.debug(f"Cache write error: {e}")
     
-    async def _get_cached_historical(self, symbol: str, start_date: date, end_date: date, interval: str) -> Optional[DataResponse]:
-        """Get cached historical data"""
-        if not self.redis_client:
-            return None
+    async def _set_cached_many(self, data_type: str, responses: Dict[str, DataResponse], ttl: int):
+        """Cache many responses (keyed by cache key) with one pipelined Redis round trip"""
+        if not responses:
+            return
+        
+        if self.local_cache_enabled:
+            for key, response in responses.items():
+                self.local_caches[data_type].set(key, (response.model_copy(update={'cached': True}), {}), ttl)
+        
+        if not self.cache_enabled or not self.redis_client:
+            return
         
         try:
-            key = f"historical:{symbol}:{start_date}:{end_date}:{interval}"
-            cached = await self.redis_client.get(key)
-            if cached:
-                data = json.loads(cached)
-                return DataResponse(**data, cached=True)
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for key, response in responses.items():
+                    pipe.setex(self._redis_key(key), ttl, self.cache_codec.encode(response.model_dump()))
+                await pipe.execute()
         except Exception as e:
-            self.logger.debug(f"Cache read error: {e}")
+            self.logger.debug(f"Cache write error: {e}")
+    
+    def _redis_key(self, key: str) -> str:
+        """Redis key tagged with the codec format and version"""
+        return f"{self.cache_codec.key_prefix}:{key}"
+    
+    async def _get_cached_bar_segments(self, key: str) -> BarSegmentSet:
+        """Get cached bar segments for a symbol/interval (empty set on miss)"""
+        local_cache = self.local_caches['historical_data'] if self.local_cache_enabled else None
         
-        return None
+        if local_cache is not None:
+            segments = local_cache.get(key)
+            if segments is not None:
+                return segments
+        
+        if self.cache_enabled and self.redis_client:
+            try:
+                cached = await self.redis_client.get(self._redis_key(key))
+                if cached:
+                    segments = BarSegmentSet.from_dict(self.cache_codec.decode(cached))
+                    if local_cache is not None:
+                        local_cache.set(key, segments, max(segments.expires_at() - time.time(), 0))
+                    return segments
+            except Exception as e:
+                self.logger.debug(f"Cache read error: {e}")
+        
+        return BarSegmentSet()
     
-    async def _cache_historical_data(self, symbol: str, start_date: date, end_date: date, interval: str, response: DataResponse):
-        """Cache historical data"""
-        if not self.redis_client:
+    async def _cache_bar_segments(self, key: str, segments: BarSegmentSet):
+        """Cache bar segments in L1 and Redis until the last segment expires"""
+        ttl = int(segments.expires_at() - time.time())
+        if ttl <= 0:
+            return
+        
+        if self.local_cache_enabled:
+            self.local_caches['historical_data'].set(key, segments, ttl)
+        
+        if not self.cache_enabled or not self.redis_client:
             return
         
         try:
-            key = f"historical:{symbol}:{start_date}:{end_date}:{interval}"
-            ttl = 3600  # 1 hour for historical data
-            
-            cache_data = response.dict()
-            await self.redis_client.setex(key, ttl, json.dumps(cache_data, default=str))
-            
+            await self.redis_client.setex(self._redis_key(key), ttl, self.cache_codec.encode(segments.to_dict()))
         except Exception as e:
             self.logger.debug(f"Cache write error: {e}")
     
+    async def _get_cached_quote(self, symbol: str) -> Optional[DataResponse]:
+        """Get cached quote data"""
+        return await self._get_cached('quotes', f"quote:{symbol}")
+    
+    async def _cache_quote(self, symbol: str, response: DataResponse):
+        """Cache quote data"""
+        ttl = self.cache_policies.storage_ttl('quotes')
+        await self._set_cached('quotes', f"quote:{symbol}", response, ttl)
+    
+    async def _get_cached_options_chain(
+        self,
+        underlying: str,
+        expiration: Optional[date]
+    ) -> Optional[tuple[DataResponse, Optional[tuple[float, float]]]]:
+        """Get cached options chain and the strike range it covers (None = all strikes)"""
+        exp_str = expiration.isoformat() if expiration else "all"
+        entry = await self._get_cached_entry('options_chains', f"options:{underlying}:{exp_str}")
+        if not entry:
+            return None
+        
+        response, meta = entry
+        strike_range = meta.get('strike_range')
+        return response, tuple(strike_range) if strike_range else None
+    
+    async def _cache_options_chain(
+        self,
+        underlying: str,
+        expiration: Optional[date],
+        strike_range: Optional[tuple[float, float]],
+        response: DataResponse
+    ):
+        """Cache options chain data along with the strike range it covers"""
+        exp_str = expiration.isoformat() if expiration else "all"
+        ttl = self.cache_policies.storage_ttl('options_chains')
+        await self._set_cached(
+            'options_chains', f"options:{underlying}:{exp_str}", response, ttl,
+            meta={'strike_range': list(strike_range) if strike_range else None}
+        )
+    
+    @staticmethod
+    def _strike_range_covers(
+        covered: Optional[tuple[float, float]],
+        requested: Optional[tuple[float, float]]
+    ) -> bool:
+        """Check if a cached strike range (None = all strikes) covers a requested one"""
+        if covered is None:
+            return True
+        if requested is None:
+            return False
+        return covered[0] <= requested[0] and requested[1] <= covered[1]
+    
+    @staticmethod
+    def _strike_range_hull(
+        requested: Optional[tuple[float, float]],
+        covered: Optional[tuple[float, float]]
+    ) -> Optional[tuple[float, float]]:
+        """Smallest strike range spanning both ranges (None = all strikes)"""
+        if requested is None or covered is None:
+            return None
+        return (min(requested[0], covered[0]), max(requested[1], covered[1]))
+    
+    @staticmethod
+    def _slice_options_chain(
+        response: DataResponse,
+        strike_range: Optional[tuple[float, float]]
+    ) -> DataResponse:
+        """Narrow a chain response to the requested strike range"""
+        if not strike_range or not response.success or not isinstance(response.data, OptionsChain):
+            return response
+        return response.model_copy(update={'data': response.data.filter_strikes(*strike_range)})
+    
+    async def _get_cached_historical(self, symbol: str, start_date: date, end_date: date, interval: str) -> Optional[DataResponse]:
+        """Get cached historical data"""
+        key = f"historical:{symbol}:{start_date}:{end_date}:{interval}"
+        return await self._get_cached('historical_data', key)
+    
+    async def _cache_historical_data(self, symbol: str, start_date: date, end_date: date, interval: str, response: DataResponse):
+        """Cache historical data"""
+        key = f"historical:{symbol}:{start_date}:{end_date}:{interval}"
+        ttl = self.cache_policies.storage_ttl('historical_data', interval, end_date)
+        await self._set_cached('historical_data', key, response, ttl)
+    
     # Monitoring and health
     
     def get_stats(self) -> Dict[str, Any]:
@@ -532,6 +1710,23 @@ class DataManager:
                 for name, provider in self.providers.items()
             },
             'cache_enabled': self.cache_enabled,
+            'cache_codec': self.cache_codec.key_prefix,
+            'local_cache_enabled': self.local_cache_enabled,
+            'stale_while_revalidate': self.stale_while_revalidate,
+            'cache_policies': self.cache_policies.describe(),
+            'request_coalescing': self.single_flight.get_stats(),
+            'concurrency': self.concurrency.get_stats(),
+            'http_pool': self.http_client.get_stats(),
+            'streaming': self.streaming_provider.get_stats() if self.streaming_provider else None,
+            'circuit_breakers': self.circuit_breakers.get_stats(),
+            'provider_routing': {
+                name: self.provider_scoreboard.get_provider_stats(provider)
+                for name, provider in self.providers.items()
+            },
+            'local_cache': {
+                name: cache.get_stats()
+                for name, cache in self.local_caches.items()
+            },
             'cache_hit_rate': (
                 self.request_stats['cache_hits'] / 
                 max(self.request_stats['total_requests'], 1)
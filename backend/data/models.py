@@ -3,11 +3,57 @@ Standardized Data Models for Derivagent
 Unified data structures for broker APIs and market data providers
 """
 
-from pydantic import BaseModel, Field, validator
-from typing import Optional, List, Dict, Any, Union
-from datetime import datetime, date
+from pydantic import BaseModel, Field, PrivateAttr, PlainSerializer, validator
+from pydantic_core import core_schema
+from typing import Optional, List, Dict, Any, Union, Iterator, Tuple, Type, TypeVar, Callable, Annotated
+from datetime import datetime, date, timedelta
 from decimal import Decimal
 from enum import Enum
+import bisect
+import os
+import re
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+
+# Numeric backend for market data prices (quotes, bars, chains, greeks):
+# "decimal" (default) or "float" for float64 arithmetic in analytics.
+# Order, position and account money fields are always Decimal.
+NUMERIC_MODE = os.environ.get('DERIVAGENT_NUMERIC_MODE', 'decimal').strip().lower()
+if NUMERIC_MODE not in ('decimal', 'float'):
+    raise ValueError(f"Unknown DERIVAGENT_NUMERIC_MODE: {NUMERIC_MODE} (expected 'decimal' or 'float')")
+
+
+def _float_price_json(value: float) -> str:
+    """JSON text of a float price, matching what the Decimal mode emits"""
+    # Provider payloads send integral prices as JSON ints (strike 4000 -> "4000")
+    text = repr(value)
+    return str(Decimal(text[:-2] if text.endswith('.0') else text))
+
+
+if NUMERIC_MODE == 'float':
+    Price = Annotated[float, PlainSerializer(_float_price_json, return_type=str, when_used='json')]
+    
+    def to_price(value: Any) -> float:
+        """Convert a provider value (number or numeric string) to the market data price type"""
+        return float(value)
+else:
+    Price = Decimal
+    
+    def to_price(value: Any) -> Decimal:
+        """Convert a provider value (number or numeric string) to the market data price type"""
+        return Decimal(str(value))
+
+
+def _price_from_float(value: float) -> Price:
+    """Price for a float read back from a NumPy column, as the provider would have sent it"""
+    text = repr(float(value))
+    return to_price(text[:-2] if text.endswith('.0') else text)
+
+
+# Exchange timezone; bar timestamps are exchange-local so their dates are trading dates
+MARKET_TIMEZONE = ZoneInfo("America/New_York")
 
 
 class MarketDataType(str, Enum):
@@ -61,24 +107,88 @@ class PositionType(str, Enum):
     SHORT = "short"
 
 
+class RequestPriority(str, Enum):
+    """Scheduling priority for upstream data requests"""
+    CRITICAL = "critical"  # Order-critical: position checks, 0DTE quotes
+    HIGH = "high"
+    NORMAL = "normal"
+    LOW = "low"  # Background analysis and cache revalidation
+    
+    @property
+    def rank(self) -> int:
+        """Queue rank, lower is served first"""
+        return list(RequestPriority).index(self)
+
+
 # Base Data Models
 
-class Quote(BaseModel):
+ModelT = TypeVar('ModelT', bound='MarketDataModel')
+
+# Per model class: plain field defaults and default factories, for trusted()
+_TRUSTED_DEFAULTS: Dict[type, Tuple[Dict[str, Any], Dict[str, Callable[[], Any]]]] = {}
+
+
+class MarketDataModel(BaseModel):
+    """Base for market data models built in bulk from provider payloads"""
+    
+    @classmethod
+    def trusted(cls: Type[ModelT], **data: Any) -> ModelT:
+        """
+        Build an instance from already-typed provider data, skipping validation
+        
+        Nothing is checked or coerced: callers must pass every required field
+        with its declared type (Price values from to_price(), int sizes, datetime timestamps,
+        enum members). Unlike model_construct(), which is slower than validating
+        already-typed values, this assigns the field dict directly.
+        """
+        defaults = _TRUSTED_DEFAULTS.get(cls)
+        if defaults is None:
+            # Every field in declaration order, so serialized output matches validated instances
+            defaults = (
+                {name: None if field.is_required() or field.default_factory is not None else field.default
+                 for name, field in cls.model_fields.items()},
+                {name: field.default_factory for name, field in cls.model_fields.items()
+                 if field.default_factory is not None}
+            )
+            _TRUSTED_DEFAULTS[cls] = defaults
+        
+        template, factories = defaults
+        values = dict(template)
+        values.update(data)
+        for name, factory in factories.items():
+            if name not in data:
+                values[name] = factory()
+        
+        # Same state model_construct() sets up, minus its per-field Python loop
+        instance = cls.__new__(cls)
+        object.__setattr__(instance, '__dict__', values)
+        object.__setattr__(instance, '__pydantic_fields_set__', set(data))
+        object.__setattr__(instance, '__pydantic_extra__', None)
+        object.__setattr__(instance, '__pydantic_private__', None)
+        return instance
+    
+    def trusted_update(self, **data: Any):
+        """Set already-typed field values in place, skipping BaseModel.__setattr__"""
+        self.__dict__.update(data)
+        self.__pydantic_fields_set__.update(data)
+
+
+class Quote(MarketDataModel):
     """Real-time quote data"""
     symbol: str
-    bid: Optional[Decimal] = None
-    ask: Optional[Decimal] = None
-    last: Optional[Decimal] = None
-    mark: Optional[Decimal] = None
+    bid: Optional[Price] = None
+    ask: Optional[Price] = None
+    last: Optional[Price] = None
+    mark: Optional[Price] = None
     bid_size: Optional[int] = None
     ask_size: Optional[int] = None
     volume: Optional[int] = None
-    open_price: Optional[Decimal] = None
-    high: Optional[Decimal] = None
-    low: Optional[Decimal] = None
-    close_price: Optional[Decimal] = None
-    change: Optional[Decimal] = None
-    change_percent: Optional[Decimal] = None
+    open_price: Optional[Price] = None
+    high: Optional[Price] = None
+    low: Optional[Price] = None
+    close_price: Optional[Price] = None
+    change: Optional[Price] = None
+    change_percent: Optional[Price] = None
     timestamp: datetime
     market_hours: bool = True
     source: str = Field(..., description="Data source identifier")
@@ -90,35 +200,35 @@ class Quote(BaseModel):
         }
 
 
-class Greeks(BaseModel):
+class Greeks(MarketDataModel):
     """Options Greeks"""
-    delta: Optional[Decimal] = None
-    gamma: Optional[Decimal] = None
-    theta: Optional[Decimal] = None
-    vega: Optional[Decimal] = None
-    rho: Optional[Decimal] = None
-    implied_volatility: Optional[Decimal] = None
-    intrinsic_value: Optional[Decimal] = None
-    extrinsic_value: Optional[Decimal] = None
+    delta: Optional[Price] = None
+    gamma: Optional[Price] = None
+    theta: Optional[Price] = None
+    vega: Optional[Price] = None
+    rho: Optional[Price] = None
+    implied_volatility: Optional[Price] = None
+    intrinsic_value: Optional[Price] = None
+    extrinsic_value: Optional[Price] = None
     
     class Config:
         json_encoders = {Decimal: str}
 
 
-class OptionContract(BaseModel):
+class OptionContract(MarketDataModel):
     """Individual option contract"""
     symbol: str
     underlying_symbol: str
     option_type: OptionType
-    strike_price: Decimal
+    strike_price: Price
     expiration_date: date
     days_to_expiration: Optional[int] = None
     
     # Pricing
-    bid: Optional[Decimal] = None
-    ask: Optional[Decimal] = None
-    last: Optional[Decimal] = None
-    mark: Optional[Decimal] = None
+    bid: Optional[Price] = None
+    ask: Optional[Price] = None
+    last: Optional[Price] = None
+    mark: Optional[Price] = None
     
     # Volume and Interest
     volume: Optional[int] = None
@@ -132,14 +242,14 @@ class OptionContract(BaseModel):
     source: str
     
     @property
-    def bid_ask_spread(self) -> Optional[Decimal]:
+    def bid_ask_spread(self) -> Optional[Price]:
         """Calculate bid-ask spread"""
         if self.bid and self.ask:
             return self.ask - self.bid
         return None
     
     @property
-    def mid_price(self) -> Optional[Decimal]:
+    def mid_price(self) -> Optional[Price]:
         """Calculate mid price"""
         if self.bid and self.ask:
             return (self.bid + self.ask) / 2
@@ -153,10 +263,96 @@ class OptionContract(BaseModel):
         }
 
 
+class OptionsChainIndex:
+    """
+    Lookup structures over an assembled OptionsChain
+    
+    Features:
+    - Contracts sorted by strike per expiration and type, for O(log n) strike queries
+    - Contracts sorted by delta per expiration and type, for O(log n) delta queries
+    - Sorted unique strikes per expiration
+    - Hash lookup by OCC symbol
+    """
+    
+    def __init__(self, expirations: Dict[str, List[OptionContract]]):
+        self.signature = OptionsChainIndex.signature_of(expirations)
+        self.by_symbol: Dict[str, OptionContract] = {}
+        self.strikes: Dict[str, List[Price]] = {}
+        self._by_strike: Dict[tuple, Tuple[List[Price], List[OptionContract]]] = {}
+        self._by_delta: Dict[tuple, Tuple[List[float], List[OptionContract]]] = {}
+        
+        for exp_str, contracts in expirations.items():
+            self.strikes[exp_str] = sorted(set(c.strike_price for c in contracts))
+            
+            for option_type in (OptionType.CALL, OptionType.PUT):
+                typed = sorted(
+                    (c for c in contracts if c.option_type == option_type),
+                    key=lambda c: c.strike_price
+                )
+                self._by_strike[(exp_str, option_type)] = ([c.strike_price for c in typed], typed)
+                
+                with_delta = sorted(
+                    (c for c in typed if c.greeks and c.greeks.delta is not None),
+                    key=lambda c: c.greeks.delta
+                )
+                self._by_delta[(exp_str, option_type)] = ([float(c.greeks.delta) for c in with_delta], with_delta)
+            
+            for contract in contracts:
+                self.by_symbol[contract.symbol] = contract
+    
+    @staticmethod
+    def signature_of(expirations: Dict[str, List[OptionContract]]) -> tuple:
+        """Cheap fingerprint of the expiration lists, to detect a chain changed after indexing"""
+        return tuple((exp_str, id(contracts), len(contracts)) for exp_str, contracts in expirations.items())
+    
+    def find(self, exp_str: str, option_type: OptionType, strike: Price) -> Optional[OptionContract]:
+        """Contract with exactly this strike"""
+        strikes, contracts = self._by_strike.get((exp_str, option_type), ([], []))
+        i = bisect.bisect_left(strikes, strike)
+        if i < len(strikes) and strikes[i] == strike:
+            return contracts[i]
+        return None
+    
+    def nearest_strike(self, exp_str: str, option_type: OptionType, target: Price) -> Optional[OptionContract]:
+        """Contract whose strike is closest to target (lower strike on ties)"""
+        strikes, contracts = self._by_strike.get((exp_str, option_type), ([], []))
+        i = _nearest(strikes, target)
+        return contracts[i] if i is not None else None
+    
+    def nearest_delta(self, exp_str: str, option_type: OptionType, target: float) -> Optional[OptionContract]:
+        """Contract whose delta is closest to target, among contracts with greeks"""
+        deltas, contracts = self._by_delta.get((exp_str, option_type), ([], []))
+        i = _nearest(deltas, target)
+        return contracts[i] if i is not None else None
+    
+    def strike_window(
+        self,
+        exp_str: str,
+        option_type: OptionType,
+        min_strike: Price,
+        max_strike: Price
+    ) -> List[OptionContract]:
+        """Contracts with min_strike <= strike <= max_strike, ascending"""
+        strikes, contracts = self._by_strike.get((exp_str, option_type), ([], []))
+        return contracts[bisect.bisect_left(strikes, min_strike):bisect.bisect_right(strikes, max_strike)]
+
+
+def _nearest(sorted_values: list, target) -> Optional[int]:
+    """Index of the value closest to target in a sorted list (lower index on ties)"""
+    if not sorted_values:
+        return None
+    i = bisect.bisect_left(sorted_values, target)
+    if i == 0:
+        return 0
+    if i == len(sorted_values):
+        return i - 1
+    return i - 1 if target - sorted_values[i - 1] <= sorted_values[i] - target else i
+
+
 class OptionsChain(BaseModel):
     """Complete options chain for an underlying"""
     underlying_symbol: str
-    underlying_price: Optional[Decimal] = None
+    underlying_price: Optional[Price] = None
     timestamp: datetime
     source: str
     
@@ -167,24 +363,84 @@ class OptionsChain(BaseModel):
     market_hours: bool = True
     total_contracts: int = 0
     
+    # Lookup index, built once the chain is assembled (rebuilt if contracts change)
+    _index: Optional[OptionsChainIndex] = PrivateAttr(default=None)
+    
+    def build_index(self) -> OptionsChainIndex:
+        """Build (or rebuild) the lookup index; call after assembling the chain"""
+        self._index = OptionsChainIndex(self.expirations)
+        return self._index
+    
+    @property
+    def index(self) -> OptionsChainIndex:
+        """Lookup index, built on first use or when the expiration lists changed"""
+        if self._index is None or self._index.signature != OptionsChainIndex.signature_of(self.expirations):
+            return self.build_index()
+        return self._index
+    
     def get_contracts_by_expiration(self, expiration: date) -> List[OptionContract]:
         """Get contracts for specific expiration"""
         exp_str = expiration.isoformat()
         return self.expirations.get(exp_str, [])
     
-    def get_strikes_for_expiration(self, expiration: date) -> List[Decimal]:
+    def get_strikes_for_expiration(self, expiration: date) -> List[Price]:
         """Get available strikes for expiration"""
-        contracts = self.get_contracts_by_expiration(expiration)
-        return sorted(set(c.strike_price for c in contracts))
+        return list(self.index.strikes.get(expiration.isoformat(), []))
+    
+    def filter_strikes(self, min_strike: Union[Decimal, float], max_strike: Union[Decimal, float]) -> "OptionsChain":
+        """Get a copy of the chain limited to strikes within [min_strike, max_strike]"""
+        expirations = {}
+        for exp_str, contracts in self.expirations.items():
+            filtered = [c for c in contracts if min_strike <= c.strike_price <= max_strike]
+            if filtered:
+                expirations[exp_str] = filtered
+        
+        return self.model_copy(update={
+            'expirations': expirations,
+            'total_contracts': sum(len(c) for c in expirations.values())
+        })
     
-    def find_contract(self, strike: Decimal, expiration: date, option_type: OptionType) -> Optional[OptionContract]:
+    def find_contract(self, strike: Union[Decimal, float], expiration: date, option_type: OptionType) -> Optional[OptionContract]:
         """Find specific option contract"""
-        contracts = self.get_contracts_by_expiration(expiration)
-        for contract in contracts:
-            if (contract.strike_price == strike and 
-                contract.option_type == option_type):
-                return contract
-        return None
+        return self.index.find(expiration.isoformat(), option_type, to_price(strike))
+    
+    def get_contract_by_symbol(self, symbol: str) -> Optional[OptionContract]:
+        """Find a contract by its OCC symbol"""
+        return self.index.by_symbol.get(symbol)
+    
+    def nearest_strike(
+        self,
+        expiration: date,
+        option_type: OptionType,
+        target: Union[Decimal, float]
+    ) -> Optional[OptionContract]:
+        """Contract whose strike is closest to target"""
+        return self.index.nearest_strike(expiration.isoformat(), option_type, to_price(target))
+    
+    def nearest_delta(
+        self,
+        expiration: date,
+        option_type: OptionType,
+        target_delta: Union[Decimal, float]
+    ) -> Optional[OptionContract]:
+        """Contract whose delta is closest to target_delta (puts use negative deltas)"""
+        return self.index.nearest_delta(expiration.isoformat(), option_type, float(target_delta))
+    
+    def strike_window(
+        self,
+        expiration: date,
+        option_type: OptionType,
+        min_strike: Union[Decimal, float],
+        max_strike: Union[Decimal, float]
+    ) -> List[OptionContract]:
+        """Contracts with strikes within [min_strike, max_strike], ascending"""
+        return self.index.strike_window(
+            expiration.isoformat(), option_type, to_price(min_strike), to_price(max_strike)
+        )
+    
+    def to_columnar(self) -> "ColumnarOptionsChain":
+        """Convert to an array-backed chain"""
+        return ColumnarOptionsChain.from_chain(self)
     
     class Config:
         json_encoders = {
@@ -193,14 +449,238 @@ class OptionsChain(BaseModel):
         }
 
 
-class HistoricalBar(BaseModel):
+class ColumnarOptionsChain:
+    """
+    Array-backed options chain
+    
+    Features:
+    - One NumPy column per field, rows sorted by expiration, type (calls first), strike
+    - Zero-copy per-expiration views sharing the parent's columns
+    - OptionContract models materialized lazily, only for rows a caller asks for
+    
+    Missing prices and greeks are NaN; missing volume/open interest are -1.
+    Columns are read as attributes (chain.strike, chain.delta, ...).
+    """
+    
+    FLOAT_COLUMNS = (
+        'strike', 'bid', 'ask', 'last', 'mark',
+        'delta', 'gamma', 'theta', 'vega', 'rho', 'implied_volatility'
+    )
+    INT_COLUMNS = ('volume', 'open_interest')
+    GREEK_COLUMNS = ('delta', 'gamma', 'theta', 'vega', 'rho', 'implied_volatility')
+    COLUMNS = ('symbol', 'expiration', 'is_call') + FLOAT_COLUMNS + INT_COLUMNS
+    
+    def __init__(
+        self,
+        underlying_symbol: str,
+        columns: Dict[str, Any],
+        underlying_price: Optional[Price] = None,
+        timestamp: Optional[datetime] = None,
+        source: str = "",
+        presorted: bool = False
+    ):
+        """
+        Build from column arrays (symbol, expiration, is_call and strike are required)
+        
+        Args:
+            columns: Column name -> array-like, all of equal length
+            presorted: Rows are already in (expiration, type, strike) order
+        """
+        self.underlying_symbol = underlying_symbol
+        self.underlying_price = underlying_price
+        self.timestamp = timestamp or datetime.now()
+        self.source = source
+        
+        size = len(columns['symbol'])
+        built = {
+            'symbol': np.asarray(columns['symbol'], dtype=object),
+            'expiration': np.asarray(columns['expiration'], dtype='datetime64[D]'),
+            'is_call': np.asarray(columns['is_call'], dtype=bool)
+        }
+        for name in self.FLOAT_COLUMNS:
+            values = columns.get(name)
+            built[name] = np.full(size, np.nan) if values is None else np.asarray(values, dtype=np.float64)
+        for name in self.INT_COLUMNS:
+            values = columns.get(name)
+            built[name] = np.full(size, -1, dtype=np.int64) if values is None else np.asarray(values, dtype=np.int64)
+        
+        for name, values in built.items():
+            if len(values) != size:
+                raise ValueError(f"Column {name} has {len(values)} rows, expected {size}")
+        
+        if not presorted and size:
+            order = np.lexsort((built['strike'], ~built['is_call'], built['expiration']))
+            built = {name: values[order] for name, values in built.items()}
+        
+        self.columns: Dict[str, np.ndarray] = built
+        self._materialized: Dict[int, OptionContract] = {}
+    
+    @classmethod
+    def from_contracts(
+        cls,
+        underlying_symbol: str,
+        contracts: List[OptionContract],
+        underlying_price: Optional[Price] = None,
+        timestamp: Optional[datetime] = None,
+        source: str = ""
+    ) -> "ColumnarOptionsChain":
+        """Build from OptionContract models"""
+        def number(value) -> float:
+            return float(value) if value is not None else np.nan
+        
+        def greek(contract: OptionContract, name: str) -> float:
+            return number(getattr(contract.greeks, name)) if contract.greeks else np.nan
+        
+        columns = {
+            'symbol': [c.symbol for c in contracts],
+            'expiration': [c.expiration_date for c in contracts],
+            'is_call': [c.option_type == OptionType.CALL for c in contracts],
+            'strike': [float(c.strike_price) for c in contracts],
+            'bid': [number(c.bid) for c in contracts],
+            'ask': [number(c.ask) for c in contracts],
+            'last': [number(c.last) for c in contracts],
+            'mark': [number(c.mark) for c in contracts],
+            'volume': [c.volume if c.volume is not None else -1 for c in contracts],
+            'open_interest': [c.open_interest if c.open_interest is not None else -1 for c in contracts]
+        }
+        for name in cls.GREEK_COLUMNS:
+            columns[name] = [greek(c, name) for c in contracts]
+        
+        return cls(underlying_symbol, columns, underlying_price, timestamp, source)
+    
+    @classmethod
+    def from_chain(cls, chain: OptionsChain) -> "ColumnarOptionsChain":
+        """Build from a model-based OptionsChain"""
+        contracts = [contract for contracts in chain.expirations.values() for contract in contracts]
+        return cls.from_contracts(
+            chain.underlying_symbol, contracts, chain.underlying_price, chain.timestamp, chain.source
+        )
+    
+    def __getattr__(self, name: str) -> np.ndarray:
+        columns = self.__dict__.get('columns')
+        if columns is not None and name in columns:
+            return columns[name]
+        raise AttributeError(f"{type(self).__name__} has no attribute {name!r}")
+    
+    def __len__(self) -> int:
+        return len(self.columns['symbol'])
+    
+    @property
+    def expirations(self) -> List[date]:
+        """Expiration dates in the chain, ascending"""
+        return [value.astype(date) for value in np.unique(self.columns['expiration'])]
+    
+    def _bounds(self, expiration: date) -> Tuple[int, int]:
+        key = np.datetime64(expiration, 'D')
+        column = self.columns['expiration']
+        return int(np.searchsorted(column, key, 'left')), int(np.searchsorted(column, key, 'right'))
+    
+    def _view(self, start: int, stop: int) -> "ColumnarOptionsChain":
+        view = object.__new__(type(self))
+        view.underlying_symbol = self.underlying_symbol
+        view.underlying_price = self.underlying_price
+        view.timestamp = self.timestamp
+        view.source = self.source
+        # Basic slices share memory with the parent columns
+        view.columns = {name: values[start:stop] for name, values in self.columns.items()}
+        view._materialized = {}
+        return view
+    
+    def expiration(self, expiration: date) -> "ColumnarOptionsChain":
+        """Zero-copy view of the contracts for one expiration"""
+        return self._view(*self._bounds(expiration))
+    
+    def iter_expirations(self) -> Iterator[Tuple[date, "ColumnarOptionsChain"]]:
+        """Yield (expiration, view) pairs in expiration order"""
+        column = self.columns['expiration']
+        if not len(column):
+            return
+        starts = np.flatnonzero(np.r_[True, column[1:] != column[:-1]])
+        stops = np.r_[starts[1:], len(column)]
+        for start, stop in zip(starts, stops):
+            yield column[start].astype(date), self._view(int(start), int(stop))
+    
+    @property
+    def mid(self) -> np.ndarray:
+        """Mid prices (NaN where either side is missing)"""
+        return (self.columns['bid'] + self.columns['ask']) / 2
+    
+    def contract(self, index: int) -> OptionContract:
+        """Materialize the OptionContract for row index (cached)"""
+        if index < 0:
+            index += len(self)
+        contract = self._materialized.get(index)
+        if contract is None:
+            contract = self._build_contract(index)
+            self._materialized[index] = contract
+        return contract
+    
+    def __getitem__(self, index: int) -> OptionContract:
+        return self.contract(index)
+    
+    def __iter__(self) -> Iterator[OptionContract]:
+        for index in range(len(self)):
+            yield self.contract(index)
+    
+    def _build_contract(self, index: int) -> OptionContract:
+        columns = self.columns
+        
+        def decimal(name: str) -> Optional[Price]:
+            value = columns[name][index]
+            return None if np.isnan(value) else _price_from_float(value)
+        
+        def count(name: str) -> Optional[int]:
+            value = int(columns[name][index])
+            return None if value < 0 else value
+        
+        greeks = {name: decimal(name) for name in self.GREEK_COLUMNS}
+        expiration_date = columns['expiration'][index].astype(date)
+        
+        return OptionContract.trusted(
+            symbol=columns['symbol'][index],
+            underlying_symbol=self.underlying_symbol,
+            option_type=OptionType.CALL if columns['is_call'][index] else OptionType.PUT,
+            strike_price=decimal('strike'),
+            expiration_date=expiration_date,
+            days_to_expiration=(expiration_date - date.today()).days,
+            bid=decimal('bid'),
+            ask=decimal('ask'),
+            last=decimal('last'),
+            mark=decimal('mark'),
+            volume=count('volume'),
+            open_interest=count('open_interest'),
+            greeks=Greeks.trusted(**greeks) if any(value is not None for value in greeks.values()) else None,
+            timestamp=self.timestamp,
+            source=self.source
+        )
+    
+    def to_chain(self) -> OptionsChain:
+        """Materialize a model-based OptionsChain"""
+        chain = OptionsChain(
+            underlying_symbol=self.underlying_symbol,
+            underlying_price=self.underlying_price,
+            timestamp=self.timestamp,
+            source=self.source,
+            total_contracts=len(self)
+        )
+        for expiration, view in self.iter_expirations():
+            chain.expirations[expiration.isoformat()] = list(view)
+        return chain
+    
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the numeric columns (symbols excluded)"""
+        return sum(values.nbytes for name, values in self.columns.items() if name != 'symbol')
+
+
+class HistoricalBar(MarketDataModel):
     """Historical price bar"""
     symbol: str
     timestamp: datetime
-    open_price: Decimal
-    high: Decimal
-    low: Decimal
-    close_price: Decimal
+    open_price: Price
+    high: Price
+    low: Price
+    close_price: Price
     volume: int
     
     class Config:
@@ -210,6 +690,222 @@ class HistoricalBar(BaseModel):
         }
 
 
+class BarSeries:
+    """
+    Array-backed historical bars for one symbol
+    
+    Features:
+    - Contiguous NumPy columns (timestamp as epoch milliseconds, OHLC, volume)
+    - Zero-copy slicing by position or date range
+    - Resampling to coarser intervals without materializing bars
+    - Conversion to and from the List[HistoricalBar] form
+    
+    Columns are read as attributes (series.close, series.volume, ...).
+    Rows are in ascending timestamp order. As a model field it serializes
+    to the same list of bars as List[HistoricalBar].
+    """
+    
+    FLOAT_COLUMNS = ('open', 'high', 'low', 'close')
+    COLUMNS = ('timestamp',) + FLOAT_COLUMNS + ('volume',)
+    
+    # Resample interval units in milliseconds ('w' and 'mo' are calendar aligned)
+    _UNIT_MS = {'m': 60_000, 'h': 3_600_000, 'd': 86_400_000}
+    
+    def __init__(
+        self,
+        symbol: str,
+        columns: Dict[str, Any],
+        interval: Optional[str] = None,
+        presorted: bool = False
+    ):
+        """
+        Build from column arrays (all of COLUMNS are required)
+        
+        Args:
+            columns: Column name -> array-like, all of equal length
+            interval: Bar interval (1m, 1h, 1d, ...) if known
+            presorted: Rows are already in timestamp order
+        """
+        self.symbol = symbol
+        self.interval = interval
+        
+        built = {
+            'timestamp': np.asarray(columns['timestamp'], dtype=np.int64),
+            'volume': np.asarray(columns['volume'], dtype=np.int64)
+        }
+        for name in self.FLOAT_COLUMNS:
+            built[name] = np.asarray(columns[name], dtype=np.float64)
+        
+        size = len(built['timestamp'])
+        for name, values in built.items():
+            if len(values) != size:
+                raise ValueError(f"Column {name} has {len(values)} rows, expected {size}")
+        
+        if not presorted and size:
+            order = np.argsort(built['timestamp'], kind='stable')
+            built = {name: values[order] for name, values in built.items()}
+        
+        self.columns: Dict[str, np.ndarray] = built
+    
+    @classmethod
+    def from_bars(cls, symbol: str, bars: List[HistoricalBar], interval: Optional[str] = None) -> "BarSeries":
+        """Build from HistoricalBar models"""
+        return cls(symbol, {
+            'timestamp': [round(bar.timestamp.timestamp() * 1000) for bar in bars],
+            'open': [float(bar.open_price) for bar in bars],
+            'high': [float(bar.high) for bar in bars],
+            'low': [float(bar.low) for bar in bars],
+            'close': [float(bar.close_price) for bar in bars],
+            'volume': [bar.volume for bar in bars]
+        }, interval)
+    
+    def __getattr__(self, name: str) -> np.ndarray:
+        columns = self.__dict__.get('columns')
+        if columns is not None and name in columns:
+            return columns[name]
+        raise AttributeError(f"{type(self).__name__} has no attribute {name!r}")
+    
+    def __len__(self) -> int:
+        return len(self.columns['timestamp'])
+    
+    @property
+    def datetimes(self) -> np.ndarray:
+        """Timestamps as datetime64[ms] (UTC)"""
+        return self.columns['timestamp'].astype('datetime64[ms]')
+    
+    def _view(self, index: slice) -> "BarSeries":
+        view = object.__new__(type(self))
+        view.symbol = self.symbol
+        view.interval = self.interval
+        # Basic slices share memory with the parent columns
+        view.columns = {name: values[index] for name, values in self.columns.items()}
+        return view
+    
+    def __getitem__(self, index: Union[int, slice]) -> Union[HistoricalBar, "BarSeries"]:
+        """Bar at a position, or a zero-copy series for a slice"""
+        if isinstance(index, slice):
+            return self._view(index)
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("BarSeries index out of range")
+        return self._build_bar(index)
+    
+    def __iter__(self) -> Iterator[HistoricalBar]:
+        return iter(self.to_bars())
+    
+    def between(self, start_date: date, end_date: date) -> "BarSeries":
+        """Zero-copy view of the bars dated within [start_date, end_date] (exchange dates)"""
+        start_ms = datetime.combine(start_date, datetime.min.time(), MARKET_TIMEZONE).timestamp() * 1000
+        end_ms = datetime.combine(end_date + timedelta(days=1), datetime.min.time(), MARKET_TIMEZONE).timestamp() * 1000
+        column = self.columns['timestamp']
+        return self._view(slice(
+            int(np.searchsorted(column, start_ms, 'left')),
+            int(np.searchsorted(column, end_ms, 'left'))
+        ))
+    
+    def tail(self, count: int) -> "BarSeries":
+        """Zero-copy view of the last count bars"""
+        return self._view(slice(max(len(self) - count, 0), None))
+    
+    def _period_keys(self, interval: str) -> np.ndarray:
+        match = re.fullmatch(r'(\d*)(mo|m|h|d|w)', interval.strip().lower())
+        if not match:
+            raise ValueError(f"Unsupported resample interval: {interval}")
+        step = int(match.group(1) or 1)
+        unit = match.group(2)
+        timestamps = self._exchange_timestamps()
+        
+        if unit == 'mo':
+            months = timestamps.astype('datetime64[ms]').astype('datetime64[M]').astype(np.int64)
+            return months // step
+        if unit == 'w':
+            # Epoch day 0 was a Thursday, shift so weeks start on Monday
+            return (timestamps // self._UNIT_MS['d'] + 3) // (7 * step)
+        return timestamps // (self._UNIT_MS[unit] * step)
+    
+    def _exchange_timestamps(self) -> np.ndarray:
+        """Timestamps shifted to exchange wall-clock milliseconds"""
+        timestamps = self.columns['timestamp']
+        if not len(timestamps):
+            return timestamps
+        # UTC offsets only change on whole UTC hours, so one lookup per hour is exact
+        hours, inverse = np.unique(timestamps // self._UNIT_MS['h'], return_inverse=True)
+        offsets = np.array([
+            datetime.fromtimestamp(int(hour) * 3600, MARKET_TIMEZONE).utcoffset().total_seconds() * 1000
+            for hour in hours
+        ], dtype=np.int64)
+        return timestamps + offsets[inverse]
+    
+    def resample(self, interval: str) -> "BarSeries":
+        """
+        Aggregate into coarser bars (e.g. 5m, 1h, 1d, 1w, 1mo)
+        
+        Periods are aligned in exchange time (weeks start Monday) and each
+        resampled bar is stamped with the timestamp of its first source bar.
+        """
+        if not len(self):
+            return BarSeries(self.symbol, {name: [] for name in self.COLUMNS}, interval, presorted=True)
+        
+        keys = self._period_keys(interval)
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        stops = np.r_[starts[1:], len(keys)]
+        columns = self.columns
+        
+        return BarSeries(self.symbol, {
+            'timestamp': columns['timestamp'][starts],
+            'open': columns['open'][starts],
+            'high': np.maximum.reduceat(columns['high'], starts),
+            'low': np.minimum.reduceat(columns['low'], starts),
+            'close': columns['close'][stops - 1],
+            'volume': np.add.reduceat(columns['volume'], starts)
+        }, interval, presorted=True)
+    
+    def _build_bar(self, index: int) -> HistoricalBar:
+        columns = self.columns
+        return HistoricalBar.trusted(
+            symbol=self.symbol,
+            timestamp=datetime.fromtimestamp(int(columns['timestamp'][index]) / 1000, MARKET_TIMEZONE),
+            open_price=_price_from_float(columns['open'][index]),
+            high=_price_from_float(columns['high'][index]),
+            low=_price_from_float(columns['low'][index]),
+            close_price=_price_from_float(columns['close'][index]),
+            volume=int(columns['volume'][index])
+        )
+    
+    def to_bars(self) -> List[HistoricalBar]:
+        """Materialize the legacy List[HistoricalBar] form"""
+        rows = zip(*(self.columns[name].tolist() for name in self.COLUMNS))
+        return [
+            HistoricalBar.trusted(
+                symbol=self.symbol,
+                timestamp=datetime.fromtimestamp(timestamp / 1000, MARKET_TIMEZONE),
+                open_price=_price_from_float(open_price),
+                high=_price_from_float(high),
+                low=_price_from_float(low),
+                close_price=_price_from_float(close_price),
+                volume=volume
+            )
+            for timestamp, open_price, high, low, close_price, volume in rows
+        ]
+    
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the columns"""
+        return sum(values.nbytes for values in self.columns.values())
+    
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source: Any, handler: Any) -> core_schema.CoreSchema:
+        """Accept BarSeries instances in model fields, serialized via to_bars()"""
+        return core_schema.is_instance_schema(
+            cls,
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                lambda series, info: [bar.model_dump(mode=info.mode) for bar in series.to_bars()],
+                info_arg=True
+            )
+        )
+
+
 class Position(BaseModel):
     """Account position"""
     symbol: str
@@ -348,12 +1044,14 @@ class DataRequest(BaseModel):
 class DataResponse(BaseModel):
     """Standardized data response"""
     success: bool
-    data: Optional[Union[Quote, OptionsChain, List[HistoricalBar], Position, Account]] = None
+    data: Optional[Union[Quote, OptionsChain, List[HistoricalBar], BarSeries, Position, Account]] = None
     error: Optional[str] = None
     source: Optional[str] = None
     cached: bool = False
     timestamp: datetime
     latency_ms: Optional[int] = None
+    age_seconds: Optional[float] = None  # Age of cached data when served
+    truncated: bool = False  # Provider stopped before the end of the requested range
     
     class Config:
         json_encoders = {
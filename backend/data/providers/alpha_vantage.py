@@ -3,17 +3,15 @@ Alpha Vantage Market Data Provider
 Implements market data via Alpha Vantage API for comprehensive coverage
 """
 
-import aiohttp
 import asyncio
 from typing import Optional, Dict, Any, List
 from datetime import datetime, date, timedelta
-from decimal import Decimal
 import json
 
-from .base import MarketDataProvider, DataProviderError, RateLimitError
+from .base import MarketDataProvider, DataProviderError, RateLimitError, RateLimiter
 from ..models import (
     Quote, OptionsChain, OptionContract, HistoricalBar, Greeks,
-    DataResponse, OptionType, MarketDataType
+    DataResponse, OptionType, MarketDataType, MARKET_TIMEZONE, to_price
 )
 
 
@@ -37,24 +35,23 @@ class AlphaVantageProvider(MarketDataProvider):
             raise ValueError("Alpha Vantage API key is required")
         
         self.base_url = "https://www.alphavantage.co/query"
-        self.session: Optional[aiohttp.ClientSession] = None
         
         # Rate limiting - free tier: 5 requests per minute, 25 per day
         self.rate_limit = config.get('rate_limit', 5)  # requests per minute
         self.daily_limit = config.get('daily_limit', 25)
         self.request_count_today = 0
-        self.last_request_time = datetime.now()
         self.daily_reset_time = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        self.rate_limiter = RateLimiter(
+            self.provider_name,
+            per_minute=self.rate_limit,
+            per_day=self.daily_limit,
+            burst=config.get('rate_limit_burst', 1)
+        )
         
     async def connect(self) -> bool:
         """Establish connection to Alpha Vantage API"""
         try:
-            self.session = aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=30),
-                headers={
-                    "User-Agent": "Derivagent/1.0"
-                }
-            )
+            self._ensure_session()
             
             # Test connection
             success = await self.test_connection()
@@ -74,9 +71,7 @@ class AlphaVantageProvider(MarketDataProvider):
     async def disconnect(self) -> bool:
         """Disconnect from Alpha Vantage API"""
         try:
-            if self.session:
-                await self.session.close()
-                self.session = None
+            await self._close_session()
             
             self.is_connected = False
             self.logger.info("✅ Disconnected from Alpha Vantage")
@@ -126,8 +121,7 @@ class AlphaVantageProvider(MarketDataProvider):
         try:
             await self._check_rate_limit()
             
-            if not self.session:
-                await self.connect()
+            self._ensure_session()
             
             params = {
                 'function': 'GLOBAL_QUOTE',
@@ -160,16 +154,16 @@ class AlphaVantageProvider(MarketDataProvider):
                     raise DataProviderError(f"No quote data available for {symbol}")
                 
                 # Alpha Vantage global quote format
-                price = Decimal(str(global_quote.get('05. price', 0))) if global_quote.get('05. price') else None
-                open_price = Decimal(str(global_quote.get('02. open', 0))) if global_quote.get('02. open') else None
-                high = Decimal(str(global_quote.get('03. high', 0))) if global_quote.get('03. high') else None
-                low = Decimal(str(global_quote.get('04. low', 0))) if global_quote.get('04. low') else None
-                prev_close = Decimal(str(global_quote.get('08. previous close', 0))) if global_quote.get('08. previous close') else None
-                change = Decimal(str(global_quote.get('09. change', 0))) if global_quote.get('09. change') else None
+                price = to_price(global_quote.get('05. price', 0)) if global_quote.get('05. price') else None
+                open_price = to_price(global_quote.get('02. open', 0)) if global_quote.get('02. open') else None
+                high = to_price(global_quote.get('03. high', 0)) if global_quote.get('03. high') else None
+                low = to_price(global_quote.get('04. low', 0)) if global_quote.get('04. low') else None
+                prev_close = to_price(global_quote.get('08. previous close', 0)) if global_quote.get('08. previous close') else None
+                change = to_price(global_quote.get('09. change', 0)) if global_quote.get('09. change') else None
                 change_percent = global_quote.get('10. change percent', '0%').replace('%', '')
                 
                 try:
-                    change_percent = Decimal(str(change_percent)) if change_percent else None
+                    change_percent = to_price(change_percent) if change_percent else None
                 except:
                     change_percent = None
                 
@@ -221,8 +215,7 @@ class AlphaVantageProvider(MarketDataProvider):
         try:
             await self._check_rate_limit()
             
-            if not self.session:
-                await self.connect()
+            self._ensure_session()
             
             # Map interval to Alpha Vantage function
             function_map = {
@@ -290,23 +283,24 @@ class AlphaVantageProvider(MarketDataProvider):
                 
                 for date_str, ohlcv in time_series.items():
                     try:
-                        # Parse timestamp
+                        # Parse timestamp (Alpha Vantage reports US/Eastern times)
                         if len(date_str) == 10:  # Daily format: YYYY-MM-DD
                             timestamp = datetime.strptime(date_str, '%Y-%m-%d')
                         else:  # Intraday format: YYYY-MM-DD HH:MM:SS
                             timestamp = datetime.strptime(date_str, '%Y-%m-%d %H:%M:%S')
+                        timestamp = timestamp.replace(tzinfo=MARKET_TIMEZONE)
                         
                         # Filter by date range
                         if timestamp.date() < start_date or timestamp.date() > end_date:
                             continue
                         
-                        bar = HistoricalBar(
+                        bar = HistoricalBar.trusted(
                             symbol=symbol,
                             timestamp=timestamp,
-                            open_price=Decimal(str(ohlcv.get('1. open', 0))),
-                            high=Decimal(str(ohlcv.get('2. high', 0))),
-                            low=Decimal(str(ohlcv.get('3. low', 0))),
-                            close_price=Decimal(str(ohlcv.get('4. close', 0))),
+                            open_price=to_price(ohlcv.get('1. open', 0)),
+                            high=to_price(ohlcv.get('2. high', 0)),
+                            low=to_price(ohlcv.get('3. low', 0)),
+                            close_price=to_price(ohlcv.get('4. close', 0)),
                             volume=int(ohlcv.get('5. volume', 0)) if ohlcv.get('5. volume') else 0
                         )
                         bars.append(bar)
@@ -368,19 +362,8 @@ class AlphaVantageProvider(MarketDataProvider):
             self.request_count_today = 0
             self.daily_reset_time = now.replace(hour=0, minute=0, second=0, microsecond=0)
         
-        # Check daily limit
-        if self.request_count_today >= self.daily_limit:
-            raise RateLimitError(f"Daily request limit of {self.daily_limit} exceeded")
-        
-        # Check per-minute rate limit
-        time_diff = (now - self.last_request_time).total_seconds()
-        min_interval = 60 / self.rate_limit  # seconds between requests
-        
-        if time_diff < min_interval:
-            sleep_time = min_interval - time_diff
-            await asyncio.sleep(sleep_time)
-        
-        self.last_request_time = datetime.now()
+        # Per-minute and daily token buckets (shared across workers when Redis is available)
+        await super()._check_rate_limit()
     
     def _track_request(self):
         """Track API request for rate limiting"""
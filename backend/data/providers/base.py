@@ -4,12 +4,20 @@ Abstract base class for all data providers (brokers and market data)
 """
 
 from abc import ABC, abstractmethod
-from typing import Optional, List, Dict, Any, Union
+from typing import Optional, List, Dict, Any, Union, Tuple
 from datetime import datetime, date
+import asyncio
+import heapq
+import itertools
 import logging
+import time
 
+import aiohttp
+
+from .http import HttpClientFactory, shared_http_client
+from ..concurrency import current_provider_call, on_priority_raised, request_priority
 from ..models import (
-    Quote, OptionsChain, HistoricalBar, Position, Account, Order,
+    Quote, OptionsChain, HistoricalBar, BarSeries, Position, Account, Order,
     DataRequest, DataResponse, MarketDataType, OrderType, OrderSide
 )
 
@@ -34,6 +42,176 @@ class DataNotAvailableError(DataProviderError):
     pass
 
 
+# Rate limiting
+
+class RateLimitBackend(ABC):
+    """
+    Token bucket storage for rate limiters
+    
+    acquire() takes tokens from a bucket if enough are available, otherwise
+    it takes nothing and reports how long until they will be.
+    """
+    
+    @abstractmethod
+    async def acquire(self, key: str, capacity: float, refill_per_second: float, tokens: float = 1) -> float:
+        """Take tokens from bucket key; returns 0 on success or seconds to wait"""
+        pass
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """Token buckets in process memory (per worker)"""
+    
+    def __init__(self):
+        self._buckets: Dict[str, Tuple[float, float]] = {}  # key -> (tokens, updated_at)
+    
+    async def acquire(self, key: str, capacity: float, refill_per_second: float, tokens: float = 1) -> float:
+        now = time.monotonic()
+        available, updated_at = self._buckets.get(key, (capacity, now))
+        available = min(capacity, available + (now - updated_at) * refill_per_second)
+        
+        if available >= tokens:
+            self._buckets[key] = (available - tokens, now)
+            return 0.0
+        
+        self._buckets[key] = (available, now)
+        return (tokens - available) / refill_per_second
+
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """
+    Token buckets in Redis, shared by every worker and replica
+    
+    The refill-and-take step runs as a single Lua script using the Redis
+    server clock, so concurrent processes can't overdraw a bucket. Falls
+    back to per-process buckets while Redis is unreachable.
+    """
+    
+    SCRIPT = """
+    local capacity = tonumber(ARGV[1])
+    local rate = tonumber(ARGV[2])
+    local requested = tonumber(ARGV[3])
+    local clock = redis.call('TIME')
+    local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+    local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+    local tokens = tonumber(state[1]) or capacity
+    local ts = tonumber(state[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+    local wait = 0
+    if tokens >= requested then
+        tokens = tokens - requested
+    else
+        wait = (requested - tokens) / rate
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+    redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000) + 1000)
+    return tostring(wait)
+    """
+    
+    def __init__(self, redis_client, key_prefix: str = "ratelimit"):
+        self.redis_client = redis_client
+        self.key_prefix = key_prefix
+        self.logger = logging.getLogger("data.ratelimit")
+        self._script = redis_client.register_script(self.SCRIPT)
+        self._fallback = InMemoryRateLimitBackend()
+    
+    async def acquire(self, key: str, capacity: float, refill_per_second: float, tokens: float = 1) -> float:
+        try:
+            wait = await self._script(
+                keys=[f"{self.key_prefix}:{key}"],
+                args=[capacity, refill_per_second, tokens]
+            )
+            return float(wait)
+        except Exception as e:
+            self.logger.warning(f"⚠️ Shared rate limiter unavailable, limiting per process: {e}")
+            return await self._fallback.acquire(key, capacity, refill_per_second, tokens)
+
+
+class RateLimiter:
+    """
+    Token-bucket rate limiter with per-minute and per-day limits
+    
+    Features:
+    - Per-minute bucket refills continuously; callers wait for a token
+    - Waiting callers are served by request priority, FIFO within a priority
+    - Per-day bucket refills over 24 hours; callers fail fast when empty
+    - Pluggable backend (in-memory or Redis shared across workers)
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        per_minute: Optional[float] = None,
+        per_day: Optional[float] = None,
+        burst: Optional[float] = None,
+        backend: Optional[RateLimitBackend] = None,
+        max_wait_seconds: float = 60
+    ):
+        self.name = name
+        self.per_minute = per_minute
+        self.per_day = per_day
+        # Burst of 1 spaces requests evenly, never exceeding the limit in any 60s window
+        self.burst = min(burst or 1, per_minute) if per_minute else None
+        self.backend = backend or InMemoryRateLimitBackend()
+        self.max_wait_seconds = max_wait_seconds
+        
+        # Local waiters for the per-minute bucket, heap of [rank, sequence, wakeup future]
+        self._queue: List[list] = []
+        self._sequence = itertools.count()
+    
+    async def acquire(self):
+        """Wait for a request slot, raising RateLimitError if none is available in time"""
+        if self.per_day:
+            wait = await self.backend.acquire(f"{self.name}:day", self.per_day, self.per_day / 86400)
+            if wait > 0:
+                raise RateLimitError(f"Daily request limit of {self.per_day:g} exceeded for {self.name}")
+        
+        if self.per_minute:
+            await self._acquire_minute_token()
+    
+    async def _acquire_minute_token(self):
+        """Wait for a per-minute token; only the highest priority waiter polls the bucket"""
+        loop = asyncio.get_running_loop()
+        ticket = [request_priority().rank, next(self._sequence), loop.create_future()]
+        heapq.heappush(self._queue, ticket)
+        deadline = time.monotonic() + self.max_wait_seconds
+        
+        def promote(rank: int):
+            if rank < ticket[0]:
+                ticket[0] = rank
+                heapq.heapify(self._queue)
+                if self._queue[0] is ticket and not ticket[2].done():
+                    ticket[2].set_result(None)
+        
+        try:
+            with on_priority_raised(promote):
+                await self._wait_for_token(ticket, deadline)
+        finally:
+            self._queue.remove(ticket)
+            heapq.heapify(self._queue)
+            if self._queue and not self._queue[0][2].done():
+                self._queue[0][2].set_result(None)
+    
+    async def _wait_for_token(self, ticket: list, deadline: float):
+        """Wait until ticket is at the head of the queue and the bucket has a token"""
+        loop = asyncio.get_running_loop()
+        while True:
+            if self._queue[0] is not ticket:
+                # Someone more urgent (or earlier) is ahead, wait to be woken
+                try:
+                    await asyncio.wait_for(asyncio.shield(ticket[2]), max(deadline - time.monotonic(), 0))
+                except asyncio.TimeoutError:
+                    raise RateLimitError(f"Rate limit of {self.per_minute:g}/min exceeded for {self.name}")
+                ticket[2] = loop.create_future()
+                continue
+            
+            wait = await self.backend.acquire(f"{self.name}:minute", self.burst, self.per_minute / 60)
+            if wait <= 0:
+                return
+            if time.monotonic() + wait > deadline:
+                raise RateLimitError(f"Rate limit of {self.per_minute:g}/min exceeded for {self.name}")
+            await asyncio.sleep(wait)
+
+
 class BaseDataProvider(ABC):
     """
     Abstract base class for all data providers
@@ -53,6 +231,14 @@ class BaseDataProvider(ABC):
         self.last_error: Optional[str] = None
         self.request_count = 0
         self.rate_limit_remaining: Optional[int] = None
+        self.last_request_time: Optional[datetime] = None
+        
+        # Client-side rate limiting, set by providers with published limits
+        self.rate_limiter: Optional[RateLimiter] = None
+        
+        # HTTP session on the shared connection pool
+        self.http_client: HttpClientFactory = shared_http_client
+        self.session: Optional[aiohttp.ClientSession] = None
         
     # Connection Management
     
@@ -78,6 +264,23 @@ class BaseDataProvider(ABC):
         """Get real-time quote for symbol"""
         pass
     
+    async def get_quotes(self, symbols: List[str]) -> Dict[str, DataResponse]:
+        """
+        Get quotes for many symbols
+        
+        Default implementation issues one get_quote() per symbol, at most
+        max_concurrent_requests at a time; providers with batch endpoints
+        override this.
+        """
+        semaphore = asyncio.Semaphore(self.config.get('max_concurrent_requests', 10))
+        
+        async def fetch(symbol: str) -> DataResponse:
+            async with semaphore:
+                return await self.get_quote(symbol)
+        
+        responses = await asyncio.gather(*[fetch(symbol) for symbol in symbols])
+        return dict(zip(symbols, responses))
+    
     @abstractmethod
     async def get_options_chain(
         self, 
@@ -99,6 +302,19 @@ class BaseDataProvider(ABC):
         """Get historical price data"""
         pass
     
+    async def get_bar_series(
+        self,
+        symbol: str,
+        start_date: date,
+        end_date: date,
+        interval: str = "1d"
+    ) -> DataResponse:
+        """Get historical price data as a BarSeries - default implementation converts get_historical_data bars"""
+        response = await self.get_historical_data(symbol, start_date, end_date, interval)
+        if response.success:
+            response.data = BarSeries.from_bars(symbol, response.data or [], interval)
+        return response
+    
     # Account Data Methods (for brokers)
     
     async def get_account_info(self, account_id: str) -> DataResponse:
@@ -180,10 +396,51 @@ class BaseDataProvider(ABC):
         # Override in broker implementations
         return False
     
+    def set_rate_limit_backend(self, backend: RateLimitBackend):
+        """Share rate limits across processes by swapping the limiter's token bucket store"""
+        if self.rate_limiter:
+            self.rate_limiter.backend = backend
+    
+    def set_http_client(self, http_client: HttpClientFactory):
+        """Use http_client's connection pool for sessions opened from now on"""
+        self.http_client = http_client
+    
+    def _session_headers(self) -> Dict[str, str]:
+        """Default headers for this provider's HTTP session"""
+        return {"User-Agent": "Derivagent/1.0"}
+    
+    def _ensure_session(self) -> aiohttp.ClientSession:
+        """Get this provider's HTTP session, opening it on the shared pool if needed"""
+        if self.session is None or self.session.closed:
+            self.session = self.http_client.session(self.provider_name, headers=self._session_headers())
+        return self.session
+    
+    async def _close_session(self):
+        """Close this provider's HTTP session (the shared pool stays open)"""
+        if self.session is not None:
+            await self.http_client.close_session(self.provider_name)
+            self.session = None
+    
+    async def _check_rate_limit(self):
+        """Wait for the rate limiter before making an API request"""
+        if not self.rate_limiter:
+            return
+        
+        call = current_provider_call.get()
+        if call is None:
+            await self.rate_limiter.acquire()
+            return
+        
+        with call.limiter_wait():
+            try:
+                await self.rate_limiter.acquire()
+            except RateLimitError:
+                # Refused locally, the provider itself hasn't failed
+                call.throttled = True
+                raise
+    
     async def _handle_rate_limit(self, retry_after: Optional[int] = None):
         """Handle rate limiting"""
-        import asyncio
-        
         if retry_after:
             self.logger.warning(f"Rate limited, waiting {retry_after} seconds")
             await asyncio.sleep(retry_after)
@@ -194,6 +451,7 @@ class BaseDataProvider(ABC):
     def _track_request(self):
         """Track API request for monitoring"""
         self.request_count += 1
+        self.last_request_time = datetime.now()
     
     def _log_error(self, error: str, exception: Optional[Exception] = None):
         """Log error and update last_error"""
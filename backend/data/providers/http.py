@@ -0,0 +1,151 @@
+"""
+Shared HTTP Client for Data Providers
+One tuned aiohttp connection pool used by every provider session
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, Optional
+
+import aiohttp
+
+
+class HttpClientFactory:
+    """
+    Hands out provider sessions backed by a single shared connector
+
+    Features:
+    - Keep-alive pool with total and per-host connection limits
+    - DNS cache so repeated requests skip resolution
+    - Request/connect timeouts from the performance config
+    - At most one open session per provider, so reconnects never leak sessions
+    - Connection statistics (open connections, reuse ratio)
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        self.logger = logging.getLogger("data.http")
+        self.configure(config or {})
+
+        self._connector: Optional[aiohttp.TCPConnector] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._sessions: Dict[str, aiohttp.ClientSession] = {}
+
+        self._trace_config = aiohttp.TraceConfig()
+        self._trace_config.on_request_start.append(self._on_request_start)
+        self._trace_config.on_connection_create_end.append(self._on_connection_created)
+        self._trace_config.on_connection_reuseconn.append(self._on_connection_reused)
+
+        self.stats = {
+            'requests': 0,
+            'connections_created': 0,
+            'connections_reused': 0,
+            'sessions_opened': 0
+        }
+
+    def configure(self, config: Dict[str, Any]):
+        """
+        Apply performance config (takes effect for connectors/sessions created afterwards)
+
+        Keys: request_timeout_seconds, connection_timeout_seconds, http_pool_size,
+        http_pool_size_per_host, http_keepalive_seconds, dns_cache_ttl_seconds
+        """
+        self.request_timeout_seconds = config.get('request_timeout_seconds', 10)
+        self.connection_timeout_seconds = config.get('connection_timeout_seconds', 30)
+        self.pool_size = config.get('http_pool_size', 100)
+        self.pool_size_per_host = config.get('http_pool_size_per_host', 20)
+        self.keepalive_seconds = config.get('http_keepalive_seconds', 30)
+        self.dns_cache_ttl_seconds = config.get('dns_cache_ttl_seconds', 300)
+
+    def _get_connector(self) -> aiohttp.TCPConnector:
+        loop = asyncio.get_running_loop()
+        if self._connector is None or self._connector.closed or self._loop is not loop:
+            self._connector = aiohttp.TCPConnector(
+                limit=self.pool_size,
+                limit_per_host=self.pool_size_per_host,
+                keepalive_timeout=self.keepalive_seconds,
+                use_dns_cache=True,
+                ttl_dns_cache=self.dns_cache_ttl_seconds,
+                enable_cleanup_closed=True
+            )
+            self._loop = loop
+        return self._connector
+
+    def session(
+        self,
+        owner: str,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[aiohttp.ClientTimeout] = None
+    ) -> aiohttp.ClientSession:
+        """
+        Get owner's session on the shared pool, creating it if needed
+
+        Must be called from within the event loop. An already open session
+        for owner is returned as is.
+        """
+        connector = self._get_connector()
+        session = self._sessions.get(owner)
+        if session is not None and not session.closed and session.connector is connector:
+            return session
+
+        session = aiohttp.ClientSession(
+            connector=connector,
+            connector_owner=False,
+            headers=headers,
+            timeout=timeout or aiohttp.ClientTimeout(
+                total=self.request_timeout_seconds,
+                sock_connect=self.connection_timeout_seconds
+            ),
+            trace_configs=[self._trace_config]
+        )
+        self._sessions[owner] = session
+        self.stats['sessions_opened'] += 1
+        return session
+
+    async def close_session(self, owner: str):
+        """Close owner's session (the shared connector stays open)"""
+        session = self._sessions.pop(owner, None)
+        if session is not None and not session.closed:
+            await session.close()
+
+    async def close(self):
+        """Close all sessions and the shared connector"""
+        for owner in list(self._sessions):
+            await self.close_session(owner)
+
+        if self._connector is not None and not self._connector.closed:
+            await self._connector.close()
+        self._connector = None
+        self._loop = None
+
+    async def _on_request_start(self, session, context, params):
+        self.stats['requests'] += 1
+
+    async def _on_connection_created(self, session, context, params):
+        self.stats['connections_created'] += 1
+
+    async def _on_connection_reused(self, session, context, params):
+        self.stats['connections_reused'] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool usage and connection reuse statistics"""
+        connector = self._connector
+        in_use = idle = 0
+        if connector is not None and not connector.closed:
+            in_use = len(getattr(connector, '_acquired', ()))
+            idle = sum(len(conns) for conns in getattr(connector, '_conns', {}).values())
+
+        connections = self.stats['connections_created'] + self.stats['connections_reused']
+        return {
+            **self.stats,
+            'open_sessions': sum(1 for session in self._sessions.values() if not session.closed),
+            'open_connections': in_use + idle,
+            'connections_in_use': in_use,
+            'connections_idle': idle,
+            'reuse_ratio': round(self.stats['connections_reused'] / connections, 3) if connections else 0.0,
+            'pool_size': self.pool_size,
+            'pool_size_per_host': self.pool_size_per_host
+        }
+
+
+# Default pool for providers used outside a DataManager
+shared_http_client = HttpClientFactory()
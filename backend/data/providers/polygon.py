@@ -3,17 +3,15 @@ Polygon.io Market Data Provider
 Implements real-time and historical market data via Polygon.io API
 """
 
-import aiohttp
 import asyncio
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, AsyncIterator, Tuple
 from datetime import datetime, date, timedelta
-from decimal import Decimal
 import json
 
-from .base import MarketDataProvider, DataProviderError, RateLimitError
+from .base import MarketDataProvider, DataProviderError, AuthenticationError, RateLimitError, RateLimiter
 from ..models import (
-    Quote, OptionsChain, OptionContract, HistoricalBar, Greeks,
-    DataResponse, OptionType, MarketDataType
+    Quote, OptionsChain, OptionContract, HistoricalBar, BarSeries, Greeks,
+    DataResponse, OptionType, MarketDataType, MARKET_TIMEZONE, Price, to_price
 )
 
 
@@ -36,22 +34,39 @@ class PolygonProvider(MarketDataProvider):
             raise ValueError("Polygon API key is required")
         
         self.base_url = "https://api.polygon.io"
-        self.session: Optional[aiohttp.ClientSession] = None
         
         # Rate limiting
         self.rate_limit = config.get('rate_limit', 5)  # requests per minute
-        self.last_request_time = datetime.now()
+        self.rate_limiter = RateLimiter(
+            self.provider_name,
+            per_minute=self.rate_limit,
+            burst=config.get('rate_limit_burst', 1)
+        )
+        
+        # Batch quotes via the snapshot endpoint (requires a paid plan)
+        self.snapshot_batch_size = config.get('snapshot_batch_size', 250)
+        self.snapshot_available = True
+        
+        # Safety cap on paginated chain requests, per walker
+        self.options_chain_max_pages = config.get('options_chain_max_pages', 50)
+        
+        # Safety cap on paginated aggregate (bar) requests
+        self.aggregates_max_pages = config.get('aggregates_max_pages', 20)
         
+        # Bulk quotes/greeks via the options chain snapshot (requires an options plan)
+        self.options_snapshot_max_pages = config.get('options_snapshot_max_pages', 200)
+        self.options_snapshot_available = True
+        
+    def _session_headers(self) -> Dict[str, str]:
+        return {
+            "Authorization": f"Bearer {self.api_key}",
+            "User-Agent": "Derivagent/1.0"
+        }
+    
     async def connect(self) -> bool:
         """Establish connection to Polygon API"""
         try:
-            self.session = aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=30),
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "User-Agent": "Derivagent/1.0"
-                }
-            )
+            self._ensure_session()
             
             # Test connection
             success = await self.test_connection()
@@ -71,9 +86,7 @@ class PolygonProvider(MarketDataProvider):
     async def disconnect(self) -> bool:
         """Disconnect from Polygon API"""
         try:
-            if self.session:
-                await self.session.close()
-                self.session = None
+            await self._close_session()
             
             self.is_connected = False
             self.logger.info("✅ Disconnected from Polygon.io")
@@ -115,8 +128,7 @@ class PolygonProvider(MarketDataProvider):
         try:
             await self._check_rate_limit()
             
-            if not self.session:
-                await self.connect()
+            self._ensure_session()
             
             # Use previous day's daily aggregate (free tier compatible)
             from datetime import date, timedelta
@@ -145,7 +157,7 @@ class PolygonProvider(MarketDataProvider):
                     raise DataProviderError(f"No data available for {symbol}")
                 
                 bar = results[0]  # Get the daily bar
-                close_price = Decimal(str(bar.get('c', 0))) if bar.get('c') else None
+                close_price = to_price(bar.get('c', 0)) if bar.get('c') else None
                 
                 quote = Quote(
                     symbol=symbol,
@@ -153,9 +165,9 @@ class PolygonProvider(MarketDataProvider):
                     ask=None,  # Not available in daily aggregates
                     last=close_price,
                     mark=close_price,  # Use close as mark price
-                    open_price=Decimal(str(bar.get('o', 0))) if bar.get('o') else None,
-                    high=Decimal(str(bar.get('h', 0))) if bar.get('h') else None,
-                    low=Decimal(str(bar.get('l', 0))) if bar.get('l') else None,
+                    open_price=to_price(bar.get('o', 0)) if bar.get('o') else None,
+                    high=to_price(bar.get('h', 0)) if bar.get('h') else None,
+                    low=to_price(bar.get('l', 0)) if bar.get('l') else None,
                     close_price=close_price,
                     volume=bar.get('v'),
                     timestamp=datetime.now(),
@@ -179,6 +191,130 @@ class PolygonProvider(MarketDataProvider):
                 timestamp=datetime.now()
             )
     
+    async def get_quotes(self, symbols: List[str]) -> Dict[str, DataResponse]:
+        """
+        Get quotes for many symbols via the all-tickers snapshot endpoint
+        
+        Falls back to per-symbol daily aggregates when the API key has no
+        snapshot access (free tier).
+        """
+        if not self.snapshot_available:
+            return await super().get_quotes(symbols)
+        
+        chunks = [
+            symbols[i:i + self.snapshot_batch_size]
+            for i in range(0, len(symbols), self.snapshot_batch_size)
+        ]
+        
+        results = {}
+        for chunk in chunks:
+            batch = await self._get_snapshot_batch(chunk)
+            if batch is None:
+                # No snapshot entitlement, serve this and remaining chunks per symbol
+                remaining = [symbol for symbol in symbols if symbol not in results]
+                results.update(await super().get_quotes(remaining))
+                break
+            results.update(batch)
+        
+        return results
+    
+    async def _get_snapshot_batch(self, symbols: List[str]) -> Optional[Dict[str, DataResponse]]:
+        """Get snapshot quotes for one batch of tickers (None if snapshots are not permitted)"""
+        try:
+            await self._check_rate_limit()
+            
+            self._ensure_session()
+            
+            url = f"{self.base_url}/v2/snapshot/locale/us/markets/stocks/tickers"
+            params = {'tickers': ','.join(symbols), 'apikey': self.api_key}
+            
+            async with self.session.get(url, params=params) as response:
+                self._track_request()
+                
+                if response.status in (401, 403):
+                    self.logger.warning("⚠️ Snapshot endpoint not permitted for this API key, using per-symbol quotes")
+                    self.snapshot_available = False
+                    return None
+                
+                if response.status == 429:
+                    raise RateLimitError("Rate limit exceeded")
+                
+                if response.status != 200:
+                    error_text = await response.text()
+                    raise DataProviderError(f"API error {response.status}: {error_text}")
+                
+                data = await response.json()
+            
+            if data.get('status') not in ('OK', None):
+                raise DataProviderError(f"API returned error: {data.get('error', 'Unknown error')}")
+            
+            snapshots = {ticker.get('ticker'): ticker for ticker in data.get('tickers') or []}
+            now = datetime.now()
+            
+            results = {}
+            for symbol in symbols:
+                if symbol in snapshots:
+                    results[symbol] = DataResponse(
+                        success=True,
+                        data=self._parse_snapshot_quote(snapshots[symbol], symbol),
+                        source="polygon",
+                        timestamp=now
+                    )
+                else:
+                    results[symbol] = DataResponse(
+                        success=False,
+                        error=f"No data available for {symbol}",
+                        timestamp=now
+                    )
+            return results
+            
+        except Exception as e:
+            self._log_error(f"Failed to get snapshot for {len(symbols)} symbols", e)
+            return {
+                symbol: DataResponse(
+                    success=False,
+                    error=str(e),
+                    timestamp=datetime.now()
+                )
+                for symbol in symbols
+            }
+    
+    def _parse_snapshot_quote(self, data: Dict[str, Any], symbol: str) -> Quote:
+        """Parse a ticker snapshot into a Quote"""
+        def price(value) -> Optional[Price]:
+            return to_price(value) if value else None
+        
+        last_quote = data.get('lastQuote') or {}
+        last_trade = data.get('lastTrade') or {}
+        # Day bar is empty before the open, fall back to the previous session
+        day = data.get('day') or {}
+        if not day.get('c'):
+            day = data.get('prevDay') or {}
+        
+        bid = price(last_quote.get('p'))
+        ask = price(last_quote.get('P'))
+        last = price(last_trade.get('p')) or price(day.get('c'))
+        
+        return Quote.trusted(
+            symbol=symbol,
+            bid=bid,
+            ask=ask,
+            last=last,
+            mark=(bid + ask) / 2 if bid and ask else last,
+            bid_size=int(last_quote['s']) if last_quote.get('s') is not None else None,
+            ask_size=int(last_quote['S']) if last_quote.get('S') is not None else None,
+            volume=int(day['v']) if day.get('v') else None,
+            open_price=price(day.get('o')),
+            high=price(day.get('h')),
+            low=price(day.get('l')),
+            close_price=price(day.get('c')),
+            change=price(data.get('todaysChange')),
+            change_percent=price(data.get('todaysChangePerc')),
+            timestamp=datetime.now(),
+            market_hours=bool(last_quote),
+            source="polygon"
+        )
+    
     async def _enrich_quote(self, quote: Quote, symbol: str):
         """Enrich quote with additional data"""
         try:
@@ -190,7 +326,7 @@ class PolygonProvider(MarketDataProvider):
                     data = await response.json()
                     if data.get('status') == 'OK':
                         results = data.get('results', {})
-                        quote.last = Decimal(str(results.get('p', 0))) if results.get('p') else None
+                        quote.last = to_price(results.get('p', 0)) if results.get('p') else None
             
             # Get daily bar for OHLC and volume
             today = date.today()
@@ -201,10 +337,10 @@ class PolygonProvider(MarketDataProvider):
                     data = await response.json()
                     if data.get('status') == 'OK' and data.get('results'):
                         bar = data['results'][0]
-                        quote.open_price = Decimal(str(bar.get('o', 0))) if bar.get('o') else None
-                        quote.high = Decimal(str(bar.get('h', 0))) if bar.get('h') else None
-                        quote.low = Decimal(str(bar.get('l', 0))) if bar.get('l') else None
-                        quote.close_price = Decimal(str(bar.get('c', 0))) if bar.get('c') else None
+                        quote.open_price = to_price(bar.get('o', 0)) if bar.get('o') else None
+                        quote.high = to_price(bar.get('h', 0)) if bar.get('h') else None
+                        quote.low = to_price(bar.get('l', 0)) if bar.get('l') else None
+                        quote.close_price = to_price(bar.get('c', 0)) if bar.get('c') else None
                         quote.volume = bar.get('v')
                         
                         # Calculate change
@@ -223,80 +359,51 @@ class PolygonProvider(MarketDataProvider):
         expiration: Optional[date] = None,
         strike_range: Optional[tuple[float, float]] = None
     ) -> DataResponse:
-        """Get options chain from Polygon"""
+        """
+        Get options chain from Polygon
+        
+        Contracts, quotes and greeks come from the options chain snapshot in
+        one paged walk. Without snapshot access the contracts endpoint is
+        walked instead, with per-contract quotes only for small chains.
+        """
         try:
-            await self._check_rate_limit()
+            chain = OptionsChain(
+                underlying_symbol=underlying,
+                timestamp=datetime.now(),
+                source="polygon"
+            )
             
-            if not self.session:
-                await self.connect()
-            
-            # Build request parameters
-            params = {
-                'underlying': underlying,
-                'order': 'asc',
-                'limit': 1000,
-                'sort': 'strike_price'
-            }
+            contracts = None
+            truncated = set()
+            if self.options_snapshot_available:
+                contracts = await self._get_snapshot_contracts(chain, expiration, strike_range, truncated)
             
-            if expiration:
-                params['expiration_date'] = expiration.isoformat()
+            if contracts is None:
+                truncated.clear()
+                contracts = [
+                    contract async for contract in
+                    self.iter_option_contracts(underlying, expiration, strike_range, truncated)
+                ]
+                if len(contracts) <= 50:
+                    await self._enrich_options_with_quotes(contracts)
             
-            if strike_range:
-                params['strike_price.gte'] = strike_range[0]
-                params['strike_price.lte'] = strike_range[1]
+            # Calls and puts are walked concurrently, restore strike order
+            for contract in contracts:
+                chain.expirations.setdefault(contract.expiration_date.isoformat(), []).append(contract)
+            for exp_contracts in chain.expirations.values():
+                exp_contracts.sort(key=lambda contract: contract.strike_price)
+            chain.total_contracts = len(contracts)
             
-            url = f"{self.base_url}/v3/reference/options/contracts"
+            # Strike/delta/symbol lookups for strategy construction
+            chain.build_index()
             
-            async with self.session.get(url, params=params) as response:
-                self._track_request()
-                
-                if response.status == 429:
-                    raise RateLimitError("Rate limit exceeded")
-                
-                if response.status != 200:
-                    error_text = await response.text()
-                    raise DataProviderError(f"API error {response.status}: {error_text}")
-                
-                data = await response.json()
-                
-                if data.get('status') != 'OK':
-                    raise DataProviderError(f"API returned error: {data.get('error', 'Unknown error')}")
-                
-                contracts = []
-                results = data.get('results', [])
-                
-                for contract_data in results:
-                    try:
-                        contract = self._parse_option_contract(contract_data, underlying)
-                        contracts.append(contract)
-                    except Exception as e:
-                        self.logger.warning(f"Failed to parse contract: {e}")
-                        continue
-                
-                # Get quotes for contracts (limited to avoid rate limits)
-                if len(contracts) <= 50:  # Only for small chains
-                    await self._enrich_options_with_quotes(contracts)
-                
-                # Organize by expiration
-                chain = OptionsChain(
-                    underlying_symbol=underlying,
-                    timestamp=datetime.now(),
-                    source="polygon",
-                    total_contracts=len(contracts)
-                )
-                
-                for contract in contracts:
-                    exp_str = contract.expiration_date.isoformat()
-                    if exp_str not in chain.expirations:
-                        chain.expirations[exp_str] = []
-                    chain.expirations[exp_str].append(contract)
-                
-                return DataResponse(
-                    success=True,
-                    data=chain,
-                    source="polygon",
-                    timestamp=datetime.now()
-                )
+            return DataResponse(
+                success=True,
+                data=chain,
+                source="polygon",
+                timestamp=datetime.now(),
+                truncated=bool(truncated)
+            )
                 
         except Exception as e:
             self._log_error(f"Failed to get options chain for {underlying}", e)
@@ -306,25 +413,166 @@ class PolygonProvider(MarketDataProvider):
                 timestamp=datetime.now()
             )
     
+    async def iter_option_contracts(
+        self,
+        underlying: str,
+        expiration: Optional[date] = None,
+        strike_range: Optional[tuple[float, float]] = None,
+        truncated: Optional[set] = None
+    ) -> AsyncIterator[OptionContract]:
+        """
+        Stream option contracts for underlying, following next_url pagination
+        
+        Polygon cursors can only be walked one page after another, so calls
+        and puts are split into two independent queries walked concurrently
+        (each page still waits for the rate limiter). Contracts are yielded
+        page by page as they arrive, in no particular order across walkers.
+        Contract types cut short by options_chain_max_pages are added to
+        truncated when given.
+        """
+        self._ensure_session()
+        
+        params = {
+            'underlying_ticker': underlying,
+            'order': 'asc',
+            'limit': 1000,
+            'sort': 'strike_price'
+        }
+        
+        if expiration:
+            params['expiration_date'] = expiration.isoformat()
+        
+        if strike_range:
+            params['strike_price.gte'] = strike_range[0]
+            params['strike_price.lte'] = strike_range[1]
+        
+        url = f"{self.base_url}/v3/reference/options/contracts"
+        queries = [{**params, 'contract_type': contract_type} for contract_type in ('call', 'put')]
+        
+        async for results in self._iter_pages(url, queries, underlying, self.options_chain_max_pages, truncated):
+            for contract_data in results:
+                try:
+                    contract = self._parse_option_contract(contract_data, underlying)
+                except Exception as e:
+                    self.logger.warning(f"Failed to parse contract: {e}")
+                    continue
+                yield contract
+    
+    async def _iter_pages(
+        self,
+        url: str,
+        queries: List[Dict[str, Any]],
+        label: str,
+        max_pages: int,
+        truncated: Optional[set] = None
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Walk independent queries on a paginated endpoint concurrently
+        
+        Yields each page's results as it arrives. Walkers are cancelled
+        when the caller stops early or any walker fails. Queries stopped
+        at max_pages are added to truncated (by contract type) when given.
+        """
+        pages: asyncio.Queue = asyncio.Queue()
+        walkers = [
+            asyncio.create_task(self._walk_pages(url, query, label, max_pages, pages, truncated))
+            for query in queries
+        ]
+        
+        try:
+            remaining = len(walkers)
+            while remaining:
+                page = await pages.get()
+                if page is None:
+                    remaining -= 1
+                elif isinstance(page, Exception):
+                    raise page
+                else:
+                    yield page
+        finally:
+            for walker in walkers:
+                walker.cancel()
+            await asyncio.gather(*walkers, return_exceptions=True)
+    
+    async def _walk_pages(
+        self,
+        url: str,
+        params: Dict[str, Any],
+        label: str,
+        max_pages: int,
+        pages: asyncio.Queue,
+        truncated: Optional[set] = None
+    ):
+        """Follow one query through its pages, queueing each page's results (None when done)"""
+        contract_type = params.get('contract_type', 'all')
+        try:
+            page_count = 0
+            while url:
+                if page_count >= max_pages:
+                    self.logger.warning(f"⚠️ {label} {contract_type} results truncated after {page_count} pages")
+                    if truncated is not None:
+                        truncated.add(contract_type)
+                    break
+                
+                data = await self._get_page(url, params)
+                page_count += 1
+                await pages.put(data.get('results') or [])
+                
+                # next_url already carries the cursor and query
+                url = data.get('next_url')
+                params = None
+        except Exception as e:
+            await pages.put(e)
+        finally:
+            await pages.put(None)
+    
+    async def _get_page(self, url: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Fetch one page of a paginated endpoint"""
+        await self._check_rate_limit()
+        
+        # next_url carries the cursor but not the api key
+        params = {**(params or {}), 'apikey': self.api_key}
+        
+        async with self._ensure_session().get(url, params=params) as response:
+            self._track_request()
+            
+            if response.status in (401, 403):
+                error_text = await response.text()
+                raise AuthenticationError(f"API error {response.status}: {error_text}")
+            
+            if response.status == 429:
+                raise RateLimitError("Rate limit exceeded")
+            
+            if response.status != 200:
+                error_text = await response.text()
+                raise DataProviderError(f"API error {response.status}: {error_text}")
+            
+            data = await response.json()
+            
+            if data.get('status') != 'OK':
+                raise DataProviderError(f"API returned error: {data.get('error', 'Unknown error')}")
+            
+            return data
+    
     def _parse_option_contract(self, data: Dict[str, Any], underlying: str) -> OptionContract:
         """Parse Polygon option contract data"""
         
         # Extract contract details
         ticker = data.get('ticker', '')
-        strike = Decimal(str(data.get('strike_price', 0)))
+        strike = to_price(data.get('strike_price', 0))
         expiration_str = data.get('expiration_date', '')
         contract_type = data.get('contract_type', '').lower()
         
         # Parse expiration date
         try:
-            exp_date = datetime.strptime(expiration_str, '%Y-%m-%d').date()
+            exp_date = date.fromisoformat(expiration_str)
         except:
             exp_date = date.today() + timedelta(days=30)  # Default fallback
         
         # Calculate days to expiration
         days_to_exp = (exp_date - date.today()).days
         
-        return OptionContract(
+        return OptionContract.trusted(
             symbol=ticker,
             underlying_symbol=underlying,
             option_type=OptionType.CALL if contract_type == 'call' else OptionType.PUT,
@@ -335,6 +583,99 @@ class PolygonProvider(MarketDataProvider):
             source="polygon"
         )
     
+    async def _get_snapshot_contracts(
+        self,
+        chain: OptionsChain,
+        expiration: Optional[date] = None,
+        strike_range: Optional[tuple[float, float]] = None,
+        truncated: Optional[set] = None
+    ) -> Optional[List[OptionContract]]:
+        """
+        Build priced contracts for chain from the options chain snapshot
+        
+        Each snapshot carries the contract details alongside its quote and
+        greeks, up to 250 per page, so the contracts endpoint is not needed.
+        Returns None when the snapshot could not be used (no entitlement or
+        request failure) so the caller can fall back to the contracts endpoint.
+        """
+        params = {'limit': 250}
+        
+        if expiration:
+            params['expiration_date'] = expiration.isoformat()
+        
+        if strike_range:
+            params['strike_price.gte'] = strike_range[0]
+            params['strike_price.lte'] = strike_range[1]
+        
+        underlying = chain.underlying_symbol
+        url = f"{self.base_url}/v3/snapshot/options/{underlying}"
+        queries = [{**params, 'contract_type': contract_type} for contract_type in ('call', 'put')]
+        contracts = []
+        
+        try:
+            async for results in self._iter_pages(url, queries, underlying, self.options_snapshot_max_pages, truncated):
+                for snapshot in results:
+                    details = snapshot.get('details')
+                    if not details:
+                        continue
+                    try:
+                        contract = self._parse_option_contract(details, underlying)
+                    except Exception as e:
+                        self.logger.warning(f"Failed to parse contract: {e}")
+                        continue
+                    self._apply_option_snapshot(contract, snapshot)
+                    contracts.append(contract)
+                    
+                    underlying_price = (snapshot.get('underlying_asset') or {}).get('price')
+                    if underlying_price and chain.underlying_price is None:
+                        chain.underlying_price = to_price(underlying_price)
+            return contracts
+            
+        except AuthenticationError:
+            self.logger.warning("⚠️ Options snapshot not permitted for this API key, using the contracts endpoint")
+            self.options_snapshot_available = False
+            return None
+        except Exception as e:
+            self.logger.warning(f"Failed to load {underlying} chain from snapshot: {e}")
+            return None
+    
+    def _apply_option_snapshot(self, contract: OptionContract, data: Dict[str, Any]):
+        """Copy quote, volume, open interest and greeks from an option snapshot"""
+        def price(value) -> Optional[Price]:
+            return to_price(value) if value else None
+        
+        def value(raw) -> Optional[Price]:
+            return to_price(raw) if raw is not None else None
+        
+        last_quote = data.get('last_quote') or {}
+        last_trade = data.get('last_trade') or {}
+        day = data.get('day') or {}
+        greeks = data.get('greeks') or {}
+        
+        bid = price(last_quote.get('bid'))
+        ask = price(last_quote.get('ask'))
+        last = price(last_trade.get('price')) or price(day.get('close'))
+        
+        # Values are typed here, so skip per-field assignment validation
+        contract.trusted_update(
+            bid=bid,
+            ask=ask,
+            last=last,
+            mark=price(last_quote.get('midpoint')) or ((bid + ask) / 2 if bid and ask else last),
+            volume=int(day['volume']) if day.get('volume') is not None else None,
+            open_interest=int(data['open_interest']) if data.get('open_interest') is not None else None
+        )
+        
+        implied_volatility = data.get('implied_volatility')
+        if greeks or implied_volatility is not None:
+            contract.trusted_update(greeks=Greeks.trusted(
+                delta=value(greeks.get('delta')),
+                gamma=value(greeks.get('gamma')),
+                theta=value(greeks.get('theta')),
+                vega=value(greeks.get('vega')),
+                implied_volatility=value(implied_volatility)
+            ))
+    
     async def _enrich_options_with_quotes(self, contracts: List[OptionContract]):
         """Add quote data to option contracts"""
         # Batch request quotes for efficiency
@@ -356,8 +697,8 @@ class PolygonProvider(MarketDataProvider):
                     data = await response.json()
                     if data.get('status') == 'OK':
                         results = data.get('results', {})
-                        contract.bid = Decimal(str(results.get('bid', 0))) if results.get('bid') else None
-                        contract.ask = Decimal(str(results.get('ask', 0))) if results.get('ask') else None
+                        contract.bid = to_price(results.get('bid', 0)) if results.get('bid') else None
+                        contract.ask = to_price(results.get('ask', 0)) if results.get('ask') else None
                         
         except Exception as e:
             self.logger.debug(f"Failed to get quote for {contract.symbol}: {e}")
@@ -371,59 +712,43 @@ class PolygonProvider(MarketDataProvider):
     ) -> DataResponse:
         """Get historical price data from Polygon"""
         try:
-            await self._check_rate_limit()
+            results, truncated = await self._get_aggregates(symbol, start_date, end_date, interval)
+            bars = [self._parse_bar(symbol, bar_data) for bar_data in results]
             
-            if not self.session:
-                await self.connect()
-            
-            # Map interval to Polygon format
-            multiplier, timespan = self._parse_interval(interval)
-            
-            # Build URL
-            url = f"{self.base_url}/v2/aggs/ticker/{symbol}/range/{multiplier}/{timespan}/{start_date}/{end_date}"
-            
-            params = {
-                'adjusted': 'true',
-                'sort': 'asc',
-                'limit': 5000
-            }
-            
-            async with self.session.get(url, params=params) as response:
-                self._track_request()
-                
-                if response.status == 429:
-                    raise RateLimitError("Rate limit exceeded")
-                
-                if response.status != 200:
-                    error_text = await response.text()
-                    raise DataProviderError(f"API error {response.status}: {error_text}")
-                
-                data = await response.json()
-                
-                if data.get('status') != 'OK':
-                    raise DataProviderError(f"API returned error: {data.get('error', 'Unknown error')}")
-                
-                bars = []
-                results = data.get('results', [])
-                
-                for bar_data in results:
-                    bar = HistoricalBar(
-                        symbol=symbol,
-                        timestamp=datetime.fromtimestamp(bar_data['t'] / 1000),
-                        open_price=Decimal(str(bar_data['o'])),
-                        high=Decimal(str(bar_data['h'])),
-                        low=Decimal(str(bar_data['l'])),
-                        close_price=Decimal(str(bar_data['c'])),
-                        volume=bar_data['v']
-                    )
-                    bars.append(bar)
+            return DataResponse(
+                success=True,
+                data=bars,
+                source="polygon",
+                timestamp=datetime.now(),
+                truncated=truncated
+            )
                 
-                return DataResponse(
-                    success=True,
-                    data=bars,
-                    source="polygon",
-                    timestamp=datetime.now()
-                )
+        except Exception as e:
+            self._log_error(f"Failed to get historical data for {symbol}", e)
+            return DataResponse(
+                success=False,
+                error=str(e),
+                timestamp=datetime.now()
+            )
+    
+    async def get_bar_series(
+        self,
+        symbol: str,
+        start_date: date,
+        end_date: date,
+        interval: str = "1d"
+    ) -> DataResponse:
+        """Get historical price data from Polygon as a BarSeries, built straight from the aggregates"""
+        try:
+            results, truncated = await self._get_aggregates(symbol, start_date, end_date, interval)
+            
+            return DataResponse(
+                success=True,
+                data=self._parse_bar_series(symbol, results, interval),
+                source="polygon",
+                timestamp=datetime.now(),
+                truncated=truncated
+            )
                 
         except Exception as e:
             self._log_error(f"Failed to get historical data for {symbol}", e)
@@ -433,6 +758,67 @@ class PolygonProvider(MarketDataProvider):
                 timestamp=datetime.now()
             )
     
+    async def _get_aggregates(
+        self,
+        symbol: str,
+        start_date: date,
+        end_date: date,
+        interval: str
+    ) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Fetch raw aggregate bar results (ascending) from /v2/aggs, following next_url
+        
+        Returns the results and whether they were cut short by aggregates_max_pages.
+        """
+        # Map interval to Polygon format
+        multiplier, timespan = self._parse_interval(interval)
+        
+        # Build URL
+        url = f"{self.base_url}/v2/aggs/ticker/{symbol}/range/{multiplier}/{timespan}/{start_date}/{end_date}"
+        
+        params = {
+            'adjusted': 'true',
+            'sort': 'asc',
+            'limit': 50000
+        }
+        
+        results = []
+        for _ in range(self.aggregates_max_pages):
+            data = await self._get_page(url, params)
+            results.extend(data.get('results') or [])
+            
+            # next_url already carries the cursor and query
+            url = data.get('next_url')
+            params = None
+            if not url:
+                return results, False
+        
+        self.logger.warning(f"⚠️ {symbol} aggregates truncated after {self.aggregates_max_pages} pages")
+        return results, True
+    
+    def _parse_bar(self, symbol: str, data: Dict[str, Any]) -> HistoricalBar:
+        """Parse one aggregate bar (fields are typed here, so validation is skipped)"""
+        return HistoricalBar.trusted(
+            symbol=symbol,
+            timestamp=datetime.fromtimestamp(data['t'] / 1000, MARKET_TIMEZONE),
+            open_price=to_price(data['o']),
+            high=to_price(data['h']),
+            low=to_price(data['l']),
+            close_price=to_price(data['c']),
+            volume=int(data['v'])
+        )
+    
+    def _parse_bar_series(self, symbol: str, results: List[Dict[str, Any]], interval: str) -> BarSeries:
+        """Build a BarSeries from aggregate results without per-bar models"""
+        return BarSeries(symbol, {
+            'timestamp': [bar['t'] for bar in results],
+            'open': [bar['o'] for bar in results],
+            'high': [bar['h'] for bar in results],
+            'low': [bar['l'] for bar in results],
+            'close': [bar['c'] for bar in results],
+            'volume': [bar['v'] for bar in results]
+        }, interval, presorted=True)
+    
     def _parse_interval(self, interval: str) -> tuple[int, str]:
         """Parse interval string to Polygon format"""
         # Default mappings
@@ -448,16 +834,3 @@ class PolygonProvider(MarketDataProvider):
         }
         
         return mappings.get(interval, (1, 'day'))
-    
-    async def _check_rate_limit(self):
-        """Check and enforce rate limiting"""
-        now = datetime.now()
-        time_diff = (now - self.last_request_time).total_seconds()
-        
-        min_interval = 60 / self.rate_limit  # seconds between requests
-        
-        if time_diff < min_interval:
-            sleep_time = min_interval - time_diff
-            await asyncio.sleep(sleep_time)
-        
-        self.last_request_time = datetime.now()
\ No newline at end of file
@@ -3,7 +3,6 @@ Charles Schwab/ThinkorSwim Broker Provider
 Implements Schwab API for market data, account data, and trading
 """
 
-import aiohttp
 import asyncio
 import base64
 from typing import Optional, Dict, Any, List
@@ -15,7 +14,7 @@ import urllib.parse
 from .base import BrokerProvider, DataProviderError, AuthenticationError, RateLimitError
 from ..models import (
     Quote, OptionsChain, OptionContract, HistoricalBar, Position, Account, Order,
-    DataResponse, OptionType, OrderType, OrderSide, OrderStatus, PositionType
+    DataResponse, OptionType, OrderType, OrderSide, OrderStatus, PositionType, to_price
 )
 
 
@@ -45,24 +44,19 @@ class SchwabProvider(BrokerProvider):
         self.auth_url = "https://api.schwabapi.com/oauth/authorize"
         self.token_url = "https://api.schwabapi.com/oauth/token"
         
-        self.session: Optional[aiohttp.ClientSession] = None
         self.access_token: Optional[str] = None
         self.refresh_token: Optional[str] = None
         self.token_expires_at: Optional[datetime] = None
         
         # Rate limiting - Schwab has generous limits
         self.rate_limit = 120  # requests per minute
+        self.quote_batch_size = config.get('quote_batch_size', 200)  # symbols per quotes request
         self.last_request_time = datetime.now()
         
     async def connect(self) -> bool:
         """Establish connection to Schwab API"""
         try:
-            self.session = aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=30),
-                headers={
-                    "User-Agent": "Derivagent/1.0"
-                }
-            )
+            self._ensure_session()
             
             # Check if we have valid credentials
             if self.access_token and await self._check_token_validity():
@@ -81,9 +75,7 @@ class SchwabProvider(BrokerProvider):
     async def disconnect(self) -> bool:
         """Disconnect from Schwab API"""
         try:
-            if self.session:
-                await self.session.close()
-                self.session = None
+            await self._close_session()
             
             self.is_connected = False
             self.access_token = None
@@ -112,7 +104,7 @@ class SchwabProvider(BrokerProvider):
                     return True
                 elif response.status == 401:
                     # Token expired, try refresh
-                    if await self.refresh_token():
+                    if await self._refresh_access_token():
                         return await self.test_connection()
                     return False
                 else:
@@ -130,13 +122,12 @@ class SchwabProvider(BrokerProvider):
             credentials: Dict containing 'refresh_token' or 'auth_code'
         """
         try:
-            if not self.session:
-                await self.connect()
+            self._ensure_session()
             
             if 'refresh_token' in credentials:
                 # Use refresh token
                 self.refresh_token = credentials['refresh_token']
-                success = await self.refresh_token()
+                success = await self._refresh_access_token()
                 if success:
                     self.is_connected = True
                 return success
@@ -200,6 +191,15 @@ class SchwabProvider(BrokerProvider):
     
     async def refresh_token(self) -> bool:
         """Refresh access token using refresh token"""
+        return await self._refresh_access_token()
+    
+    async def _refresh_access_token(self) -> bool:
+        """
+        Refresh access token using refresh token
+        
+        The refresh_token instance attribute (the token string) shadows the
+        refresh_token() method on instances, so internal callers use this name.
+        """
         try:
             if not self.refresh_token:
                 return False
@@ -256,7 +256,7 @@ class SchwabProvider(BrokerProvider):
         
         # Check if token expires within 5 minutes
         if datetime.now() + timedelta(minutes=5) >= self.token_expires_at:
-            return await self.refresh_token()
+            return await self._refresh_access_token()
         
         return True
     
@@ -272,7 +272,7 @@ class SchwabProvider(BrokerProvider):
                 self._track_request()
                 
                 if response.status == 401:
-                    if await self.refresh_token():
+                    if await self._refresh_access_token():
                         return await self.get_accounts()
                     raise AuthenticationError("Authentication failed")
                 
@@ -316,7 +316,7 @@ class SchwabProvider(BrokerProvider):
                 self._track_request()
                 
                 if response.status == 401:
-                    if await self.refresh_token():
+                    if await self._refresh_access_token():
                         return await self.get_quote(symbol)
                     raise AuthenticationError("Authentication failed")
                 
@@ -347,23 +347,87 @@ class SchwabProvider(BrokerProvider):
                 timestamp=datetime.now()
             )
     
+    async def get_quotes(self, symbols: List[str]) -> Dict[str, DataResponse]:
+        """Get real-time quotes from Schwab, many symbols per request"""
+        chunks = [
+            symbols[i:i + self.quote_batch_size]
+            for i in range(0, len(symbols), self.quote_batch_size)
+        ]
+        
+        results = {}
+        for batch in await asyncio.gather(*[self._get_quote_batch(chunk) for chunk in chunks]):
+            results.update(batch)
+        return results
+    
+    async def _get_quote_batch(self, symbols: List[str], retry_auth: bool = True) -> Dict[str, DataResponse]:
+        """Get quotes for one comma-separated batch of symbols"""
+        try:
+            await self._ensure_authenticated()
+            
+            headers = self._get_auth_headers()
+            url = f"{self.base_url}/marketdata/v1/quotes"
+            params = {'symbols': ','.join(symbols)}
+            
+            async with self._ensure_session().get(url, headers=headers, params=params) as response:
+                self._track_request()
+                
+                if response.status == 401:
+                    if retry_auth and await self._refresh_access_token():
+                        return await self._get_quote_batch(symbols, retry_auth=False)
+                    raise AuthenticationError("Authentication failed")
+                
+                if response.status != 200:
+                    error_text = await response.text()
+                    raise DataProviderError(f"API error {response.status}: {error_text}")
+                
+                data = await response.json()
+            
+            now = datetime.now()
+            results = {}
+            for symbol in symbols:
+                if symbol in data:
+                    results[symbol] = DataResponse(
+                        success=True,
+                        data=self._parse_quote(data[symbol], symbol),
+                        source="schwab",
+                        timestamp=now
+                    )
+                else:
+                    results[symbol] = DataResponse(
+                        success=False,
+                        error=f"No data for symbol {symbol}",
+                        timestamp=now
+                    )
+            return results
+            
+        except Exception as e:
+            self._log_error(f"Failed to get quotes for {len(symbols)} symbols", e)
+            return {
+                symbol: DataResponse(
+                    success=False,
+                    error=str(e),
+                    timestamp=datetime.now()
+                )
+                for symbol in symbols
+            }
+    
     def _parse_quote(self, data: Dict[str, Any], symbol: str) -> Quote:
         """Parse Schwab quote data"""
-        return Quote(
+        return Quote.trusted(
             symbol=symbol,
-            bid=Decimal(str(data.get('bidPrice', 0))) if data.get('bidPrice') else None,
-            ask=Decimal(str(data.get('askPrice', 0))) if data.get('askPrice') else None,
-            last=Decimal(str(data.get('lastPrice', 0))) if data.get('lastPrice') else None,
-            mark=Decimal(str(data.get('mark', 0))) if data.get('mark') else None,
-            bid_size=data.get('bidSize'),
-            ask_size=data.get('askSize'),
-            volume=data.get('totalVolume'),
-            open_price=Decimal(str(data.get('openPrice', 0))) if data.get('openPrice') else None,
-            high=Decimal(str(data.get('highPrice', 0))) if data.get('highPrice') else None,
-            low=Decimal(str(data.get('lowPrice', 0))) if data.get('lowPrice') else None,
-            close_price=Decimal(str(data.get('closePrice', 0))) if data.get('closePrice') else None,
-            change=Decimal(str(data.get('netChange', 0))) if data.get('netChange') else None,
-            change_percent=Decimal(str(data.get('netPercentChangeInDouble', 0))) if data.get('netPercentChangeInDouble') else None,
+            bid=to_price(data.get('bidPrice', 0)) if data.get('bidPrice') else None,
+            ask=to_price(data.get('askPrice', 0)) if data.get('askPrice') else None,
+            last=to_price(data.get('lastPrice', 0)) if data.get('lastPrice') else None,
+            mark=to_price(data.get('mark', 0)) if data.get('mark') else None,
+            bid_size=int(data['bidSize']) if data.get('bidSize') is not None else None,
+            ask_size=int(data['askSize']) if data.get('askSize') is not None else None,
+            volume=int(data['totalVolume']) if data.get('totalVolume') is not None else None,
+            open_price=to_price(data.get('openPrice', 0)) if data.get('openPrice') else None,
+            high=to_price(data.get('highPrice', 0)) if data.get('highPrice') else None,
+            low=to_price(data.get('lowPrice', 0)) if data.get('lowPrice') else None,
+            close_price=to_price(data.get('closePrice', 0)) if data.get('closePrice') else None,
+            change=to_price(data.get('netChange', 0)) if data.get('netChange') else None,
+            change_percent=to_price(data.get('netPercentChangeInDouble', 0)) if data.get('netPercentChangeInDouble') else None,
             timestamp=datetime.now(),
             market_hours=data.get('tradingHours', 'NORMAL') == 'NORMAL',
             source="schwab"
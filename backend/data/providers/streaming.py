@@ -0,0 +1,436 @@
+"""
+Streaming Market Data Providers
+Push-based quote ingest over WebSockets into an in-memory quote book
+"""
+
+import asyncio
+import json
+import logging
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+import aiohttp
+
+from .base import AuthenticationError
+from .http import HttpClientFactory, shared_http_client
+from ..models import MARKET_TIMEZONE, Price, Quote, to_price
+
+
+class _BookEntry:
+    """Latest top of book and trade for one symbol"""
+
+    __slots__ = ('bid', 'ask', 'bid_size', 'ask_size', 'last', 'last_size', 'exchange_time', 'updated_at')
+
+    def __init__(self):
+        self.bid: Optional[float] = None
+        self.ask: Optional[float] = None
+        self.bid_size: Optional[int] = None
+        self.ask_size: Optional[int] = None
+        self.last: Optional[float] = None
+        self.last_size: Optional[int] = None
+        self.exchange_time: Optional[datetime] = None
+        self.updated_at = 0.0
+
+
+class QuoteBook:
+    """
+    In-memory latest quote per symbol, fed by streaming updates
+
+    Updates only overwrite raw fields; Quote models are built when read,
+    so a busy feed doesn't pay for model validation on every tick.
+    """
+
+    def __init__(self, source: str, max_age_seconds: float = 5):
+        self.source = source
+        self.max_age_seconds = max_age_seconds
+        self._entries: Dict[str, _BookEntry] = {}
+        self.stats = {
+            'quote_updates': 0,
+            'trade_updates': 0,
+            'reads': 0,
+            'stale_reads': 0
+        }
+
+    def _entry(self, symbol: str) -> _BookEntry:
+        entry = self._entries.get(symbol)
+        if entry is None:
+            entry = _BookEntry()
+            self._entries[symbol] = entry
+        return entry
+
+    def apply_quote(
+        self,
+        symbol: str,
+        bid: Optional[float],
+        ask: Optional[float],
+        bid_size: Optional[int] = None,
+        ask_size: Optional[int] = None,
+        exchange_time: Optional[datetime] = None
+    ):
+        """Apply a top of book update"""
+        entry = self._entry(symbol)
+        entry.bid = bid
+        entry.ask = ask
+        entry.bid_size = bid_size
+        entry.ask_size = ask_size
+        entry.exchange_time = exchange_time or entry.exchange_time
+        entry.updated_at = time.monotonic()
+        self.stats['quote_updates'] += 1
+
+    def apply_trade(self, symbol: str, price: float, size: Optional[int] = None, exchange_time: Optional[datetime] = None):
+        """Apply a trade print"""
+        entry = self._entry(symbol)
+        entry.last = price
+        entry.last_size = size
+        entry.exchange_time = exchange_time or entry.exchange_time
+        entry.updated_at = time.monotonic()
+        self.stats['trade_updates'] += 1
+
+    def age(self, symbol: str) -> Optional[float]:
+        """Seconds since symbol was last updated (None if never seen)"""
+        entry = self._entries.get(symbol)
+        if entry is None:
+            return None
+        return time.monotonic() - entry.updated_at
+
+    def get(self, symbol: str, max_age_seconds: Optional[float] = None) -> Optional[Quote]:
+        """Build a Quote for symbol, or None if unknown or older than max_age_seconds"""
+        entry = self._entries.get(symbol)
+        if entry is None:
+            return None
+
+        self.stats['reads'] += 1
+        max_age = self.max_age_seconds if max_age_seconds is None else max_age_seconds
+        if time.monotonic() - entry.updated_at > max_age:
+            self.stats['stale_reads'] += 1
+            return None
+
+        def price(value) -> Optional[Price]:
+            return to_price(value) if value else None
+
+        bid = price(entry.bid)
+        ask = price(entry.ask)
+        last = price(entry.last)
+
+        return Quote.trusted(
+            symbol=symbol,
+            bid=bid,
+            ask=ask,
+            last=last,
+            mark=(bid + ask) / 2 if bid and ask else last,
+            bid_size=entry.bid_size,
+            ask_size=entry.ask_size,
+            timestamp=entry.exchange_time or datetime.now(),
+            source=self.source
+        )
+
+    def discard(self, symbols: Iterable[str]):
+        """Drop symbols from the book"""
+        for symbol in symbols:
+            self._entries.pop(symbol, None)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get book size and update statistics"""
+        return {
+            **self.stats,
+            'symbols': len(self._entries),
+            'max_age_seconds': self.max_age_seconds
+        }
+
+
+class StreamingProvider(ABC):
+    """
+    Abstract base class for push-based market data feeds
+
+    Features:
+    - Keeps a WebSocket connection open, reconnecting with exponential backoff
+    - Tracks subscriptions and re-sends them after every reconnect
+    - Applies updates into a QuoteBook read by the DataManager at no upstream cost
+    - Optionally records raw messages to a JSONL file for offline replay
+    """
+
+    def __init__(self, provider_name: str, config: Dict[str, Any]):
+        self.provider_name = provider_name
+        self.config = config
+        self.logger = logging.getLogger(f"data.{provider_name}.stream")
+        self.url = config.get('url')
+        self.is_connected = False
+        self.last_error: Optional[str] = None
+
+        self.book = QuoteBook(f"{provider_name}_stream", config.get('max_quote_age_seconds', 5))
+        self.subscriptions: Set[str] = set()
+        self.max_subscriptions = config.get('max_subscriptions', 1000)
+
+        self.reconnect_delay_seconds = config.get('reconnect_delay_seconds', 1)
+        self.max_reconnect_delay_seconds = config.get('max_reconnect_delay_seconds', 30)
+        self.heartbeat_seconds = config.get('heartbeat_seconds', 30)
+        self.record_path: Optional[str] = config.get('record_path')
+
+        self.http_client: HttpClientFactory = shared_http_client
+        self._ws: Optional[aiohttp.ClientWebSocketResponse] = None
+        self._task: Optional[asyncio.Task] = None
+        self._recorder = None
+
+        self.stats = {
+            'connects': 0,
+            'disconnects': 0,
+            'messages': 0,
+            'errors': 0
+        }
+
+    def set_http_client(self, http_client: HttpClientFactory):
+        """Open the WebSocket through http_client's connection pool"""
+        self.http_client = http_client
+
+    # Lifecycle
+
+    async def start(self):
+        """Start the connection loop in the background"""
+        if self._task is None or self._task.done():
+            if self.record_path:
+                self._recorder = open(self.record_path, 'a', encoding='utf-8')
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Close the connection and stop reconnecting"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+        await self.http_client.close_session(self._session_owner)
+        if self._recorder is not None:
+            self._recorder.close()
+            self._recorder = None
+
+        self.is_connected = False
+        self.logger.info(f"✅ {self.provider_name} stream stopped")
+
+    async def wait_connected(self, timeout: float = 10) -> bool:
+        """Wait until the stream is connected and subscribed"""
+        deadline = time.monotonic() + timeout
+        while not self.is_connected and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+        return self.is_connected
+
+    @property
+    def _session_owner(self) -> str:
+        return f"{self.provider_name}_stream"
+
+    async def _run(self):
+        """Connect, subscribe and apply messages until stopped"""
+        delay = self.reconnect_delay_seconds
+
+        while True:
+            try:
+                session = self.http_client.session(self._session_owner)
+                async with session.ws_connect(self.url, heartbeat=self.heartbeat_seconds) as ws:
+                    self._ws = ws
+                    await self._authenticate(ws)
+                    if self.subscriptions:
+                        await self._send_subscribe(ws, sorted(self.subscriptions))
+
+                    self.is_connected = True
+                    self.stats['connects'] += 1
+                    delay = self.reconnect_delay_seconds
+                    self.logger.info(f"✅ {self.provider_name} stream connected ({len(self.subscriptions)} symbols)")
+
+                    async for message in ws:
+                        if message.type == aiohttp.WSMsgType.TEXT:
+                            self._on_message(message.data)
+                        elif message.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                            break
+
+            except asyncio.CancelledError:
+                raise
+            except AuthenticationError as e:
+                self.last_error = str(e)
+                self.logger.error(f"❌ {self.provider_name} stream authentication failed: {e}")
+                return
+            except Exception as e:
+                self.last_error = str(e)
+                self.stats['errors'] += 1
+                self.logger.warning(f"⚠️ {self.provider_name} stream error: {e}")
+            finally:
+                if self.is_connected:
+                    self.stats['disconnects'] += 1
+                self.is_connected = False
+                self._ws = None
+
+            self.logger.info(f"🔄 Reconnecting {self.provider_name} stream in {delay:g}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay_seconds)
+
+    def _on_message(self, data: str):
+        self.stats['messages'] += 1
+        if self._recorder is not None:
+            self._recorder.write(data.replace('\n', '') + '\n')
+        try:
+            self._handle_message(data)
+        except Exception as e:
+            self.stats['errors'] += 1
+            self.logger.debug(f"Failed to apply stream message: {e}")
+
+    # Subscriptions
+
+    async def subscribe(self, symbols: Iterable[str]) -> List[str]:
+        """Subscribe to symbols (up to max_subscriptions), returning those newly added"""
+        added = []
+        for symbol in symbols:
+            if symbol in self.subscriptions or len(self.subscriptions) >= self.max_subscriptions:
+                continue
+            self.subscriptions.add(symbol)
+            added.append(symbol)
+
+        if added and self._ws is not None and not self._ws.closed:
+            await self._send_subscribe(self._ws, added)
+        return added
+
+    async def unsubscribe(self, symbols: Iterable[str]):
+        """Unsubscribe from symbols and drop them from the book"""
+        removed = [symbol for symbol in symbols if symbol in self.subscriptions]
+        self.subscriptions.difference_update(removed)
+        self.book.discard(removed)
+
+        if removed and self._ws is not None and not self._ws.closed:
+            await self._send_unsubscribe(self._ws, removed)
+
+    # Reads
+
+    def get_quote(self, symbol: str) -> Optional[Quote]:
+        """Latest streamed quote for symbol (None if not subscribed or stale)"""
+        return self.book.get(symbol)
+
+    # Protocol
+
+    @abstractmethod
+    async def _authenticate(self, ws: aiohttp.ClientWebSocketResponse):
+        """Authenticate a new connection (raise AuthenticationError on rejection)"""
+        pass
+
+    @abstractmethod
+    async def _send_subscribe(self, ws: aiohttp.ClientWebSocketResponse, symbols: List[str]):
+        """Send a subscribe request for symbols"""
+        pass
+
+    @abstractmethod
+    async def _send_unsubscribe(self, ws: aiohttp.ClientWebSocketResponse, symbols: List[str]):
+        """Send an unsubscribe request for symbols"""
+        pass
+
+    @abstractmethod
+    def _handle_message(self, data: str):
+        """Apply one raw text message to the quote book"""
+        pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get connection, subscription and book statistics"""
+        return {
+            'provider': self.provider_name,
+            'connected': self.is_connected,
+            'url': self.url,
+            'subscriptions': len(self.subscriptions),
+            'last_error': self.last_error,
+            **self.stats,
+            'book': self.book.get_stats()
+        }
+
+
+class PolygonStreamingProvider(StreamingProvider):
+    """
+    Polygon.io stocks WebSocket feed
+
+    Subscribes to quote (Q) and trade (T) channels per symbol.
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        config = {'url': "wss://socket.polygon.io/stocks", **config}
+        super().__init__("polygon", config)
+
+        self.api_key = config.get('api_key')
+        if not self.api_key:
+            raise ValueError("Polygon API key is required")
+
+        self.auth_timeout_seconds = config.get('auth_timeout_seconds', 10)
+
+    async def _authenticate(self, ws: aiohttp.ClientWebSocketResponse):
+        await ws.send_json({'action': 'auth', 'params': self.api_key})
+
+        deadline = time.monotonic() + self.auth_timeout_seconds
+        while True:
+            message = await ws.receive(timeout=max(deadline - time.monotonic(), 0.01))
+            if message.type != aiohttp.WSMsgType.TEXT:
+                raise ConnectionError(f"Stream closed during authentication ({message.type.name})")
+
+            for event in json.loads(message.data):
+                if event.get('ev') != 'status':
+                    continue
+                if event.get('status') == 'auth_success':
+                    return
+                if event.get('status') == 'auth_failed':
+                    raise AuthenticationError(event.get('message', 'auth_failed'))
+
+    def _channels(self, symbols: List[str]) -> str:
+        return ','.join(f"{channel}.{symbol}" for symbol in symbols for channel in ('Q', 'T'))
+
+    async def _send_subscribe(self, ws: aiohttp.ClientWebSocketResponse, symbols: List[str]):
+        await ws.send_json({'action': 'subscribe', 'params': self._channels(symbols)})
+
+    async def _send_unsubscribe(self, ws: aiohttp.ClientWebSocketResponse, symbols: List[str]):
+        await ws.send_json({'action': 'unsubscribe', 'params': self._channels(symbols)})
+
+    def _handle_message(self, data: str):
+        events = json.loads(data)
+        if isinstance(events, dict):
+            events = [events]
+
+        for event in events:
+            kind = event.get('ev')
+            if kind == 'Q':
+                self.book.apply_quote(
+                    event['sym'],
+                    event.get('bp'),
+                    event.get('ap'),
+                    event.get('bs'),
+                    event.get('as'),
+                    _exchange_time(event.get('t'))
+                )
+            elif kind == 'T':
+                self.book.apply_trade(event['sym'], event['p'], event.get('s'), _exchange_time(event.get('t')))
+            elif kind == 'status':
+                self.logger.debug(f"Stream status: {event.get('status')} {event.get('message', '')}")
+
+
+def _exchange_time(timestamp_ms: Optional[int]) -> Optional[datetime]:
+    """Convert a millisecond epoch timestamp to a market-timezone datetime"""
+    return datetime.fromtimestamp(timestamp_ms / 1000, MARKET_TIMEZONE) if timestamp_ms else None
+
+
+def create_streaming_provider(provider_type: str, config: Dict[str, Any]) -> StreamingProvider:
+    """
+    Factory function to create streaming provider instances
+
+    Args:
+        provider_type: Type of feed ('polygon')
+        config: Streaming configuration (merged with the provider's REST config)
+
+    Returns:
+        Configured streaming provider instance
+    """
+    providers = {
+        'polygon': PolygonStreamingProvider,
+        # Add more streaming providers here
+    }
+
+    if provider_type not in providers:
+        raise ValueError(f"Unknown streaming provider type: {provider_type}")
+
+    return providers[provider_type](config)
@@ -0,0 +1,334 @@
+"""
+Provider Routing Health for the Data Layer
+Tracks per-provider health so the DataManager can route around failing providers
+"""
+
+import logging
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for one provider/data type pair
+
+    Features:
+    - Closed: requests flow, consecutive failures are counted
+    - Open: requests are rejected until the reset timeout elapses
+    - Half-open: a single trial request decides whether to close or re-open
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout_seconds: float = 60):
+        self.name = name
+        self.failure_threshold = max(failure_threshold, 1)
+        self.reset_timeout_seconds = reset_timeout_seconds
+        self.logger = logging.getLogger("data.routing")
+
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_started_at: Optional[float] = None
+
+        self.stats = {
+            'successes': 0,
+            'failures': 0,
+            'times_opened': 0
+        }
+
+    def allow_request(self) -> bool:
+        """Check whether a request may be sent (claims the trial slot when half-open)"""
+        now = time.monotonic()
+
+        if self.state == self.OPEN:
+            if now - self.opened_at < self.reset_timeout_seconds:
+                return False
+            self.state = self.HALF_OPEN
+            self.trial_started_at = None
+            self.logger.info(f"🔄 Circuit {self.name} half-open, sending trial request")
+
+        if self.state == self.HALF_OPEN:
+            # One trial at a time; a trial that never reported back expires after the timeout
+            if self.trial_started_at is not None and now - self.trial_started_at < self.reset_timeout_seconds:
+                return False
+            self.trial_started_at = now
+
+        return True
+
+    def record_success(self):
+        """Record a successful request"""
+        self.stats['successes'] += 1
+        self.consecutive_failures = 0
+        if self.state != self.CLOSED:
+            self.logger.info(f"✅ Circuit {self.name} closed")
+        self.state = self.CLOSED
+        self.opened_at = None
+        self.trial_started_at = None
+
+    def record_failure(self):
+        """Record a failed request, opening the circuit at the threshold"""
+        self.stats['failures'] += 1
+        self.consecutive_failures += 1
+
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                self.stats['times_opened'] += 1
+                self.logger.warning(
+                    f"⚠️ Circuit {self.name} opened after {self.consecutive_failures} consecutive failures"
+                )
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+            self.trial_started_at = None
+
+    def get_state(self) -> Dict[str, Any]:
+        """Get breaker state for monitoring"""
+        retry_in = None
+        if self.state == self.OPEN:
+            retry_in = max(self.reset_timeout_seconds - (time.monotonic() - self.opened_at), 0)
+
+        return {
+            'state': self.state,
+            'consecutive_failures': self.consecutive_failures,
+            'retry_in_seconds': round(retry_in, 1) if retry_in is not None else None,
+            **self.stats
+        }
+
+
+class CircuitBreakerRegistry:
+    """
+    Circuit breakers keyed by (provider, data type)
+
+    A provider whose options endpoint is failing can keep serving quotes,
+    so each data type trips independently.
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        self.enabled = config.get('circuit_breaker_enabled', True)
+        self.failure_threshold = config.get('circuit_breaker_failure_threshold', 5)
+        self.reset_timeout_seconds = config.get('circuit_breaker_timeout_seconds', 60)
+        self._breakers: Dict[Tuple[str, str], CircuitBreaker] = {}
+
+    def get(self, provider_name: str, data_type: str) -> CircuitBreaker:
+        """Get (or create) the breaker for a provider and data type"""
+        key = (provider_name, data_type)
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                f"{provider_name}/{data_type}",
+                failure_threshold=self.failure_threshold,
+                reset_timeout_seconds=self.reset_timeout_seconds
+            )
+            self._breakers[key] = breaker
+        return breaker
+
+    def allow_request(self, provider_name: str, data_type: str) -> bool:
+        """Check whether a request to provider may be sent for data type"""
+        if not self.enabled:
+            return True
+        return self.get(provider_name, data_type).allow_request()
+
+    def record(self, provider_name: str, data_type: str, success: bool):
+        """Record the outcome of a provider request"""
+        if not self.enabled:
+            return
+        breaker = self.get(provider_name, data_type)
+        if success:
+            breaker.record_success()
+        else:
+            breaker.record_failure()
+
+    def get_provider_state(self, provider_name: str) -> Dict[str, Dict[str, Any]]:
+        """Get breaker states for one provider, by data type"""
+        return {
+            data_type: breaker.get_state()
+            for (name, data_type), breaker in self._breakers.items()
+            if name == provider_name
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get breaker states for all providers"""
+        stats: Dict[str, Any] = {'enabled': self.enabled}
+        for name in sorted({name for name, _ in self._breakers}):
+            stats[name] = self.get_provider_state(name)
+        return stats
+
+
+class ProviderScoreboard:
+    """
+    Rolling provider health used to rank providers for routing
+
+    Features:
+    - Latency percentiles and error rate per provider/data type over a sliding window
+    - Remaining rate-limit budget from per-minute and daily limits
+    - Score weighted by cost_optimization.smart_routing cost/quality weights
+    - The configured default provider is only outranked on quality, never on cost
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        smart_routing = config.get('smart_routing', {})
+        self.enabled = config.get('enabled', True)
+        self.quality_weight = smart_routing.get('quality_weight', 0.7)
+        self.cost_weight = smart_routing.get('cost_weight', 0.3) if smart_routing.get('prefer_free_sources', True) else 0.0
+        self.window_size = smart_routing.get('window_size', 100)
+        # Latency assumed for providers without samples, so they still get tried
+        self.default_latency_seconds = smart_routing.get('default_latency_ms', 500) / 1000
+
+        self._samples: Dict[Tuple[str, str], Deque[Tuple[float, bool]]] = {}
+        self._requests: Dict[str, Deque[Tuple[float, int]]] = {}
+
+    def record(self, provider_name: str, data_type: str, latency_seconds: float, success: bool, requests: int = 1):
+        """Record a provider call outcome and the upstream requests it made"""
+        samples = self._samples.setdefault((provider_name, data_type), deque(maxlen=self.window_size))
+        samples.append((latency_seconds, success))
+
+        if requests > 0:
+            self._requests.setdefault(provider_name, deque()).append((time.monotonic(), requests))
+
+    def latency_percentile(self, provider_name: str, data_type: str, q: float) -> Optional[float]:
+        """Latency percentile in seconds (None without samples)"""
+        samples = self._samples.get((provider_name, data_type))
+        if not samples:
+            return None
+        return _percentile(sorted(latency for latency, _ in samples), q)
+
+    def latency_stats(self, provider_name: str, data_type: str) -> Dict[str, Any]:
+        """Get latency percentiles and error rate for a provider/data type"""
+        samples = self._samples.get((provider_name, data_type))
+        if not samples:
+            return {'samples': 0, 'p50_ms': None, 'p95_ms': None, 'error_rate': None}
+
+        latencies = sorted(latency for latency, _ in samples)
+        failures = sum(1 for _, success in samples if not success)
+        return {
+            'samples': len(samples),
+            'p50_ms': round(_percentile(latencies, 0.5) * 1000, 1),
+            'p95_ms': round(_percentile(latencies, 0.95) * 1000, 1),
+            'error_rate': round(failures / len(samples), 3)
+        }
+
+    def requests_last_minute(self, provider_name: str) -> int:
+        """Upstream requests recorded for provider over the last 60 seconds"""
+        requests = self._requests.get(provider_name)
+        if not requests:
+            return 0
+
+        cutoff = time.monotonic() - 60
+        while requests and requests[0][0] < cutoff:
+            requests.popleft()
+        return sum(count for _, count in requests)
+
+    def budget_remaining(self, provider) -> Optional[float]:
+        """
+        Fraction of rate-limit budget left (0.0 - 1.0), None when unlimited
+
+        Uses requests made in the last minute against the provider's
+        per-minute limit, and the daily limit for providers that have one.
+        """
+        fractions = []
+
+        rate_limit = getattr(provider, 'rate_limit', None)
+        if rate_limit:
+            fractions.append(1 - self.requests_last_minute(provider.provider_name) / rate_limit)
+
+        daily_limit = getattr(provider, 'daily_limit', None)
+        if daily_limit:
+            fractions.append(1 - getattr(provider, 'request_count_today', 0) / daily_limit)
+
+        if not fractions:
+            return None
+        return min(max(min(fractions), 0.0), 1.0)
+
+    def quality(self, provider, data_type: str) -> float:
+        """
+        Quality of a provider for data type (higher is better)
+
+        Based on expected latency including the cost of failed attempts,
+        penalised for delayed quote feeds and scaled down as the rate-limit
+        budget runs out.
+        """
+        stats = self.latency_stats(provider.provider_name, data_type)
+        if stats['samples']:
+            error_rate = stats['error_rate']
+            expected_latency = stats['p50_ms'] / 1000 + error_rate * stats['p95_ms'] / 1000
+        else:
+            error_rate = 0.0
+            expected_latency = self.default_latency_seconds
+
+        quality = (1 - error_rate) / (1 + expected_latency)
+
+        # Delayed feeds are a poor substitute for live quotes
+        delay_minutes = provider.config.get('data_delay_minutes', 0) or 0
+        if data_type == 'quotes' and delay_minutes:
+            quality /= 1 + delay_minutes
+
+        budget = self.budget_remaining(provider)
+        if budget is not None:
+            if budget <= 0:
+                return 0.0
+            # Back off linearly over the last 20% of the budget
+            quality *= min(budget / 0.2, 1.0)
+
+        return quality
+
+    def score(self, provider, data_type: str, max_cost: float = 0.0) -> float:
+        """
+        Score a provider for data type (higher is better)
+
+        Weighted quality plus cost relative to the most expensive candidate.
+        """
+        cost = provider.config.get('cost_per_request', 0.0) or 0.0
+        cost_score = 1 - cost / max_cost if max_cost > 0 else 1.0
+
+        return self.quality_weight * self.quality(provider, data_type) + self.cost_weight * cost_score
+
+    def rank(self, providers: List[Any], data_type: str, default: Optional[str] = None) -> List[Any]:
+        """
+        Order providers by score, best first (input order breaks ties)
+
+        Providers only go ahead of the default provider when their quality
+        is better, so a cheaper fallback can't displace it on cost alone.
+        """
+        if not self.enabled or len(providers) < 2:
+            return list(providers)
+
+        max_cost = max((provider.config.get('cost_per_request', 0.0) or 0.0) for provider in providers)
+        scores = {provider.provider_name: self.score(provider, data_type, max_cost) for provider in providers}
+
+        def by_score(candidates: List[Any]) -> List[Any]:
+            return sorted(candidates, key=lambda provider: -scores[provider.provider_name])
+
+        preferred = next((provider for provider in providers if provider.provider_name == default), None)
+        if preferred is None:
+            return by_score(providers)
+
+        baseline = self.quality(preferred, data_type)
+        others = [provider for provider in providers if provider is not preferred]
+        ahead = [provider for provider in others if self.quality(provider, data_type) > baseline]
+        behind = [provider for provider in others if provider not in ahead]
+        return by_score(ahead) + [preferred] + by_score(behind)
+
+    def get_provider_stats(self, provider, data_types: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Get routing health for one provider, by data type"""
+        data_types = data_types or sorted({dt for name, dt in self._samples if name == provider.provider_name})
+        budget = self.budget_remaining(provider)
+        return {
+            'budget_remaining': round(budget, 3) if budget is not None else None,
+            'requests_last_minute': self.requests_last_minute(provider.provider_name),
+            'data_types': {
+                data_type: {
+                    **self.latency_stats(provider.provider_name, data_type),
+                    'score': round(self.score(provider, data_type), 4)
+                }
+                for data_type in data_types
+            }
+        }
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    index = min(int(round(q * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
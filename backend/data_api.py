@@ -13,7 +13,7 @@ import logging
 from data.manager import DataManager
 from data.models import (
     Quote, OptionsChain, HistoricalBar, Position, Account, Order,
-    DataRequest, DataResponse, MarketDataType, OptionType
+    DataRequest, DataResponse, MarketDataType, OptionType, RequestPriority
 )
 # from auth.middleware import get_current_user  # Uncomment when auth is integrated
 
@@ -59,6 +59,7 @@ class MultiQuoteRequest(BaseModel):
     """Multiple quotes request"""
     symbols: List[str] = Field(..., description="List of symbols")
     source_preference: Optional[str] = Field(None, description="Preferred data source")
+    priority: RequestPriority = Field(RequestPriority.NORMAL, description="Request priority (low for background refreshes)")
 
 # Market Data Endpoints
 
@@ -67,6 +68,8 @@ async def get_quote(
     symbol: str,
     source: Optional[str] = Query(None, description="Preferred data source"),
     account_id: Optional[str] = Query(None, description="Account ID for broker-specific pricing"),
+    hedged: Optional[bool] = Query(None, description="Hedge slow providers (latency-critical callers)"),
+    priority: RequestPriority = Query(RequestPriority.NORMAL, description="Request priority"),
     # user: Dict[str, Any] = Depends(get_current_user)  # Uncomment when auth ready
 ):
     """
@@ -84,7 +87,9 @@ async def get_quote(
             symbol=symbol.upper(),
             # user_id=user.get('id'),  # Uncomment when auth ready
             account_id=account_id,
-            source_preference=source
+            source_preference=source,
+            hedged=hedged,
+            priority=priority
         )
         
         if not response.success:
@@ -98,6 +103,7 @@ async def get_quote(
             "data": response.data,
             "source": response.source,
             "cached": response.cached,
+            "age_seconds": response.age_seconds,
             "timestamp": response.timestamp
         }
         
@@ -115,36 +121,27 @@ async def get_multiple_quotes(
     try:
         manager = get_data_manager()
         
-        # Process requests concurrently
-        import asyncio
-        tasks = []
-        
-        for symbol in request.symbols:
-            task = manager.get_quote(
-                symbol=symbol.upper(),
-                # user_id=user.get('id'),
-                account_id=account_id,
-                source_preference=request.source_preference
-            )
-            tasks.append(task)
-        
-        # Wait for all quotes
-        responses = await asyncio.gather(*tasks, return_exceptions=True)
+        # One bulk request: batched cache reads/writes, misses grouped per provider
+        symbols = [symbol.upper() for symbol in request.symbols]
+        responses = await manager.get_quotes(
+            symbols,
+            # user_id=user.get('id'),
+            account_id=account_id,
+            source_preference=request.source_preference,
+            priority=request.priority
+        )
         
         # Process results
         results = {}
         errors = {}
         
-        for i, response in enumerate(responses):
-            symbol = request.symbols[i].upper()
-            
-            if isinstance(response, Exception):
-                errors[symbol] = str(response)
-            elif response.success:
+        for symbol, response in responses.items():
+            if response.success:
                 results[symbol] = {
                     "data": response.data,
                     "source": response.source,
                     "cached": response.cached,
+                    "age_seconds": response.age_seconds,
                     "timestamp": response.timestamp
                 }
             else:
@@ -171,6 +168,7 @@ async def get_options_chain(
     strike_max: Optional[float] = Query(None, description="Maximum strike price"),
     source: Optional[str] = Query(None, description="Preferred data source"),
     account_id: Optional[str] = Query(None, description="Account ID for broker-specific data"),
+    priority: RequestPriority = Query(RequestPriority.NORMAL, description="Request priority"),
     # user: Dict[str, Any] = Depends(get_current_user)
 ):
     """
@@ -192,7 +190,8 @@ async def get_options_chain(
             strike_range=strike_range,
             # user_id=user.get('id'),
             account_id=account_id,
-            source_preference=source
+            source_preference=source,
+            priority=priority
         )
         
         if not response.success:
@@ -206,6 +205,7 @@ async def get_options_chain(
             "data": response.data,
             "source": response.source,
             "cached": response.cached,
+            "age_seconds": response.age_seconds,
             "timestamp": response.timestamp
         }
         
@@ -220,6 +220,7 @@ async def get_historical_data(
     end_date: date = Query(..., description="End date (YYYY-MM-DD)"),
     interval: str = Query("1d", description="Data interval (1m, 5m, 1h, 1d)"),
     source: Optional[str] = Query(None, description="Preferred data source"),
+    priority: RequestPriority = Query(RequestPriority.NORMAL, description="Request priority"),
     # user: Dict[str, Any] = Depends(get_current_user)
 ):
     """
@@ -250,7 +251,8 @@ async def get_historical_data(
             start_date=start_date,
             end_date=end_date,
             interval=interval,
-            source_preference=source
+            source_preference=source,
+            priority=priority
         )
         
         if not response.success:
@@ -264,6 +266,7 @@ async def get_historical_data(
             "data": response.data,
             "source": response.source,
             "cached": response.cached,
+            "age_seconds": response.age_seconds,
             "timestamp": response.timestamp,
             "bars_count": len(response.data) if response.data else 0
         }
@@ -666,6 +666,12 @@ async def get_provider_status():
             if hasattr(provider, 'get_provider_info'):
                 status.update(provider.get_provider_info())
             
+            # Circuit breaker state per data type (closed/open/half_open)
+            status["circuit_breakers"] = data_manager.circuit_breakers.get_provider_state(name)
+            
+            # Rolling latency, error rate and rate-limit budget used for routing
+            status["routing"] = data_manager.provider_scoreboard.get_provider_stats(provider)
+            
             provider_status[name] = status
             
         except Exception as e:
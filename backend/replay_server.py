@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Local WebSocket replay server for streaming market data
+Speaks the Polygon stocks WebSocket protocol and plays back recorded
+(or synthetic) ticks, so the streaming ingest can be load-tested offline
+
+Usage:
+    python replay_server.py --ticks ticks.jsonl --speed 10 --loop
+    python replay_server.py --synthetic SPY,QQQ,AAPL --rate 5000
+
+Point DataManager at it with streaming.url = "ws://127.0.0.1:8790/stocks".
+Recordings are JSONL files of raw feed messages, as written by a streaming
+provider with record_path set.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import Any, Dict, Iterator, List, Set
+
+from aiohttp import WSMsgType, web
+
+
+def load_recording(path: str) -> List[List[Dict[str, Any]]]:
+    """Load recorded messages (one JSON event list or event per line)"""
+    messages = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            events = json.loads(line)
+            events = events if isinstance(events, list) else [events]
+            events = [event for event in events if event.get('ev') in ('Q', 'T')]
+            if events:
+                messages.append(events)
+    return messages
+
+
+def synthetic_ticks(symbols: List[str], batch_size: int) -> Iterator[List[Dict[str, Any]]]:
+    """Endless random-walk quotes and trades for symbols"""
+    prices = {symbol: random.uniform(50, 500) for symbol in symbols}
+    while True:
+        events = []
+        now = int(time.time() * 1000)
+        for _ in range(batch_size):
+            symbol = random.choice(symbols)
+            price = prices[symbol] = max(prices[symbol] * (1 + random.gauss(0, 0.0005)), 0.01)
+            spread = max(round(price * 0.0002, 2), 0.01)
+            if random.random() < 0.8:
+                events.append({
+                    'ev': 'Q', 'sym': symbol,
+                    'bp': round(price - spread / 2, 2), 'bs': random.randint(1, 20),
+                    'ap': round(price + spread / 2, 2), 'as': random.randint(1, 20),
+                    't': now
+                })
+            else:
+                events.append({'ev': 'T', 'sym': symbol, 'p': round(price, 2), 's': random.randint(1, 500), 't': now})
+        yield events
+
+
+class ReplayServer:
+    """
+    Broadcasts ticks to connected clients, filtered by their subscriptions
+
+    Features:
+    - Polygon auth/subscribe/unsubscribe handshake (Q.*, T.*, Q.SYM, T.SYM)
+    - Recorded playback at original pacing scaled by --speed, optionally looped
+    - Synthetic mode at a fixed events/second rate for load tests
+    """
+
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.clients: Dict[web.WebSocketResponse, Set[str]] = {}
+        self.stats = {'clients': 0, 'events_sent': 0, 'messages_sent': 0}
+
+    async def handle(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        await ws.send_json([{'ev': 'status', 'status': 'connected', 'message': 'Connected Successfully'}])
+
+        authenticated = False
+        self.stats['clients'] += 1
+        try:
+            async for message in ws:
+                if message.type != WSMsgType.TEXT:
+                    continue
+                request_data = json.loads(message.data)
+                action = request_data.get('action')
+                params = request_data.get('params', '')
+
+                if action == 'auth':
+                    if self.args.api_key and params != self.args.api_key:
+                        await ws.send_json([{'ev': 'status', 'status': 'auth_failed', 'message': 'authentication failed'}])
+                        break
+                    authenticated = True
+                    self.clients[ws] = set()
+                    await ws.send_json([{'ev': 'status', 'status': 'auth_success', 'message': 'authenticated'}])
+
+                elif not authenticated:
+                    await ws.send_json([{'ev': 'status', 'status': 'error', 'message': 'not authorized'}])
+
+                elif action in ('subscribe', 'unsubscribe'):
+                    channels = {channel.strip() for channel in params.split(',') if channel.strip()}
+                    if action == 'subscribe':
+                        self.clients[ws] |= channels
+                    else:
+                        self.clients[ws] -= channels
+                    await ws.send_json([
+                        {'ev': 'status', 'status': 'success', 'message': f"{action}d to: {channel}"}
+                        for channel in sorted(channels)
+                    ])
+        finally:
+            self.clients.pop(ws, None)
+        return ws
+
+    async def broadcast(self, events: List[Dict[str, Any]]):
+        """Send the events each client is subscribed to"""
+        for ws, channels in list(self.clients.items()):
+            selected = [
+                event for event in events
+                if f"{event['ev']}.{event['sym']}" in channels or f"{event['ev']}.*" in channels
+            ]
+            if not selected or ws.closed:
+                continue
+            try:
+                await ws.send_str(json.dumps(selected))
+                self.stats['messages_sent'] += 1
+                self.stats['events_sent'] += len(selected)
+            except ConnectionError:
+                self.clients.pop(ws, None)
+
+    async def play_recording(self):
+        messages = load_recording(self.args.ticks)
+        if not messages:
+            raise SystemExit(f"No Q/T events in {self.args.ticks}")
+        print(f"▶️ Replaying {len(messages)} messages from {self.args.ticks} at {self.args.speed:g}x")
+
+        while True:
+            previous = None
+            for events in messages:
+                timestamp = events[0].get('t')
+                if previous and timestamp:
+                    await asyncio.sleep(max(timestamp - previous, 0) / 1000 / self.args.speed)
+                previous = timestamp or previous
+                await self.broadcast(events)
+            if not self.args.loop:
+                print("⏹️ Recording finished")
+                return
+
+    async def play_synthetic(self):
+        symbols = [symbol.strip() for symbol in self.args.synthetic.split(',') if symbol.strip()]
+        batch_size = max(self.args.rate // 100, 1)
+        interval = batch_size / self.args.rate
+        print(f"▶️ Synthetic feed for {len(symbols)} symbols at ~{self.args.rate} events/s")
+
+        next_send = time.monotonic()
+        for events in synthetic_ticks(symbols, batch_size):
+            await self.broadcast(events)
+            next_send += interval
+            await asyncio.sleep(max(next_send - time.monotonic(), 0))
+
+    async def report(self):
+        while True:
+            await asyncio.sleep(10)
+            print(f"📊 {len(self.clients)} clients, {self.stats['messages_sent']} messages, {self.stats['events_sent']} events sent")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Replay recorded ticks over a Polygon-style WebSocket")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--ticks", help="JSONL recording of raw feed messages")
+    source.add_argument("--synthetic", help="Comma-separated symbols for a random-walk feed")
+    parser.add_argument("--speed", type=float, default=1.0, help="Playback speed multiplier for recordings")
+    parser.add_argument("--loop", action="store_true", help="Restart the recording when it ends")
+    parser.add_argument("--rate", type=int, default=1000, help="Synthetic events per second")
+    parser.add_argument("--api-key", default=None, help="Require this API key (any key accepted if unset)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8790)
+    args = parser.parse_args()
+
+    server = ReplayServer(args)
+    app = web.Application()
+    app.router.add_get('/stocks', server.handle)
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, args.host, args.port).start()
+    print(f"🚀 Replay server listening on ws://{args.host}:{args.port}/stocks")
+
+    reporter = asyncio.create_task(server.report())
+    try:
+        if args.ticks:
+            await server.play_recording()
+            # Keep serving the connection after a one-shot replay
+            await asyncio.Event().wait()
+        else:
+            await server.play_synthetic()
+    finally:
+        reporter.cancel()
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
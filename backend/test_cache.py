@@ -0,0 +1,239 @@
+"""
+Tests for the data layer cache helpers
+Covers cache policy TTLs, the in-process L1 cache and the range-merging
+historical bar cache
+"""
+
+import time
+from datetime import datetime, date, timedelta
+from decimal import Decimal
+
+from data.cache import BarSegmentSet, CachePolicyEngine, LocalCache
+from data.models import MARKET_TIMEZONE, HistoricalBar
+
+
+POLICIES = {
+    'quotes': {'ttl_seconds': 30, 'max_age_trading_hours': 15, 'max_age_after_hours': 300},
+    'historical_data': {
+        'ttl_seconds': 3600,
+        'max_age_intraday': 300,
+        'max_age_daily': 3600,
+        'max_age_weekly': 86400,
+        'settled_ttl_seconds': 604800
+    }
+}
+
+# Wednesday 2024-03-13 in exchange time
+TRADING = datetime(2024, 3, 13, 11, 0, tzinfo=MARKET_TIMEZONE)
+BEFORE_OPEN = datetime(2024, 3, 13, 9, 28, tzinfo=MARKET_TIMEZONE)
+EVENING = datetime(2024, 3, 13, 20, 0, tzinfo=MARKET_TIMEZONE)
+
+
+def test_quote_ttls_during_trading_hours():
+    """Quotes stay fresh for the trading-hours max age and are kept for ttl_seconds"""
+    engine = CachePolicyEngine(POLICIES)
+
+    assert engine.freshness_ttl('quotes', now=TRADING) == 15
+    assert engine.storage_ttl('quotes', now=TRADING) == 30
+
+
+def test_after_hours_freshness_stops_at_the_open():
+    """After-hours entries use the after-hours max age, but never outlive the next open"""
+    engine = CachePolicyEngine(POLICIES)
+
+    assert engine.freshness_ttl('quotes', now=EVENING) == 300
+    assert engine.freshness_ttl('quotes', now=BEFORE_OPEN) == 120
+
+
+def test_storage_ttl_is_never_shorter_than_freshness():
+    engine = CachePolicyEngine(POLICIES)
+
+    assert engine.freshness_ttl('quotes', now=EVENING) == 300
+    assert engine.storage_ttl('quotes', now=EVENING) == 300
+
+
+def test_historical_ttls_by_interval():
+    """Ranges reaching today use the max age for their interval"""
+    engine = CachePolicyEngine(POLICIES)
+    today = TRADING.date()
+
+    assert engine.freshness_ttl('historical_data', '5m', today, now=TRADING) == 300
+    assert engine.freshness_ttl('historical_data', '1d', today, now=TRADING) == 3600
+    assert engine.freshness_ttl('historical_data', '1w', today, now=TRADING) == 86400
+
+
+def test_settled_historical_ranges_use_settled_ttl():
+    """Ranges that ended before today can't change, so they are kept much longer"""
+    engine = CachePolicyEngine(POLICIES)
+
+    assert engine.freshness_ttl('historical_data', '1m', date(2024, 3, 12), now=TRADING) == 604800
+    assert engine.storage_ttl('historical_data', '1m', date(2024, 3, 12), now=TRADING) == 604800
+
+
+def test_missing_policy_falls_back_to_default_ttl():
+    engine = CachePolicyEngine({}, default_ttl=120)
+
+    assert engine.freshness_ttl('options_chains', now=TRADING) == 120
+    assert engine.storage_ttl('options_chains', now=TRADING) == 120
+
+
+# In-process L1 cache
+
+SHORT_TTL = 0.05
+
+
+def test_local_cache_evicts_least_recently_used():
+    cache = LocalCache('quotes', max_entries=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+
+    cache.set('c', 3)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 1 and cache.get('c') == 3
+    assert len(cache) == 2
+
+
+def test_local_cache_entries_expire_after_their_ttl():
+    cache = LocalCache('quotes')
+    cache.set('short', 1, SHORT_TTL)
+    cache.set('long', 2, 60)
+
+    time.sleep(SHORT_TTL)
+
+    assert cache.get('short') is None
+    assert cache.get('long') == 2
+    assert cache.stats['expirations'] == 1
+
+
+def test_local_cache_ttl_is_capped_at_max_ttl():
+    cache = LocalCache('quotes', max_ttl_seconds=SHORT_TTL)
+    cache.set('key', 1, 3600)
+
+    time.sleep(SHORT_TTL)
+
+    assert cache.get('key') is None
+
+
+def test_local_cache_skips_non_positive_ttls_and_zero_size():
+    cache = LocalCache('quotes')
+    cache.set('key', 1, 0)
+    disabled = LocalCache('quotes', max_entries=0)
+    disabled.set('key', 1)
+
+    assert cache.get('key') is None
+    assert len(disabled) == 0
+
+
+def test_local_cache_stats_count_hits_misses_and_evictions():
+    cache = LocalCache('quotes', max_entries=1)
+    cache.set('a', 1)
+    cache.get('a')
+    cache.set('b', 2)
+    cache.get('a')
+
+    stats = cache.get_stats()
+
+    assert (stats['hits'], stats['misses'], stats['evictions'], stats['sets']) == (1, 1, 1, 2)
+    assert stats['size'] == 1 and stats['hit_rate'] == 50
+
+
+# Range-merging bar cache
+
+def bars_for(start: date, end: date, close: str = '1') -> list:
+    """Daily bars for the weekdays in [start, end]"""
+    bars = []
+    day = start
+    while day <= end:
+        if day.weekday() < 5:
+            bars.append(HistoricalBar(
+                symbol='SPY',
+                timestamp=datetime(day.year, day.month, day.day, 16, tzinfo=MARKET_TIMEZONE),
+                open_price=Decimal(close),
+                high=Decimal(close),
+                low=Decimal(close),
+                close_price=Decimal(close),
+                volume=100
+            ))
+        day += timedelta(days=1)
+    return bars
+
+
+def merged(*ranges) -> BarSegmentSet:
+    segments = BarSegmentSet()
+    for start, end in ranges:
+        segments.merge(start, end, bars_for(start, end), time.time() + 60, 'polygon', settled=True)
+    return segments
+
+
+def test_missing_ranges_of_empty_cache_is_whole_range():
+    assert BarSegmentSet().missing_ranges(date(2024, 1, 1), date(2024, 1, 31)) == [(date(2024, 1, 1), date(2024, 1, 31))]
+
+
+def test_missing_ranges_are_the_uncovered_gaps():
+    segments = merged((date(2024, 1, 5), date(2024, 1, 10)), (date(2024, 1, 20), date(2024, 1, 25)))
+
+    assert segments.missing_ranges(date(2024, 1, 1), date(2024, 1, 31)) == [
+        (date(2024, 1, 1), date(2024, 1, 4)),
+        (date(2024, 1, 11), date(2024, 1, 19)),
+        (date(2024, 1, 26), date(2024, 1, 31))
+    ]
+    assert segments.missing_ranges(date(2024, 1, 6), date(2024, 1, 9)) == []
+
+
+def test_weekends_inside_a_fetched_range_are_not_gaps():
+    """Coverage follows the requested dates, not the bars returned"""
+    segments = merged((date(2024, 1, 1), date(2024, 1, 14)))
+
+    assert segments.missing_ranges(date(2024, 1, 6), date(2024, 1, 7)) == []
+    assert segments.slice(date(2024, 1, 6), date(2024, 1, 7)) == []
+
+
+def test_slice_stitches_segments_in_order():
+    segments = merged((date(2024, 1, 15), date(2024, 1, 19)), (date(2024, 1, 8), date(2024, 1, 12)))
+
+    days = [bar.timestamp.day for bar in segments.slice(date(2024, 1, 10), date(2024, 1, 16))]
+
+    assert days == [10, 11, 12, 15, 16]
+
+
+def test_merge_replaces_overlap_and_keeps_the_rest():
+    segments = merged((date(2024, 1, 1), date(2024, 1, 31)))
+    segments.merge(
+        date(2024, 1, 10), date(2024, 1, 12),
+        bars_for(date(2024, 1, 10), date(2024, 1, 12), '2'),
+        time.time() + 60, 'alpha_vantage'
+    )
+
+    closes = {bar.timestamp.day: bar.close_price for bar in segments.slice(date(2024, 1, 9), date(2024, 1, 15))}
+
+    assert closes == {9: Decimal('1'), 10: Decimal('2'), 11: Decimal('2'), 12: Decimal('2'), 15: Decimal('1')}
+    assert [(s.start.day, s.end.day) for s in segments.segments] == [(1, 9), (10, 12), (13, 31)]
+    assert segments.missing_ranges(date(2024, 1, 1), date(2024, 1, 31)) == []
+
+
+def test_adjacent_settled_segments_from_one_source_coalesce():
+    segments = merged((date(2024, 1, 1), date(2024, 1, 10)), (date(2024, 1, 11), date(2024, 1, 20)))
+
+    assert len(segments.segments) == 1
+    assert segments.bar_count() == len(bars_for(date(2024, 1, 1), date(2024, 1, 20)))
+
+
+def test_prune_drops_expired_segments():
+    segments = BarSegmentSet()
+    segments.merge(date(2024, 1, 1), date(2024, 1, 5), bars_for(date(2024, 1, 1), date(2024, 1, 5)), time.time() - 1)
+    segments.merge(date(2024, 1, 8), date(2024, 1, 12), bars_for(date(2024, 1, 8), date(2024, 1, 12)), time.time() + 60)
+
+    segments.prune()
+
+    assert segments.missing_ranges(date(2024, 1, 1), date(2024, 1, 12)) == [(date(2024, 1, 1), date(2024, 1, 7))]
+
+
+def test_segments_round_trip_through_dict():
+    segments = merged((date(2024, 1, 1), date(2024, 1, 10)))
+
+    restored = BarSegmentSet.from_dict(segments.to_dict())
+
+    assert restored.slice(date(2024, 1, 1), date(2024, 1, 10)) == segments.slice(date(2024, 1, 1), date(2024, 1, 10))
+    assert restored.sources(date(2024, 1, 1), date(2024, 1, 10)) == ['polygon']
@@ -0,0 +1,94 @@
+"""
+Tests for the Redis cache codecs
+Covers msgpack round-trips, compression headers and codec selection
+"""
+
+from datetime import datetime, date
+from decimal import Decimal
+
+import pytest
+
+from data.codecs import JsonCodec, MsgpackCodec, create_codec
+from data.models import MARKET_TIMEZONE, Quote
+
+pytest.importorskip('msgpack')
+
+
+def test_msgpack_round_trips_typed_values():
+    """Decimals, datetimes and dates decode back to their own types"""
+    codec = MsgpackCodec()
+    value = {
+        'price': Decimal('412.37'),
+        'aware': datetime(2024, 3, 13, 16, 0, tzinfo=MARKET_TIMEZONE),
+        'naive': datetime(2024, 3, 13, 16, 0, 0, 123456),
+        'day': date(2024, 3, 13),
+        'nested': [{'strike': Decimal('400')}, None, 1.5, 'text'],
+        7: 'int key'
+    }
+
+    decoded = codec.decode(codec.encode(value))
+
+    assert decoded == value
+    assert isinstance(decoded['price'], Decimal)
+    assert decoded['aware'].utcoffset() == value['aware'].utcoffset()
+    assert type(decoded['day']) is date
+
+
+def test_msgpack_round_trips_a_model_dump():
+    codec = MsgpackCodec()
+    quote = Quote(
+        symbol='SPY',
+        bid=Decimal('1.10'),
+        ask=Decimal('1.20'),
+        volume=100,
+        timestamp=datetime(2024, 3, 13, 11, 0),
+        source='polygon'
+    )
+
+    assert Quote.model_validate(codec.decode(codec.encode(quote.model_dump()))) == quote
+
+
+def test_small_payloads_are_not_compressed():
+    codec = MsgpackCodec(compression='zstd', compression_min_bytes=1024)
+
+    encoded = codec.encode({'symbol': 'SPY'})
+
+    assert encoded[:1] == MsgpackCodec.RAW
+    assert codec.decode(encoded) == {'symbol': 'SPY'}
+
+
+def test_large_payloads_are_compressed_with_header():
+    pytest.importorskip('zstandard')
+    codec = MsgpackCodec(compression='zstd', compression_min_bytes=64)
+    value = {'bars': [{'close': Decimal('412.37'), 'volume': 1000} for _ in range(200)]}
+
+    encoded = codec.encode(value)
+
+    assert encoded[:1] == MsgpackCodec.ZSTD
+    assert len(encoded) < len(MsgpackCodec().encode(value))
+    assert codec.decode(encoded) == value
+
+
+def test_compressed_entries_decode_with_any_msgpack_codec():
+    """The header byte, not the reader's settings, decides decompression"""
+    pytest.importorskip('zstandard')
+    value = {'text': 'x' * 2048}
+
+    assert MsgpackCodec().decode(MsgpackCodec(compression='zstd').encode(value)) == value
+
+
+def test_unsupported_types_are_rejected():
+    with pytest.raises(TypeError):
+        MsgpackCodec().encode({'value': object()})
+
+
+def test_codec_key_prefix_carries_format():
+    assert JsonCodec().key_prefix == 'json:v1'
+    assert MsgpackCodec().key_prefix == 'msgpack:v1'
+
+
+def test_create_codec_from_config():
+    assert isinstance(create_codec({}), JsonCodec)
+    assert isinstance(create_codec({'format': 'msgpack'}), MsgpackCodec)
+    with pytest.raises(ValueError):
+        create_codec({'format': 'pickle'})
@@ -0,0 +1,305 @@
+"""
+Tests for the data layer concurrency primitives
+Covers request coalescing (SingleFlight), concurrency limits (MeteredSemaphore,
+ConcurrencyLimiter) and request priority lanes
+"""
+
+import asyncio
+
+import pytest
+
+from data.concurrency import (
+    ConcurrencyLimiter, MeteredSemaphore, SingleFlight, current_request_priority, request_priority
+)
+from data.models import RequestPriority
+
+
+@pytest.mark.asyncio
+async def test_single_flight_coalesces_concurrent_calls():
+    """Concurrent callers with the same key share one call"""
+    flight = SingleFlight()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return 'result'
+
+    results = await asyncio.gather(*[flight.do('key', fetch) for _ in range(5)])
+
+    assert results == ['result'] * 5
+    assert calls == 1
+    assert flight.get_stats() == {'leaders': 1, 'coalesced': 4, 'in_flight': 0}
+
+
+@pytest.mark.asyncio
+async def test_single_flight_runs_distinct_keys_separately():
+    """Different keys don't coalesce"""
+    flight = SingleFlight()
+
+    async def fetch(value):
+        await asyncio.sleep(0.01)
+        return value
+
+    results = await asyncio.gather(flight.do('a', lambda: fetch(1)), flight.do('b', lambda: fetch(2)))
+
+    assert results == [1, 2]
+    assert flight.stats['leaders'] == 2
+
+
+@pytest.mark.asyncio
+async def test_single_flight_releases_key_when_done():
+    """A later call for a finished key runs again"""
+    flight = SingleFlight()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        return calls
+
+    assert await flight.do('key', fetch) == 1
+    assert 'key' not in flight
+    assert await flight.do('key', fetch) == 2
+
+
+@pytest.mark.asyncio
+async def test_single_flight_shares_exceptions():
+    """Every waiter sees the leader's exception, and the key is released"""
+    flight = SingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.01)
+        raise ValueError("upstream failed")
+
+    results = await asyncio.gather(*[flight.do('key', fetch) for _ in range(3)], return_exceptions=True)
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert flight.in_flight() == 0
+
+
+@pytest.mark.asyncio
+async def test_single_flight_cancelled_waiter_keeps_shared_call():
+    """Cancelling one waiter doesn't cancel the call the others wait on"""
+    flight = SingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.05)
+        return 'result'
+
+    first = asyncio.ensure_future(flight.do('key', fetch))
+    second = asyncio.ensure_future(flight.do('key', fetch))
+    await asyncio.sleep(0.01)
+    first.cancel()
+
+    assert await second == 'result'
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+
+# Concurrency limits
+
+async def run_holding(slots: MeteredSemaphore, active: list, peak: list, **kwargs):
+    async with slots.hold(**kwargs):
+        active.append(1)
+        peak.append(len(active))
+        await asyncio.sleep(0.01)
+        active.pop()
+
+
+@pytest.mark.asyncio
+async def test_semaphore_bounds_in_flight_requests():
+    slots = MeteredSemaphore(2)
+    active, peak = [], []
+
+    await asyncio.gather(*[run_holding(slots, active, peak) for _ in range(6)])
+
+    assert max(peak) == 2
+    stats = slots.get_stats()
+    assert stats['acquired'] == 6
+    assert stats['queued'] == 4
+    assert stats['max_queue_depth'] == 4
+    assert stats['in_flight'] == 0 and stats['queue_depth'] == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_leaves_the_queue():
+    slots = MeteredSemaphore(1)
+    release = asyncio.Event()
+
+    async def holder():
+        async with slots.hold():
+            await release.wait()
+
+    held = asyncio.ensure_future(holder())
+    await asyncio.sleep(0)
+    waiter = asyncio.ensure_future(run_holding(slots, [], []))
+    await asyncio.sleep(0)
+    assert slots.waiting == 1
+
+    waiter.cancel()
+    await asyncio.gather(waiter, return_exceptions=True)
+    assert slots.waiting == 0
+
+    release.set()
+    await held
+    assert not slots.locked()
+
+
+@pytest.mark.asyncio
+async def test_slot_handed_over_during_cancellation_is_passed_on():
+    """A waiter cancelled just after being handed a slot doesn't leak it"""
+    slots = MeteredSemaphore(1)
+
+    async with slots.hold():
+        first = asyncio.ensure_future(run_holding(slots, [], []))
+        second = asyncio.ensure_future(run_holding(slots, [], []))
+        await asyncio.sleep(0)
+    first.cancel()
+
+    await asyncio.wait_for(second, 0.5)
+    assert not slots.locked()
+
+
+@pytest.mark.asyncio
+async def test_limiter_bounds_per_key_and_globally():
+    limiter = ConcurrencyLimiter(3, default_per_key=2, per_key_limits={'schwab': 1})
+    active = {'polygon': 0, 'schwab': 0}
+    peak = {'global': 0, 'polygon': 0, 'schwab': 0}
+
+    async def request(key: str):
+        async with limiter.slot(key):
+            active[key] += 1
+            peak[key] = max(peak[key], active[key])
+            peak['global'] = max(peak['global'], sum(active.values()))
+            await asyncio.sleep(0.01)
+            active[key] -= 1
+
+    await asyncio.gather(*[request(key) for key in ['polygon', 'schwab'] * 4])
+
+    assert peak == {'global': 3, 'polygon': 2, 'schwab': 1}
+    assert limiter.get_stats()['per_provider']['schwab']['max_queue_depth'] == 3
+
+
+@pytest.mark.asyncio
+async def test_request_queued_on_busy_key_does_not_hold_a_global_slot():
+    limiter = ConcurrencyLimiter(2, default_per_key=1)
+    release = asyncio.Event()
+
+    async def hold(key: str):
+        async with limiter.slot(key):
+            await release.wait()
+
+    busy = [asyncio.ensure_future(hold('polygon')), asyncio.ensure_future(hold('polygon'))]
+    await asyncio.sleep(0)
+
+    assert limiter.queue_depth('polygon') == 1
+    async with limiter.slot('schwab'):
+        assert limiter.global_slots.in_flight == 2
+
+    release.set()
+    await asyncio.gather(*busy)
+
+
+# Priority lanes
+
+async def queue_behind(limiter: ConcurrencyLimiter, requests: list):
+    """Hold the only slot, queue requests as (name, priority, call) in order, then release"""
+    async def hold():
+        async with limiter.slot('polygon'):
+            await release.wait()
+
+    async def request(name, priority, call):
+        current_request_priority.set(priority)
+        await call(name)
+
+    release = asyncio.Event()
+    tasks = [asyncio.ensure_future(hold())]
+    await asyncio.sleep(0)
+    for name, priority, call in requests:
+        tasks.append(asyncio.ensure_future(request(name, priority, call)))
+        await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(*tasks)
+
+
+@pytest.mark.asyncio
+async def test_slots_are_served_by_priority_then_fifo():
+    limiter = ConcurrencyLimiter(1)
+    served = []
+
+    async def call(name):
+        async with limiter.slot('polygon'):
+            served.append(name)
+
+    await queue_behind(limiter, [
+        ('low', RequestPriority.LOW, call),
+        ('normal-1', RequestPriority.NORMAL, call),
+        ('critical', RequestPriority.CRITICAL, call),
+        ('normal-2', RequestPriority.NORMAL, call)
+    ])
+
+    assert served == ['critical', 'normal-1', 'normal-2', 'low']
+
+
+@pytest.mark.asyncio
+async def test_explicit_slot_priority_overrides_the_context():
+    limiter = ConcurrencyLimiter(1)
+    served = []
+
+    async def call(name):
+        async with limiter.slot('polygon', RequestPriority.HIGH if name == 'escalated' else None):
+            served.append(name)
+
+    await queue_behind(limiter, [
+        ('normal', RequestPriority.NORMAL, call),
+        ('escalated', RequestPriority.LOW, call)
+    ])
+
+    assert served == ['escalated', 'normal']
+
+
+@pytest.mark.asyncio
+async def test_urgent_joiner_raises_the_shared_call_priority():
+    """A LOW call joined by a CRITICAL caller overtakes queued NORMAL work"""
+    limiter = ConcurrencyLimiter(1)
+    flight = SingleFlight()
+    served = []
+
+    async def call(name):
+        async def fetch():
+            async with limiter.slot('polygon'):
+                served.append(name)
+        await flight.do(name, fetch)
+
+    await queue_behind(limiter, [
+        ('normal', RequestPriority.NORMAL, call),
+        ('shared', RequestPriority.LOW, call),
+        ('shared', RequestPriority.CRITICAL, call)
+    ])
+
+    assert served == ['shared', 'normal']
+
+
+@pytest.mark.asyncio
+async def test_shared_call_priority_does_not_leak_to_callers():
+    flight = SingleFlight()
+    seen = []
+
+    async def fetch():
+        await asyncio.sleep(0.01)
+        seen.append(request_priority())
+
+    async def caller(priority):
+        current_request_priority.set(priority)
+        await flight.do('key', fetch)
+        return request_priority()
+
+    leader = asyncio.ensure_future(caller(RequestPriority.LOW))
+    await asyncio.sleep(0)
+    joiner = asyncio.ensure_future(caller(RequestPriority.HIGH))
+
+    assert await asyncio.gather(leader, joiner) == [RequestPriority.LOW, RequestPriority.HIGH]
+    assert seen == [RequestPriority.HIGH]
+    assert request_priority() == RequestPriority.NORMAL
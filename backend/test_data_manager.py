@@ -0,0 +1,804 @@
+"""
+Tests for DataManager caching and routing
+Runs against in-process fake providers and fakeredis, without network access
+"""
+
+import asyncio
+import json
+import os
+import time
+from collections import Counter
+from datetime import datetime, date, timedelta
+from decimal import Decimal
+
+import fakeredis
+import fakeredis.aioredis
+import pytest
+
+from data.concurrency import request_priority
+from data.manager import DataManager
+from data.models import (
+    MARKET_TIMEZONE, BarSeries, DataResponse, HistoricalBar, OptionContract, OptionsChain, OptionType, Quote, RequestPriority
+)
+from data.providers.base import BaseDataProvider, MarketDataProvider, RateLimiter
+from data.providers.streaming import PolygonStreamingProvider
+
+
+EXPIRATION = date(2030, 1, 18)
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config', 'data_config.json')
+
+# Breakers open on the first failure
+TRIP_AT_ONCE = {'circuit_breaker_failure_threshold': 1, 'circuit_breaker_timeout_seconds': 60}
+
+# Hedge after 20ms while providers have no latency samples
+FAST_HEDGING = {'enabled': True, 'default_delay_ms': 20, 'min_delay_ms': 10, 'max_delay_ms': 100, 'min_budget_remaining': 0.3}
+
+# Quotes go stale immediately but stay in the cache for 30s
+STALE_QUOTE_POLICIES = {
+    'quotes': {'ttl_seconds': 30, 'max_age_trading_hours': 0, 'max_age_after_hours': 0}
+}
+
+
+class FakeProvider(MarketDataProvider):
+    """Market data provider serving canned data and recording the calls it gets"""
+
+    def __init__(self, name: str = 'fake', delay: float = 0.0, fail: bool = False, config=None):
+        super().__init__(name, config or {})
+        self.delay = delay
+        self.fail = fail
+        self.price = Decimal('1.5')
+        self.failing_ranges = set()
+        self.failing_symbols = set()
+        self.calls = []
+        self.last_series = None
+        self.is_connected = True
+
+    async def connect(self) -> bool:
+        return True
+
+    async def disconnect(self) -> bool:
+        return True
+
+    async def test_connection(self) -> bool:
+        return True
+
+    async def get_quote(self, symbol: str) -> DataResponse:
+        self.calls.append(('quote', symbol))
+        await self._check_rate_limit()
+        self._track_request()
+        await asyncio.sleep(self.delay)
+        return self._quote_response(symbol)
+
+    async def get_quotes(self, symbols):
+        """Batch endpoint: one upstream request, symbols in failing_symbols left out"""
+        self.calls.append(('quotes', tuple(symbols)))
+        self._track_request()
+        await asyncio.sleep(self.delay)
+        return {symbol: self._quote_response(symbol) for symbol in symbols if symbol not in self.failing_symbols}
+
+    def _quote_response(self, symbol: str) -> DataResponse:
+        if self.fail or symbol in self.failing_symbols:
+            return DataResponse(success=False, error=f"{self.provider_name} failed", timestamp=datetime.now())
+        quote = Quote(symbol=symbol, last=self.price, timestamp=datetime.now(), source=self.provider_name)
+        return DataResponse(success=True, data=quote, source=self.provider_name, timestamp=datetime.now())
+
+    async def get_options_chain(self, underlying, expiration=None, strike_range=None) -> DataResponse:
+        self.calls.append(('options_chain', underlying, strike_range))
+        self._track_request()
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            return DataResponse(success=False, error=f"{self.provider_name} failed", timestamp=datetime.now())
+
+        expiration = expiration or EXPIRATION
+        low, high = strike_range or (50, 150)
+        contracts = [
+            OptionContract(
+                symbol=f"{underlying}{expiration:%y%m%d}C{strike:05d}",
+                underlying_symbol=underlying,
+                option_type=OptionType.CALL,
+                strike_price=Decimal(strike),
+                expiration_date=expiration,
+                timestamp=datetime.now(),
+                source=self.provider_name
+            )
+            for strike in range(int(low), int(high) + 1, 5)
+        ]
+        chain = OptionsChain(
+            underlying_symbol=underlying,
+            expirations={expiration.isoformat(): contracts},
+            total_contracts=len(contracts),
+            timestamp=datetime.now(),
+            source=self.provider_name
+        )
+        return DataResponse(success=True, data=chain, source=self.provider_name, timestamp=datetime.now())
+
+    async def get_historical_data(self, symbol, start_date, end_date, interval='1d') -> DataResponse:
+        self.calls.append(('historical', symbol, start_date, end_date))
+        self._track_request()
+        await asyncio.sleep(self.delay)
+        if self.fail or (start_date, end_date) in self.failing_ranges:
+            return DataResponse(success=False, error=f"{self.provider_name} failed", timestamp=datetime.now())
+
+        bars = []
+        day = start_date
+        while day <= end_date:
+            if day.weekday() < 5:
+                bars.append(HistoricalBar(
+                    symbol=symbol,
+                    timestamp=datetime(day.year, day.month, day.day, 16, tzinfo=MARKET_TIMEZONE),
+                    open_price=self.price,
+                    high=self.price,
+                    low=self.price,
+                    close_price=self.price,
+                    volume=100
+                ))
+            day += timedelta(days=1)
+        return DataResponse(success=True, data=bars, source=self.provider_name, timestamp=datetime.now())
+
+    async def get_bar_series(self, symbol, start_date, end_date, interval='1d') -> DataResponse:
+        """Columnar endpoint: the default conversion, recorded so tests can see which path ran"""
+        self.calls.append(('bar_series', symbol, start_date, end_date))
+        response = await super().get_bar_series(symbol, start_date, end_date, interval)
+        self.last_series = response.data
+        return response
+
+
+def make_manager(*providers: FakeProvider, **config) -> DataManager:
+    """DataManager routing to providers (the first is the default) with its own fake Redis"""
+    with open(CONFIG_PATH) as f:
+        manager_config = json.load(f)
+    manager_config['providers'] = {}
+    manager_config.update(config)
+
+    manager = DataManager(manager_config)
+    for provider in providers:
+        manager.providers[provider.provider_name] = provider
+        manager.market_data_providers[provider.provider_name] = provider
+    manager.default_market_data_provider = providers[0].provider_name
+    manager.redis_client = fakeredis.aioredis.FakeRedis(server=fakeredis.FakeServer())
+    return manager
+
+
+async def wait_for_revalidations(manager: DataManager):
+    await asyncio.gather(*list(manager._revalidations.values()))
+
+
+class CountingPipeline:
+    """Redis pipeline wrapper counting queued commands as 'pipeline.<command>'"""
+
+    def __init__(self, pipeline, calls: Counter):
+        self._pipeline = pipeline
+        self._calls = calls
+
+    async def __aenter__(self):
+        await self._pipeline.__aenter__()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return await self._pipeline.__aexit__(*exc_info)
+
+    def __getattr__(self, name):
+        attr = getattr(self._pipeline, name)
+        if name == 'execute' or not callable(attr):
+            return attr
+
+        def queue(*args, **kwargs):
+            self._calls[f'pipeline.{name}'] += 1
+            return attr(*args, **kwargs)
+        return queue
+
+
+class CountingRedis:
+    """Redis client wrapper counting direct commands and pipelines"""
+
+    def __init__(self, client):
+        self._client = client
+        self.calls = Counter()
+
+    def pipeline(self, *args, **kwargs) -> CountingPipeline:
+        self.calls['pipeline'] += 1
+        return CountingPipeline(self._client.pipeline(*args, **kwargs), self.calls)
+
+    def __getattr__(self, name):
+        attr = getattr(self._client, name)
+        if not callable(attr):
+            return attr
+
+        def command(*args, **kwargs):
+            self.calls[name] += 1
+            return attr(*args, **kwargs)
+        return command
+
+
+# Stale-while-revalidate
+
+@pytest.mark.asyncio
+async def test_stale_quote_is_served_while_revalidating():
+    """A stale entry is returned at once and refreshed in the background"""
+    provider = FakeProvider()
+    manager = make_manager(provider, cache_policies=STALE_QUOTE_POLICIES)
+
+    first = await manager.get_quote('TEST')
+    provider.price = Decimal('2.5')
+    second = await manager.get_quote('TEST')
+
+    assert not first.cached
+    assert second.cached and second.data.last == Decimal('1.5')
+    assert manager.request_stats['stale_cache_hits'] == 1
+
+    await wait_for_revalidations(manager)
+    assert len(provider.calls) == 2
+
+    refreshed = await manager.get_quote('TEST')
+    assert refreshed.cached and refreshed.data.last == Decimal('2.5')
+    await wait_for_revalidations(manager)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_stale_reads_revalidate_once():
+    """Only one background refresh runs per stale entry"""
+    provider = FakeProvider(delay=0.02)
+    manager = make_manager(provider, cache_policies=STALE_QUOTE_POLICIES)
+    await manager.get_quote('TEST')
+
+    responses = await asyncio.gather(*[manager.get_quote('TEST') for _ in range(5)])
+    await wait_for_revalidations(manager)
+
+    assert all(response.cached for response in responses)
+    assert len(provider.calls) == 2
+    assert manager.request_stats['background_revalidations'] == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_quote_is_refetched_without_swr():
+    """With stale_while_revalidate off, a stale entry is fetched inline"""
+    provider = FakeProvider()
+    manager = make_manager(provider, cache_policies=STALE_QUOTE_POLICIES, stale_while_revalidate=False)
+
+    await manager.get_quote('TEST')
+    provider.price = Decimal('2.5')
+    second = await manager.get_quote('TEST')
+
+    assert not second.cached and second.data.last == Decimal('2.5')
+    assert len(provider.calls) == 2
+
+
+# In-process L1 cache
+
+@pytest.mark.asyncio
+async def test_redis_hit_is_promoted_to_l1():
+    """A second worker reads Redis once, then serves the entry from its own L1"""
+    writer = make_manager(FakeProvider())
+    await writer.get_quote('AAA')
+    provider = FakeProvider()
+    reader = make_manager(provider)
+    reader.redis_client = CountingRedis(writer.redis_client)
+
+    first = await reader.get_quote('AAA')
+    second = await reader.get_quote('AAA')
+
+    assert first.cached and second.cached
+    assert provider.calls == []
+    assert reader.redis_client.calls['pipeline.get'] == 1
+    assert reader.request_stats['redis_cache_hits'] == 1
+    assert reader.request_stats['local_cache_hits'] == 1
+
+
+@pytest.mark.asyncio
+async def test_l1_serves_the_built_model():
+    """L1 hits hand back the stored Quote object instead of re-parsing it"""
+    manager = make_manager(FakeProvider())
+    manager.redis_client = None
+
+    first = await manager.get_quote('AAA')
+    second = await manager.get_quote('AAA')
+    third = await manager.get_quote('AAA')
+
+    assert second.cached and second.data is first.data and third.data is first.data
+
+
+@pytest.mark.asyncio
+async def test_l1_counters_are_in_manager_stats():
+    manager = make_manager(FakeProvider(), local_cache={'quotes': {'max_entries': 1}})
+
+    await manager.get_quote('AAA')
+    await manager.get_quote('AAA')
+    await manager.get_quote('BBB')
+
+    stats = manager.get_stats()['local_cache']['quotes']
+    assert (stats['hits'], stats['evictions'], stats['size'], stats['max_entries']) == (1, 1, 1, 1)
+
+
+# Range-merging historical bar cache
+
+@pytest.mark.asyncio
+async def test_historical_request_fetches_only_missing_gaps():
+    provider = FakeProvider()
+    manager = make_manager(provider)
+
+    await manager.get_historical_data('TEST', date(2024, 1, 8), date(2024, 1, 12))
+    response = await manager.get_historical_data('TEST', date(2024, 1, 1), date(2024, 1, 19))
+
+    assert provider.calls[1:] == [
+        ('historical', 'TEST', date(2024, 1, 1), date(2024, 1, 7)),
+        ('historical', 'TEST', date(2024, 1, 13), date(2024, 1, 19))
+    ]
+    assert [bar.timestamp.day for bar in response.data] == [1, 2, 3, 4, 5, 8, 9, 10, 11, 12, 15, 16, 17, 18, 19]
+
+    cached = await manager.get_historical_data('TEST', date(2024, 1, 3), date(2024, 1, 16))
+    assert cached.cached and len(provider.calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_failed_gap_keeps_the_gaps_that_arrived():
+    provider = FakeProvider()
+    manager = make_manager(provider)
+    await manager.get_historical_data('TEST', date(2024, 1, 8), date(2024, 1, 12))
+    provider.failing_ranges.add((date(2024, 1, 1), date(2024, 1, 7)))
+
+    response = await manager.get_historical_data('TEST', date(2024, 1, 1), date(2024, 1, 19))
+    assert not response.success
+
+    provider.failing_ranges.clear()
+    del provider.calls[:]
+    response = await manager.get_historical_data('TEST', date(2024, 1, 1), date(2024, 1, 19))
+
+    assert response.success
+    assert provider.calls == [('historical', 'TEST', date(2024, 1, 1), date(2024, 1, 7))]
+
+
+# Options chain cache slicing
+
+def strikes(response: DataResponse) -> list:
+    return sorted({int(contract.strike_price) for contract in response.data.expirations[EXPIRATION.isoformat()]})
+
+
+@pytest.mark.asyncio
+async def test_narrower_strike_range_is_sliced_from_cached_chain():
+    provider = FakeProvider()
+    manager = make_manager(provider)
+
+    await manager.get_options_chain('TEST', EXPIRATION, (50, 150))
+    response = await manager.get_options_chain('TEST', EXPIRATION, (90, 110))
+
+    assert response.cached
+    assert strikes(response) == [90, 95, 100, 105, 110]
+    assert response.data.total_contracts == 5
+    assert provider.calls == [('options_chain', 'TEST', (50, 150))]
+
+
+@pytest.mark.asyncio
+async def test_uncovered_strike_range_fetches_the_hull():
+    """A miss widens the cached chain rather than replacing it"""
+    provider = FakeProvider()
+    manager = make_manager(provider)
+
+    await manager.get_options_chain('TEST', EXPIRATION, (90, 110))
+    response = await manager.get_options_chain('TEST', EXPIRATION, (120, 130))
+
+    assert strikes(response) == [120, 125, 130]
+    assert provider.calls[-1] == ('options_chain', 'TEST', (90, 130))
+
+    cached = await manager.get_options_chain('TEST', EXPIRATION, (95, 125))
+    assert cached.cached and len(provider.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_chain_misses_only_widen_the_cached_range():
+    provider = FakeProvider(delay=0.01)
+    manager = make_manager(provider)
+
+    await asyncio.gather(
+        manager.get_options_chain('TEST', EXPIRATION, (90, 110)),
+        manager.get_options_chain('TEST', EXPIRATION, (120, 130)),
+        manager.get_options_chain('TEST', EXPIRATION, (60, 70))
+    )
+
+    _, covered = await manager._get_cached_options_chain('TEST', EXPIRATION)
+    assert covered == (60, 130)
+
+
+def test_strike_range_coverage_and_hull():
+    """None means all strikes"""
+    assert DataManager._strike_range_covers(None, (90, 110))
+    assert DataManager._strike_range_covers((80, 120), (90, 110))
+    assert not DataManager._strike_range_covers((80, 120), None)
+    assert not DataManager._strike_range_covers((95, 120), (90, 110))
+
+    assert DataManager._strike_range_hull((90, 110), (100, 130)) == (90, 130)
+    assert DataManager._strike_range_hull(None, (100, 130)) is None
+
+
+# Batch quotes
+
+@pytest.mark.asyncio
+async def test_quote_batch_is_one_provider_request():
+    provider = FakeProvider()
+    manager = make_manager(provider)
+
+    responses = await manager.get_quotes(['AAA', 'BBB', 'CCC'])
+
+    assert all(response.success for response in responses.values())
+    assert provider.calls == [('quotes', ('AAA', 'BBB', 'CCC'))]
+
+
+@pytest.mark.asyncio
+async def test_quote_batch_skips_cached_symbols():
+    provider = FakeProvider()
+    manager = make_manager(provider)
+    await manager.get_quote('AAA')
+
+    responses = await manager.get_quotes(['AAA', 'BBB'])
+
+    assert responses['AAA'].cached and not responses['BBB'].cached
+    assert provider.calls[-1] == ('quotes', ('BBB',))
+
+
+@pytest.mark.asyncio
+async def test_symbols_missing_from_a_batch_fail_over_individually():
+    primary = FakeProvider('primary')
+    backup = FakeProvider('backup')
+    primary.failing_symbols.add('BBB')
+    manager = make_manager(primary, backup)
+
+    responses = await manager.get_quotes(['AAA', 'BBB'])
+
+    assert responses['AAA'].source == 'primary'
+    assert responses['BBB'].success and responses['BBB'].source == 'backup'
+    assert backup.calls == [('quote', 'BBB')]
+
+
+@pytest.mark.asyncio
+async def test_batch_and_single_quotes_share_upstream_calls():
+    provider = FakeProvider(delay=0.02)
+    manager = make_manager(provider)
+
+    single, batch = await asyncio.gather(manager.get_quote('AAA'), manager.get_quotes(['AAA', 'BBB']))
+
+    assert single.success and batch['AAA'].success and batch['BBB'].success
+    assert sorted(provider.calls) == [('quote', 'AAA'), ('quotes', ('BBB',))]
+
+
+@pytest.mark.asyncio
+async def test_default_get_quotes_bounds_concurrency():
+    """Providers without a batch endpoint fan out at most max_concurrent_requests at a time"""
+    provider = FakeProvider(delay=0.01, config={'max_concurrent_requests': 2})
+    in_flight = peak = 0
+    get_quote = provider.get_quote
+
+    async def counting_get_quote(symbol):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        try:
+            return await get_quote(symbol)
+        finally:
+            in_flight -= 1
+
+    provider.get_quote = counting_get_quote
+    responses = await BaseDataProvider.get_quotes(provider, ['A', 'B', 'C', 'D', 'E'])
+
+    assert list(responses) == ['A', 'B', 'C', 'D', 'E']
+    assert peak == 2
+
+
+# Circuit breakers
+
+@pytest.mark.asyncio
+async def test_open_breaker_routes_around_provider():
+    primary = FakeProvider('primary', fail=True)
+    backup = FakeProvider('backup')
+    manager = make_manager(primary, backup, performance=TRIP_AT_ONCE)
+
+    first = await manager.get_quote('AAA')
+    second = await manager.get_quote('BBB')
+
+    assert first.source == 'backup' and second.source == 'backup'
+    assert primary.calls == [('quote', 'AAA')]
+    assert manager.circuit_breakers.get('primary', 'quotes').state == 'open'
+
+
+@pytest.mark.asyncio
+async def test_half_open_trial_covers_the_whole_batch():
+    """The breaker is asked once per batch, so the trial isn't spent on the first symbol"""
+    primary = FakeProvider('primary')
+    backup = FakeProvider('backup')
+    manager = make_manager(primary, backup, performance=TRIP_AT_ONCE)
+    breaker = manager.circuit_breakers.get('primary', 'quotes')
+    breaker.record_failure()
+    breaker.opened_at = time.monotonic() - 60
+
+    responses = await manager.get_quotes(['AAA', 'BBB', 'CCC'])
+
+    assert {response.source for response in responses.values()} == {'primary'}
+    assert primary.calls == [('quotes', ('AAA', 'BBB', 'CCC'))]
+    assert backup.calls == []
+    assert breaker.state == 'closed'
+
+
+# Failover
+
+@pytest.mark.asyncio
+async def test_failed_provider_fails_over_to_backup():
+    primary = FakeProvider('primary', fail=True)
+    backup = FakeProvider('backup')
+    manager = make_manager(primary, backup)
+
+    response = await manager.get_quote('AAA')
+
+    assert response.success and response.source == 'backup'
+    assert manager.request_stats['failovers'] == 1
+
+
+@pytest.mark.asyncio
+async def test_slow_provider_times_out_within_failover_budget():
+    primary = FakeProvider('primary', delay=1)
+    manager = make_manager(primary, routing={'failover_budget_seconds': 0.05})
+
+    started = time.monotonic()
+    response = await manager.get_quote('AAA')
+
+    assert not response.success
+    assert time.monotonic() - started < 0.5
+
+
+def test_failover_budget_per_data_type():
+    manager = make_manager(FakeProvider(), routing={'failover_budget_seconds': {'default': 15, 'options_chains': 60}})
+
+    assert manager._failover_budget('options_chains') == 60
+    assert manager._failover_budget('quotes') == 15
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_wait_is_not_charged_to_the_budget():
+    """Queueing for our own rate limiter neither times the call out nor counts as a failure"""
+    primary = FakeProvider('primary')
+    primary.rate_limiter = RateLimiter('primary', per_minute=600)
+    manager = make_manager(primary, routing={'failover_budget_seconds': 0.05})
+
+    first = await manager.get_quote('AAA')
+    second = await manager.get_quote('BBB')
+
+    assert first.success and second.success
+    assert manager.circuit_breakers.get('primary', 'quotes').consecutive_failures == 0
+
+
+# Hedged requests
+
+@pytest.mark.asyncio
+async def test_slow_primary_is_hedged_to_backup():
+    primary = FakeProvider('primary', delay=1)
+    backup = FakeProvider('backup')
+    manager = make_manager(primary, backup, hedging=FAST_HEDGING)
+
+    started = time.monotonic()
+    response = await manager.get_quote('AAA')
+
+    assert response.source == 'backup'
+    assert time.monotonic() - started < 0.5
+    assert manager.request_stats['hedged_requests'] == 1
+    assert manager.request_stats['hedge_wins'] == 1
+
+
+@pytest.mark.asyncio
+async def test_fast_primary_is_not_hedged():
+    primary = FakeProvider('primary')
+    backup = FakeProvider('backup')
+    manager = make_manager(primary, backup, hedging=FAST_HEDGING)
+
+    response = await manager.get_quote('AAA')
+
+    assert response.source == 'primary'
+    assert backup.calls == []
+    assert manager.request_stats['hedged_requests'] == 0
+
+
+@pytest.mark.asyncio
+async def test_hedging_is_per_request():
+    primary = FakeProvider('primary', delay=0.1)
+    backup = FakeProvider('backup')
+    manager = make_manager(primary, backup, hedging=FAST_HEDGING)
+
+    response = await manager.get_quote('AAA', hedged=False)
+
+    assert response.source == 'primary'
+    assert backup.calls == []
+
+
+@pytest.mark.asyncio
+async def test_failed_hedge_pair_continues_down_the_chain():
+    primary = FakeProvider('primary', delay=0.05, fail=True)
+    backup = FakeProvider('backup', fail=True)
+    last_resort = FakeProvider('last_resort')
+    manager = make_manager(primary, backup, last_resort, hedging=FAST_HEDGING)
+
+    response = await manager.get_quote('AAA')
+
+    assert response.source == 'last_resort'
+    assert primary.calls == backup.calls == [('quote', 'AAA')]
+
+
+@pytest.mark.asyncio
+async def test_no_hedge_to_provider_low_on_budget():
+    primary = FakeProvider('primary', delay=0.1)
+    backup = FakeProvider('backup')
+    backup.rate_limit = 10
+    manager = make_manager(primary, backup, hedging=FAST_HEDGING)
+    manager.provider_scoreboard.record('backup', 'quotes', 0.01, True, requests=9)
+
+    response = await manager.get_quote('AAA')
+
+    assert response.source == 'primary'
+    assert backup.calls == []
+
+
+# Priority lanes
+
+@pytest.mark.asyncio
+async def test_low_priority_request_is_shed_when_budget_runs_low():
+    primary = FakeProvider('primary')
+    primary.rate_limit = 10
+    manager = make_manager(primary)
+    manager.provider_scoreboard.record('primary', 'quotes', 0.01, True, requests=8)
+
+    shed = await manager.get_quote('AAA', priority=RequestPriority.LOW)
+    served = await manager.get_quote('AAA', priority=RequestPriority.NORMAL)
+
+    assert not shed.success and 'shed' in shed.error
+    assert served.success
+    assert primary.calls == [('quote', 'AAA')]
+
+
+@pytest.mark.asyncio
+async def test_priority_does_not_outlive_the_request():
+    manager = make_manager(FakeProvider())
+
+    await manager.get_quote('AAA', priority=RequestPriority.LOW)
+
+    assert request_priority() == RequestPriority.NORMAL
+
+
+# Bar series
+
+@pytest.mark.asyncio
+async def test_cold_bar_series_comes_straight_from_the_provider():
+    provider = FakeProvider()
+    manager = make_manager(provider)
+
+    response = await manager.get_bar_series('TEST', date(2024, 1, 1), date(2024, 1, 31))
+
+    assert response.success and response.data is provider.last_series
+    assert [call[0] for call in provider.calls] == ['bar_series', 'historical']
+
+
+@pytest.mark.asyncio
+async def test_bar_series_shares_the_bar_cache():
+    provider = FakeProvider()
+    manager = make_manager(provider)
+    await manager.get_bar_series('TEST', date(2024, 1, 1), date(2024, 1, 31))
+
+    series = await manager.get_bar_series('TEST', date(2024, 1, 5), date(2024, 1, 19))
+    bars = await manager.get_historical_data('TEST', date(2024, 1, 5), date(2024, 1, 19))
+
+    assert series.cached and bars.cached
+    assert len(provider.calls) == 2
+    assert series.data.to_bars() == bars.data
+
+
+@pytest.mark.asyncio
+async def test_bar_series_fetches_only_missing_gaps():
+    provider = FakeProvider()
+    manager = make_manager(provider)
+    await manager.get_bar_series('TEST', date(2024, 1, 1), date(2024, 1, 31))
+    del provider.calls[:]
+
+    response = await manager.get_bar_series('TEST', date(2024, 1, 29), date(2024, 2, 9))
+
+    assert provider.calls[0] == ('bar_series', 'TEST', date(2024, 2, 1), date(2024, 2, 9))
+    assert isinstance(response.data, BarSeries)
+    assert [bar.timestamp.day for bar in response.data] == [29, 30, 31, 1, 2, 5, 6, 7, 8, 9]
+
+
+# Batched Redis access
+
+@pytest.mark.asyncio
+async def test_batch_quotes_use_one_mget_and_one_write_pipeline():
+    symbols = [f"S{i:02d}" for i in range(50)]
+    manager = make_manager(FakeProvider(), local_cache={'enabled': False})
+    redis_client = CountingRedis(manager.redis_client)
+    manager.redis_client = redis_client
+
+    cold = await manager.get_quotes(symbols)
+    cold_calls = Counter(redis_client.calls)
+    redis_client.calls.clear()
+    warm = await manager.get_quotes(symbols)
+
+    # Reads: one pipelined MGET (TTLs ride along for L1 promotion); writes: one pipeline
+    assert len(cold) == 50 and all(response.success for response in cold.values())
+    assert cold_calls['pipeline'] == 2
+    assert cold_calls['pipeline.mget'] == 1 and cold_calls['pipeline.setex'] == 50
+    assert len(warm) == 50 and all(response.cached for response in warm.values())
+    assert redis_client.calls['pipeline'] == 1 and redis_client.calls['pipeline.mget'] == 1
+    for calls in (cold_calls, redis_client.calls):
+        assert not any(calls[command] for command in ('get', 'mget', 'set', 'setex', 'pipeline.get', 'pipeline.set'))
+
+
+# Streaming quote book
+
+def attach_stream(manager: DataManager, **streaming_config) -> PolygonStreamingProvider:
+    """Give manager a (not started) streaming feed whose book tests fill directly"""
+    stream = PolygonStreamingProvider({'api_key': 'key', 'max_quote_age_seconds': 0.05})
+    manager.streaming_provider = stream
+    manager.streaming_config = {'enabled': True, **streaming_config}
+    return stream
+
+
+@pytest.mark.asyncio
+async def test_streamed_quote_is_served_without_provider_calls():
+    provider = FakeProvider()
+    manager = make_manager(provider)
+    stream = attach_stream(manager)
+    stream.book.apply_quote('AAA', 10.0, 10.5)
+
+    response = await manager.get_quote('AAA')
+
+    assert response.success and response.source == 'polygon_stream'
+    assert response.data.mark == Decimal('10.25') and response.age_seconds is not None
+    assert provider.calls == [] and manager.request_stats['stream_hits'] == 1
+
+
+@pytest.mark.asyncio
+async def test_batch_quotes_fetch_only_symbols_missing_from_the_stream():
+    provider = FakeProvider()
+    manager = make_manager(provider)
+    stream = attach_stream(manager)
+    for symbol in ('AAA', 'BBB'):
+        stream.book.apply_quote(symbol, 10.0, 10.5)
+        stream.subscriptions.add(symbol)
+
+    streamed = await manager.get_quotes(['AAA', 'BBB'])
+    mixed = await manager.get_quotes(['AAA', 'BBB', 'CCC'])
+
+    assert all(response.source == 'polygon_stream' for response in streamed.values())
+    assert provider.calls == [('quotes', ('CCC',))]
+    assert mixed['CCC'].source == 'fake' and mixed['AAA'].source == 'polygon_stream'
+
+
+@pytest.mark.asyncio
+async def test_stale_streamed_quote_falls_back_to_providers():
+    provider = FakeProvider()
+    manager = make_manager(provider)
+    stream = attach_stream(manager)
+    stream.book.apply_quote('AAA', 10.0, 10.5)
+    stream.subscriptions.add('AAA')
+    await asyncio.sleep(0.1)
+
+    response = await manager.get_quote('AAA')
+
+    assert response.source == 'fake' and provider.calls == [('quote', 'AAA')]
+
+
+@pytest.mark.asyncio
+async def test_unknown_symbols_are_auto_subscribed():
+    provider = FakeProvider()
+    manager = make_manager(provider)
+    stream = attach_stream(manager)
+
+    response = await manager.get_quote('CCC')
+    await manager.get_quotes(['DDD', 'EEE'])
+    await asyncio.sleep(0)
+
+    assert response.source == 'fake'
+    assert stream.subscriptions == {'CCC', 'DDD', 'EEE'}
+
+
+@pytest.mark.asyncio
+async def test_auto_subscribe_can_be_disabled():
+    manager = make_manager(FakeProvider())
+    stream = attach_stream(manager, auto_subscribe=False)
+
+    await manager.get_quote('CCC')
+    await asyncio.sleep(0)
+
+    assert stream.subscriptions == set()
@@ -0,0 +1,102 @@
+"""
+Tests for the shared provider HTTP pool
+Runs against a loopback aiohttp server, without network access
+"""
+
+from contextlib import asynccontextmanager
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from data.providers.http import HttpClientFactory
+from data.providers.polygon import PolygonProvider
+from data.providers.schwab import SchwabProvider
+
+
+@asynccontextmanager
+async def loopback_server():
+    async def ok(request):
+        return web.json_response({'status': 'OK'})
+
+    app = web.Application()
+    app.router.add_get('/ok', ok)
+    server = TestServer(app)
+    await server.start_server()
+    try:
+        yield server
+    finally:
+        await server.close()
+
+
+@asynccontextmanager
+async def providers_on_shared_pool():
+    """Yields (http_client, polygon, schwab) sharing one HttpClientFactory"""
+    http_client = HttpClientFactory()
+    polygon = PolygonProvider({'api_key': 'key'})
+    schwab = SchwabProvider({'client_id': 'id', 'client_secret': 'secret'})
+    for provider in (polygon, schwab):
+        provider.set_http_client(http_client)
+    try:
+        yield http_client, polygon, schwab
+    finally:
+        await http_client.close()
+
+
+async def fetch(session, server: TestServer) -> dict:
+    async with session.get(server.make_url('/ok')) as response:
+        return await response.json()
+
+
+@pytest.mark.asyncio
+async def test_providers_share_one_connector():
+    async with providers_on_shared_pool() as (http_client, polygon, schwab):
+        polygon_session = polygon._ensure_session()
+        schwab_session = schwab._ensure_session()
+
+        assert polygon_session is not schwab_session
+        assert polygon_session.connector is schwab_session.connector
+        assert http_client.get_stats()['open_sessions'] == 2
+
+
+@pytest.mark.asyncio
+async def test_owner_session_is_reused_until_closed():
+    async with providers_on_shared_pool() as (http_client, polygon, _):
+        session = polygon._ensure_session()
+        assert polygon._ensure_session() is session
+
+        await polygon._close_session()
+
+        assert session.closed and polygon.session is None
+        reopened = polygon._ensure_session()
+        assert reopened is not session and not reopened.closed
+        assert http_client.get_stats()['sessions_opened'] == 2
+
+
+@pytest.mark.asyncio
+async def test_closing_one_provider_keeps_the_pool_open_for_others():
+    async with loopback_server() as server, providers_on_shared_pool() as (http_client, polygon, schwab):
+        polygon._ensure_session()
+        schwab_session = schwab._ensure_session()
+
+        await polygon._close_session()
+
+        assert not schwab_session.connector.closed
+        assert await fetch(schwab_session, server) == {'status': 'OK'}
+        assert http_client.get_stats()['open_sessions'] == 1
+
+
+@pytest.mark.asyncio
+async def test_trace_stats_count_requests_and_connections():
+    async with loopback_server() as server, providers_on_shared_pool() as (http_client, polygon, schwab):
+        for _ in range(3):
+            await fetch(polygon._ensure_session(), server)
+        await fetch(schwab._ensure_session(), server)
+
+        # Each provider dials its own keep-alive connection, then reuses it
+        stats = http_client.get_stats()
+        assert stats['requests'] == 4
+        assert stats['connections_created'] == 2
+        assert stats['connections_reused'] == 2
+        assert stats['reuse_ratio'] == 0.5
+        assert stats['connections_idle'] == 2
@@ -0,0 +1,390 @@
+"""
+Tests for the market data models
+Covers trusted construction, the array-backed options chain, indexed contract
+lookups, numeric modes and the columnar bar series
+"""
+
+import os
+import subprocess
+import sys
+from datetime import datetime, date, timedelta
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from data.models import (
+    MARKET_TIMEZONE, NUMERIC_MODE, BarSeries, ColumnarOptionsChain, DataResponse, Greeks, HistoricalBar,
+    OptionContract, OptionsChain, OptionType, Quote, to_price
+)
+
+
+NEAR = date(2030, 1, 18)
+FAR = date(2030, 2, 15)
+STRIKES = [90, 95, 100, 105, 110]
+
+
+def contract(expiration: date, option_type: OptionType, strike: int) -> OptionContract:
+    """Quoted contract with a rough delta; strike 100 has no volume and strike 110 no greeks"""
+    is_call = option_type == OptionType.CALL
+    moneyness = (100 - strike) / 40
+    delta = 0.5 + moneyness if is_call else -0.5 + moneyness
+    return OptionContract(
+        symbol=f"TEST{expiration:%y%m%d}{'C' if is_call else 'P'}{strike * 1000:08d}",
+        underlying_symbol='TEST',
+        option_type=option_type,
+        strike_price=to_price(strike),
+        expiration_date=expiration,
+        bid=to_price(Decimal('1.15') + strike % 10),
+        ask=to_price(Decimal('1.25') + strike % 10),
+        volume=strike if strike != 100 else None,
+        greeks=Greeks(delta=to_price(delta)) if strike != 110 else None,
+        timestamp=datetime(2030, 1, 2, 11, 0),
+        source='polygon'
+    )
+
+
+def make_chain() -> OptionsChain:
+    """Two expirations of calls and puts, each listed in reverse strike order"""
+    expirations = {
+        expiration.isoformat(): [
+            contract(expiration, option_type, strike)
+            for option_type in (OptionType.PUT, OptionType.CALL)
+            for strike in reversed(STRIKES)
+        ]
+        for expiration in (FAR, NEAR)
+    }
+    return OptionsChain(
+        underlying_symbol='TEST',
+        underlying_price=to_price(100),
+        expirations=expirations,
+        total_contracts=sum(len(contracts) for contracts in expirations.values()),
+        timestamp=datetime(2030, 1, 2, 11, 0),
+        source='polygon'
+    )
+
+
+# Trusted construction
+
+def test_trusted_model_matches_validated_model():
+    fields = dict(
+        symbol='TEST',
+        bid=to_price('1.15'),
+        volume=100,
+        timestamp=datetime(2030, 1, 2, 11, 0),
+        source='polygon'
+    )
+
+    trusted = Quote.trusted(**fields)
+    validated = Quote(**fields)
+
+    assert trusted == validated
+    assert trusted.model_dump_json() == validated.model_dump_json()
+    assert trusted.model_fields_set == validated.model_fields_set
+
+
+# Columnar options chain
+
+def test_columnar_rows_sort_by_expiration_type_and_strike():
+    columnar = make_chain().to_columnar()
+
+    assert len(columnar) == 20
+    assert columnar.expirations == [NEAR, FAR]
+    near = columnar.expiration(NEAR)
+    assert near.is_call.tolist() == [True] * 5 + [False] * 5
+    assert near.strike.tolist() == STRIKES + STRIKES
+
+
+def test_columnar_missing_values_use_sentinels():
+    near = make_chain().to_columnar().expiration(NEAR)
+
+    assert near.volume.tolist()[:5] == [90, 95, -1, 105, 110]
+    assert np.isnan(near.delta[4]) and not np.isnan(near.delta[3])
+    assert np.isnan(near.gamma).all()
+
+
+def test_expiration_views_share_the_parent_columns():
+    columnar = make_chain().to_columnar()
+
+    views = dict(columnar.iter_expirations())
+
+    assert list(views) == [NEAR, FAR]
+    assert np.shares_memory(views[FAR].strike, columnar.strike)
+    assert len(columnar.expiration(date(2030, 3, 15))) == 0
+
+
+def test_mid_prices_are_vectorized():
+    near = make_chain().to_columnar().expiration(NEAR)
+
+    assert near.mid[0] == pytest.approx(1.2)
+
+
+def test_contracts_materialize_lazily_and_match_the_source():
+    chain = make_chain()
+    columnar = chain.to_columnar()
+
+    source = chain.find_contract(90, NEAR, OptionType.CALL)
+
+    first = columnar[0]
+
+    assert first is columnar.contract(0)
+    assert first.model_dump_json(exclude={'days_to_expiration'}) == source.model_dump_json(exclude={'days_to_expiration'})
+    assert columnar.contract(-1).symbol == columnar.symbol[-1]
+    assert len(columnar._materialized) == 2
+
+
+def test_columnar_round_trips_to_a_model_chain():
+    chain = make_chain()
+
+    restored = chain.to_columnar().to_chain()
+
+    assert restored.total_contracts == chain.total_contracts
+    assert list(restored.expirations) == [NEAR.isoformat(), FAR.isoformat()]
+    assert {c.symbol for c in restored.expirations[FAR.isoformat()]} == {c.symbol for c in chain.expirations[FAR.isoformat()]}
+    assert restored.find_contract(105, FAR, OptionType.PUT).bid == chain.find_contract(105, FAR, OptionType.PUT).bid
+
+
+def test_columnar_from_columns_sorts_unless_presorted():
+    columns = {
+        'symbol': ['B', 'A'],
+        'expiration': [NEAR, NEAR],
+        'is_call': [True, True],
+        'strike': [110.0, 100.0]
+    }
+
+    assert ColumnarOptionsChain('TEST', columns).symbol.tolist() == ['A', 'B']
+    assert ColumnarOptionsChain('TEST', columns, presorted=True).symbol.tolist() == ['B', 'A']
+
+
+def test_columnar_rejects_ragged_columns():
+    with pytest.raises(ValueError):
+        ColumnarOptionsChain('TEST', {'symbol': ['A'], 'expiration': [NEAR], 'is_call': [True], 'strike': [1.0, 2.0]})
+
+
+# Indexed contract lookups
+
+def test_find_contract_by_exact_strike():
+    chain = make_chain()
+
+    assert chain.find_contract(Decimal('95'), NEAR, OptionType.PUT).symbol == 'TEST300118P00095000'
+    assert chain.find_contract(95.0, NEAR, OptionType.CALL).symbol == 'TEST300118C00095000'
+    assert chain.find_contract(97, NEAR, OptionType.CALL) is None
+    assert chain.find_contract(95, date(2030, 3, 15), OptionType.CALL) is None
+
+
+def test_strikes_for_expiration_are_sorted_and_unique():
+    assert make_chain().get_strikes_for_expiration(FAR) == [to_price(strike) for strike in STRIKES]
+
+
+def test_nearest_strike_prefers_lower_on_ties():
+    chain = make_chain()
+
+    assert chain.nearest_strike(NEAR, OptionType.CALL, 101).strike_price == 100
+    assert chain.nearest_strike(NEAR, OptionType.CALL, 97.5).strike_price == 95
+    assert chain.nearest_strike(NEAR, OptionType.CALL, 500).strike_price == 110
+    assert chain.nearest_strike(NEAR, OptionType.CALL, 1).strike_price == 90
+
+
+def test_nearest_delta_skips_contracts_without_greeks():
+    chain = make_chain()
+
+    assert chain.nearest_delta(NEAR, OptionType.CALL, 0.4).strike_price == 105
+    assert chain.nearest_delta(NEAR, OptionType.CALL, 0.1).strike_price == 105
+    assert chain.nearest_delta(NEAR, OptionType.PUT, -0.3).strike_price == 90
+    assert chain.nearest_delta(NEAR, OptionType.PUT, -0.6).strike_price == 105
+
+
+def test_strike_window_is_inclusive_and_ascending():
+    window = make_chain().strike_window(FAR, OptionType.PUT, 95, 105)
+
+    assert [c.strike_price for c in window] == [95, 100, 105]
+    assert make_chain().strike_window(FAR, OptionType.PUT, 96, 99) == []
+
+
+def test_contract_by_symbol():
+    chain = make_chain()
+
+    assert chain.get_contract_by_symbol('TEST300215C00110000').strike_price == 110
+    assert chain.get_contract_by_symbol('TEST300215C00111000') is None
+
+
+def test_index_is_rebuilt_when_expirations_change():
+    chain = make_chain()
+    assert chain.find_contract(115, NEAR, OptionType.CALL) is None
+
+    chain.expirations[NEAR.isoformat()] = chain.expirations[NEAR.isoformat()] + [contract(NEAR, OptionType.CALL, 115)]
+
+    assert chain.find_contract(115, NEAR, OptionType.CALL) is not None
+
+
+def test_filtered_chain_has_its_own_index():
+    chain = make_chain()
+
+    filtered = chain.filter_strikes(95, 100)
+
+    assert filtered.total_contracts == 8
+    assert filtered.find_contract(90, NEAR, OptionType.CALL) is None
+    assert chain.find_contract(90, NEAR, OptionType.CALL) is not None
+
+
+# Numeric modes
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def quote_json() -> str:
+    quote = Quote(
+        symbol='TEST',
+        bid=to_price('412.37'),
+        ask=to_price(412.5),
+        last=to_price(4000),
+        timestamp=datetime(2030, 1, 2, 11, 0),
+        source='polygon'
+    )
+    return quote.model_dump_json()
+
+
+def run_in_numeric_mode(mode: str, code: str) -> subprocess.CompletedProcess:
+    """Run code in a fresh interpreter, since the numeric mode is fixed at import"""
+    env = {**os.environ, 'DERIVAGENT_NUMERIC_MODE': mode}
+    return subprocess.run([sys.executable, '-c', code], cwd=BACKEND_DIR, env=env, capture_output=True, text=True)
+
+
+@pytest.mark.skipif(NUMERIC_MODE != 'decimal', reason="compares against decimal mode")
+def test_float_mode_prices_are_floats_with_the_same_json():
+    result = run_in_numeric_mode('float', (
+        "from test_models import NEAR, make_chain, quote_json\n"
+        "from data.models import to_price\n"
+        "contract = make_chain().to_columnar().expiration(NEAR)[0]\n"
+        "print(type(to_price('1.5')).__name__, type(contract.bid).__name__)\n"
+        "print(quote_json())\n"
+    ))
+
+    assert result.returncode == 0, result.stderr
+    types, json_text = result.stdout.splitlines()
+    assert types == 'float float'
+    assert json_text == quote_json()
+    assert isinstance(to_price('1.5'), Decimal)
+
+
+def test_unknown_numeric_mode_is_rejected():
+    result = run_in_numeric_mode('float32', "import data.models")
+
+    assert result.returncode != 0
+    assert 'ValueError' in result.stderr and 'DERIVAGENT_NUMERIC_MODE' in result.stderr
+
+
+# Columnar bar series
+
+def bar(timestamp: datetime, close: float, volume: int = 100) -> HistoricalBar:
+    return HistoricalBar(
+        symbol='TEST',
+        timestamp=timestamp,
+        open_price=to_price(close - 1),
+        high=to_price(close + 1),
+        low=to_price(close - 2),
+        close_price=to_price(close),
+        volume=volume
+    )
+
+
+def daily_bars(start: date, end: date) -> list:
+    """Weekday bars at the close (exchange time), closing at 100 + day of month"""
+    bars = []
+    day = start
+    while day <= end:
+        if day.weekday() < 5:
+            bars.append(bar(datetime(day.year, day.month, day.day, 16, tzinfo=MARKET_TIMEZONE), 100 + day.day))
+        day += timedelta(days=1)
+    return bars
+
+
+def test_series_round_trips_bars():
+    bars = daily_bars(date(2024, 3, 4), date(2024, 3, 15))
+
+    series = BarSeries.from_bars('TEST', bars, '1d')
+
+    assert len(series) == 10
+    assert series.to_bars() == bars
+    assert series[-1] == bars[-1]
+    assert series.close.tolist() == [float(b.close_price) for b in bars]
+
+
+def test_series_sorts_rows_by_timestamp():
+    bars = daily_bars(date(2024, 3, 4), date(2024, 3, 8))
+
+    series = BarSeries.from_bars('TEST', list(reversed(bars)))
+
+    assert series.to_bars() == bars
+
+
+def test_slices_are_zero_copy_views():
+    series = BarSeries.from_bars('TEST', daily_bars(date(2024, 3, 4), date(2024, 3, 15)))
+
+    head = series[:3]
+
+    assert len(head) == 3 and np.shares_memory(head.close, series.close)
+    assert series.tail(2).close.tolist() == [114.0, 115.0]
+    assert len(series.tail(50)) == 10
+    with pytest.raises(IndexError):
+        series[10]
+
+
+def test_between_uses_exchange_dates():
+    """An evening bar is on that trading date even though it is past midnight UTC"""
+    evening = datetime(2024, 3, 13, 20, 30, tzinfo=MARKET_TIMEZONE)
+    series = BarSeries.from_bars('TEST', daily_bars(date(2024, 3, 11), date(2024, 3, 15)) + [bar(evening, 1)])
+
+    window = series.between(date(2024, 3, 12), date(2024, 3, 13))
+
+    assert [b.timestamp for b in window] == [
+        datetime(2024, 3, 12, 16, tzinfo=MARKET_TIMEZONE),
+        datetime(2024, 3, 13, 16, tzinfo=MARKET_TIMEZONE),
+        evening
+    ]
+
+
+def test_resample_to_weeks_aggregates_ohlcv():
+    series = BarSeries.from_bars('TEST', daily_bars(date(2024, 3, 4), date(2024, 3, 15)), '1d')
+
+    weekly = series.resample('1w')
+
+    assert weekly.interval == '1w'
+    assert len(weekly) == 2
+    first = weekly[0]
+    assert first.timestamp == datetime(2024, 3, 4, 16, tzinfo=MARKET_TIMEZONE)
+    assert (first.open_price, first.high, first.low, first.close_price) == (103, 109, 102, 108)
+    assert first.volume == 500
+
+
+def test_resample_periods_align_in_exchange_time():
+    """Evening bars that cross midnight UTC stay in their exchange day"""
+    bars = [
+        bar(datetime(2024, 3, 13, 19, 30, tzinfo=MARKET_TIMEZONE), 10),
+        bar(datetime(2024, 3, 13, 20, 30, tzinfo=MARKET_TIMEZONE), 11),
+        bar(datetime(2024, 3, 14, 4, 0, tzinfo=MARKET_TIMEZONE), 12)
+    ]
+
+    daily = BarSeries.from_bars('TEST', bars).resample('1d')
+
+    assert daily.close.tolist() == [11.0, 12.0]
+    assert daily.volume.tolist() == [200, 100]
+
+
+def test_resample_rejects_unknown_intervals():
+    series = BarSeries.from_bars('TEST', daily_bars(date(2024, 3, 4), date(2024, 3, 8)))
+
+    with pytest.raises(ValueError):
+        series.resample('1y')
+    assert len(BarSeries.from_bars('TEST', []).resample('1w')) == 0
+
+
+def test_series_response_serializes_like_bar_list():
+    bars = daily_bars(date(2024, 3, 4), date(2024, 3, 8))
+    timestamp = datetime(2024, 3, 8, 17, 0)
+
+    as_series = DataResponse(success=True, data=BarSeries.from_bars('TEST', bars), timestamp=timestamp)
+    as_list = DataResponse(success=True, data=bars, timestamp=timestamp)
+
+    assert as_series.model_dump_json() == as_list.model_dump_json()
+    assert as_series.model_dump() == as_list.model_dump()
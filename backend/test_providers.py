@@ -0,0 +1,401 @@
+"""
+Tests for provider HTTP integrations
+Runs provider request code against a stubbed aiohttp session, without network access
+"""
+
+import asyncio
+import inspect
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Any, Callable, Dict, Tuple
+
+import pytest
+
+from data.providers.base import DataProviderError
+from data.providers.polygon import PolygonProvider
+from data.providers.schwab import SchwabProvider
+
+
+class FakeResponse:
+    """aiohttp response stand-in, used as an async context manager"""
+
+    def __init__(self, result):
+        # (status, payload), or an awaitable resolving to one
+        self.result = result
+
+    async def __aenter__(self):
+        if inspect.isawaitable(self.result):
+            self.result = await self.result
+        self.status, self.payload = self.result
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def json(self):
+        return self.payload
+
+    async def text(self):
+        return str(self.payload)
+
+
+class FakeSession:
+    """aiohttp session stand-in routing every request to handler(method, url, params), sync or async"""
+
+    def __init__(self, handler: Callable[[str, str, Dict[str, Any]], Tuple[int, Any]]):
+        self.handler = handler
+        self.requests = []
+        self.closed = False
+
+    def _request(self, method: str, url: str, params=None, headers=None, **kwargs) -> FakeResponse:
+        params = dict(params or {})
+        self.requests.append((method, url, params, dict(headers or {})))
+        return FakeResponse(self.handler(method, url, params))
+
+    def get(self, url: str, **kwargs) -> FakeResponse:
+        return self._request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> FakeResponse:
+        return self._request('POST', url, **kwargs)
+
+
+# Schwab batch quotes
+
+def schwab_provider(handler, **config) -> SchwabProvider:
+    provider = SchwabProvider({'client_id': 'id', 'client_secret': 'secret', **config})
+    provider.is_connected = True
+    provider.access_token = 'token'
+    provider.refresh_token = 'refresh'
+    provider.token_expires_at = datetime.now() + timedelta(hours=1)
+    provider.session = FakeSession(handler)
+    return provider
+
+
+def schwab_quotes(symbols, missing=()) -> dict:
+    return {symbol: {'bidPrice': 1.5, 'askPrice': 1.6, 'totalVolume': 100} for symbol in symbols if symbol not in missing}
+
+
+@pytest.mark.asyncio
+async def test_schwab_quotes_are_chunked_into_comma_separated_requests():
+    provider = schwab_provider(lambda method, url, params: (200, schwab_quotes(params['symbols'].split(','))), quote_batch_size=2)
+
+    results = await provider.get_quotes(['AAA', 'BBB', 'CCC', 'DDD', 'EEE'])
+
+    assert sorted(params['symbols'] for _, _, params, _ in provider.session.requests) == ['AAA,BBB', 'CCC,DDD', 'EEE']
+    assert all(response.success for response in results.values())
+    assert results['EEE'].data.bid == Decimal('1.5') and results['EEE'].data.volume == 100
+
+
+@pytest.mark.asyncio
+async def test_schwab_symbols_missing_from_the_response_fail_individually():
+    provider = schwab_provider(lambda method, url, params: (200, schwab_quotes(params['symbols'].split(','), missing={'BBB'})))
+
+    results = await provider.get_quotes(['AAA', 'BBB', 'CCC'])
+
+    assert len(provider.session.requests) == 1
+    assert results['AAA'].success and results['CCC'].success
+    assert not results['BBB'].success and 'BBB' in results['BBB'].error
+
+
+@pytest.mark.asyncio
+async def test_schwab_batch_refreshes_an_expired_token_once():
+    def handler(method, url, params):
+        if method == 'POST':
+            return 200, {'access_token': 'fresh', 'expires_in': 1800}
+        if provider.access_token != 'fresh':
+            return 401, 'expired'
+        return 200, schwab_quotes(params['symbols'].split(','))
+    provider = schwab_provider(handler)
+
+    results = await provider.get_quotes(['AAA', 'BBB'])
+
+    assert all(response.success for response in results.values())
+    assert [method for method, *_ in provider.session.requests] == ['GET', 'POST', 'GET']
+    assert provider.session.requests[-1][3]['Authorization'] == 'Bearer fresh'
+
+
+@pytest.mark.asyncio
+async def test_schwab_batch_opens_a_session_when_needed():
+    provider = schwab_provider(lambda method, url, params: (200, {}))
+    provider.session = None
+    session = FakeSession(lambda method, url, params: (200, schwab_quotes(['AAA'])))
+    provider.http_client.session = lambda owner, headers=None: session
+
+    results = await provider.get_quotes(['AAA'])
+
+    assert results['AAA'].success and len(session.requests) == 1
+
+
+# Polygon batch quotes
+
+def polygon_provider(handler, **config) -> PolygonProvider:
+    provider = PolygonProvider({'api_key': 'key', **config})
+    provider.rate_limiter = None
+    provider.session = FakeSession(handler)
+    return provider
+
+
+def polygon_snapshot(tickers) -> dict:
+    return {
+        'status': 'OK',
+        'tickers': [
+            {'ticker': ticker, 'lastQuote': {'p': 10.5, 'P': 10.7, 's': 3, 'S': 4}, 'day': {'c': 10.6, 'v': 1000}}
+            for ticker in tickers
+        ]
+    }
+
+
+def polygon_aggregate(url) -> dict:
+    return {'status': 'OK', 'results': [{'o': 10, 'h': 11, 'l': 9, 'c': 10.5, 'v': 500}]}
+
+
+@pytest.mark.asyncio
+async def test_polygon_quotes_use_the_snapshot_endpoint_in_batches():
+    provider = polygon_provider(
+        lambda method, url, params: (200, polygon_snapshot(params['tickers'].split(','))),
+        snapshot_batch_size=2
+    )
+
+    results = await provider.get_quotes(['AAA', 'BBB', 'CCC'])
+
+    assert [params['tickers'] for _, _, params, _ in provider.session.requests] == ['AAA,BBB', 'CCC']
+    assert all('/v2/snapshot/' in url for _, url, _, _ in provider.session.requests)
+    assert results['CCC'].data.mark == Decimal('10.6') and results['CCC'].data.bid_size == 3
+
+
+@pytest.mark.asyncio
+async def test_polygon_snapshot_omissions_fail_individually():
+    provider = polygon_provider(lambda method, url, params: (200, polygon_snapshot(['AAA'])))
+
+    results = await provider.get_quotes(['AAA', 'BBB'])
+
+    assert results['AAA'].success and not results['BBB'].success
+
+
+@pytest.mark.parametrize('status', [401, 403])
+@pytest.mark.asyncio
+async def test_polygon_falls_back_to_per_symbol_quotes_without_snapshot_access(status):
+    def handler(method, url, params):
+        if '/v2/snapshot/' in url:
+            return status, 'NOT_AUTHORIZED'
+        return 200, polygon_aggregate(url)
+    provider = polygon_provider(handler)
+
+    first = await provider.get_quotes(['AAA', 'BBB'])
+    second = await provider.get_quotes(['CCC'])
+
+    assert all(response.success for response in {**first, **second}.values())
+    assert not provider.snapshot_available
+    snapshot_calls = [url for _, url, _, _ in provider.session.requests if '/v2/snapshot/' in url]
+    aggregate_calls = [url for _, url, _, _ in provider.session.requests if '/v2/aggs/' in url]
+    assert len(snapshot_calls) == 1 and len(aggregate_calls) == 3
+
+
+# Polygon options contract pagination
+
+CONTRACTS_URL = 'https://api.polygon.io/v3/reference/options/contracts'
+
+
+def contracts_page(contract_type: str, strikes, next_cursor=None) -> dict:
+    page = {
+        'status': 'OK',
+        'results': [
+            {
+                'ticker': f"O:AAA{strike}{contract_type[0].upper()}",
+                'strike_price': strike,
+                'expiration_date': (date.today() + timedelta(days=30)).isoformat(),
+                'contract_type': contract_type
+            }
+            for strike in strikes
+        ]
+    }
+    if next_cursor:
+        page['next_url'] = f"{CONTRACTS_URL}?cursor={next_cursor}"
+    return page
+
+
+def paged_contracts(pages_per_type: int):
+    """Handler serving pages_per_type pages of two strikes for each contract type"""
+    def handler(method, url, params):
+        if 'cursor=' in url:
+            contract_type, page = url.split('cursor=')[1].split('-')
+            page = int(page)
+        else:
+            contract_type, page = params['contract_type'], 0
+        strikes = [100 + 2 * page, 101 + 2 * page]
+        cursor = f"{contract_type}-{page + 1}" if page + 1 < pages_per_type else None
+        return 200, contracts_page(contract_type, strikes, cursor)
+    return handler
+
+
+@pytest.mark.asyncio
+async def test_polygon_contracts_follow_next_url_with_the_api_key():
+    provider = polygon_provider(paged_contracts(3))
+
+    contracts = [contract async for contract in provider.iter_option_contracts('AAA')]
+
+    assert len(contracts) == 12
+    assert sorted(contract.strike_price for contract in contracts if contract.option_type.value == 'call') == list(range(100, 106))
+    follow_ups = [(url, params) for _, url, params, _ in provider.session.requests if 'cursor=' in url]
+    assert len(follow_ups) == 4
+    assert all(params == {'apikey': 'key'} for _, params in follow_ups)
+    first_pages = [params for _, url, params, _ in provider.session.requests if 'cursor=' not in url]
+    assert sorted(params['contract_type'] for params in first_pages) == ['call', 'put']
+    assert all(params['apikey'] == 'key' and params['underlying_ticker'] == 'AAA' for params in first_pages)
+
+
+@pytest.mark.asyncio
+async def test_polygon_chain_stops_at_max_pages_and_is_flagged_truncated():
+    def handler(method, url, params):
+        if '/v3/reference/options/contracts' in url:
+            return paged_contracts(5)(method, url, params)
+        return 404, 'not found'
+    provider = polygon_provider(handler, options_chain_max_pages=2)
+    provider.options_snapshot_available = False
+
+    response = await provider.get_options_chain('AAA')
+
+    assert response.success and response.truncated
+    assert response.data.total_contracts == 8
+    assert len([url for _, url, _, _ in provider.session.requests if '/v3/reference/' in url]) == 4
+
+
+@pytest.mark.asyncio
+async def test_polygon_complete_chain_is_not_flagged_truncated():
+    def handler(method, url, params):
+        if '/v3/reference/options/contracts' in url:
+            return paged_contracts(2)(method, url, params)
+        return 404, 'not found'
+    provider = polygon_provider(handler, options_chain_max_pages=2)
+    provider.options_snapshot_available = False
+
+    response = await provider.get_options_chain('AAA')
+
+    assert response.success and not response.truncated
+    assert response.data.total_contracts == 8
+
+
+@pytest.mark.asyncio
+async def test_polygon_calls_and_puts_are_walked_concurrently():
+    """Each walker's first page waits for the other's, so a sequential walk would stall"""
+    first_pages = {'call': asyncio.Event(), 'put': asyncio.Event()}
+    serve = paged_contracts(2)
+
+    async def handler(method, url, params):
+        if 'cursor=' not in url:
+            contract_type = params['contract_type']
+            first_pages[contract_type].set()
+            other = 'put' if contract_type == 'call' else 'call'
+            await first_pages[other].wait()
+        return serve(method, url, params)
+    provider = polygon_provider(handler)
+
+    async def collect():
+        return [contract async for contract in provider.iter_option_contracts('AAA')]
+    contracts = await asyncio.wait_for(collect(), 1)
+
+    assert len(contracts) == 8
+
+
+@pytest.mark.asyncio
+async def test_polygon_walker_error_cancels_the_other_and_propagates():
+    put_cancelled = asyncio.Event()
+
+    async def handler(method, url, params):
+        if params.get('contract_type') == 'call':
+            return 500, 'upstream failure'
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            put_cancelled.set()
+            raise
+    provider = polygon_provider(handler)
+
+    async def collect():
+        return [contract async for contract in provider.iter_option_contracts('AAA')]
+    with pytest.raises(DataProviderError, match='500'):
+        await asyncio.wait_for(collect(), 1)
+
+    assert put_cancelled.is_set()
+
+
+# Polygon options chain snapshot
+
+SNAPSHOT_URL = 'https://api.polygon.io/v3/snapshot/options/AAA'
+
+
+def option_snapshot(contract_type: str, strike: int) -> dict:
+    """Snapshot whose prices and greeks encode its strike and type"""
+    sign = 1 if contract_type == 'call' else -1
+    return {
+        'details': contracts_page(contract_type, [strike])['results'][0],
+        'last_quote': {'bid': strike / 100, 'ask': strike / 100 + 0.5, 'midpoint': strike / 100 + 0.25},
+        'day': {'volume': strike, 'close': strike / 100},
+        'open_interest': strike * 10,
+        'implied_volatility': 0.25,
+        'greeks': {'delta': sign * 0.5, 'gamma': 0.01, 'theta': -0.02, 'vega': 0.1},
+        'underlying_asset': {'price': 101.5}
+    }
+
+
+def paged_snapshots(pages_per_type: int):
+    """Handler serving pages_per_type snapshot pages of two strikes for each contract type"""
+    def handler(method, url, params):
+        if not url.startswith(SNAPSHOT_URL):
+            return 404, 'not found'
+        if 'cursor=' in url:
+            contract_type, page = url.split('cursor=')[1].split('-')
+            page = int(page)
+        else:
+            contract_type, page = params['contract_type'], 0
+        payload = {'status': 'OK', 'results': [option_snapshot(contract_type, strike) for strike in (100 + 2 * page, 101 + 2 * page)]}
+        if page + 1 < pages_per_type:
+            payload['next_url'] = f"{SNAPSHOT_URL}?cursor={contract_type}-{page + 1}"
+        return 200, payload
+    return handler
+
+
+@pytest.mark.asyncio
+async def test_polygon_chain_is_built_from_paged_snapshots():
+    provider = polygon_provider(paged_snapshots(3))
+
+    response = await provider.get_options_chain('AAA')
+
+    assert response.success and not response.truncated
+    chain = response.data
+    assert chain.total_contracts == 12 and chain.underlying_price == Decimal('101.5')
+    assert all(SNAPSHOT_URL in url for _, url, _, _ in provider.session.requests)
+    assert len(provider.session.requests) == 6
+
+    # Last page of each walker lands on its own contract
+    for contract_type, sign in (('C', 1), ('P', -1)):
+        contract = chain.get_contract_by_symbol(f"O:AAA105{contract_type}")
+        assert contract.strike_price == 105
+        assert (contract.bid, contract.ask, contract.mark) == (Decimal('1.05'), Decimal('1.55'), Decimal('1.3'))
+        assert contract.volume == 105 and contract.open_interest == 1050
+        assert contract.greeks.delta == Decimal(str(sign * 0.5))
+        assert contract.greeks.implied_volatility == Decimal('0.25')
+
+
+@pytest.mark.asyncio
+async def test_polygon_chain_falls_back_to_unpriced_contracts_without_snapshot_access():
+    def handler(method, url, params):
+        if url.startswith(SNAPSHOT_URL):
+            return 403, 'NOT_AUTHORIZED'
+        if url.startswith(CONTRACTS_URL):
+            return paged_contracts(2)(method, url, params)
+        return 404, 'not found'
+    provider = polygon_provider(handler)
+
+    def snapshot_calls() -> int:
+        return sum(1 for _, url, _, _ in provider.session.requests if url.startswith(SNAPSHOT_URL))
+
+    response = await provider.get_options_chain('AAA')
+    tried = snapshot_calls()
+    await provider.get_options_chain('AAA')
+
+    assert response.success and response.data.total_contracts == 8
+    contracts = [contract for exp_contracts in response.data.expirations.values() for contract in exp_contracts]
+    assert all(contract.bid is None and contract.greeks is None for contract in contracts)
+    assert not provider.options_snapshot_available
+    assert tried >= 1 and snapshot_calls() == tried
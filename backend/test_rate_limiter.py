@@ -0,0 +1,136 @@
+"""
+Tests for provider rate limiting
+Covers token buckets (in-memory and Redis), daily limits and priority-ordered waiters
+"""
+
+import asyncio
+import time
+
+import fakeredis
+import fakeredis.aioredis
+import pytest
+import redis.asyncio as redis
+
+from data.concurrency import current_request_priority
+from data.models import RequestPriority
+from data.providers.base import InMemoryRateLimitBackend, RateLimiter, RateLimitError, RedisRateLimitBackend
+
+
+# 10 tokens per second
+PER_MINUTE = 600
+
+
+def redis_backend() -> RedisRateLimitBackend:
+    return RedisRateLimitBackend(fakeredis.aioredis.FakeRedis(server=fakeredis.FakeServer()))
+
+
+@pytest.fixture(params=['memory', 'redis'])
+def backend(request):
+    return InMemoryRateLimitBackend() if request.param == 'memory' else redis_backend()
+
+
+@pytest.mark.asyncio
+async def test_burst_is_immediate_then_spaced(backend):
+    limiter = RateLimiter('test', per_minute=PER_MINUTE, burst=2, backend=backend)
+
+    started = time.monotonic()
+    await limiter.acquire()
+    await limiter.acquire()
+    burst_done = time.monotonic()
+    await limiter.acquire()
+
+    assert burst_done - started < 0.05
+    assert time.monotonic() - burst_done >= 0.08
+
+
+@pytest.mark.asyncio
+async def test_daily_limit_fails_fast(backend):
+    limiter = RateLimiter('test', per_day=2, backend=backend)
+
+    await limiter.acquire()
+    await limiter.acquire()
+
+    started = time.monotonic()
+    with pytest.raises(RateLimitError):
+        await limiter.acquire()
+    assert time.monotonic() - started < 0.05
+
+
+@pytest.mark.asyncio
+async def test_wait_beyond_max_wait_raises(backend):
+    limiter = RateLimiter('test', per_minute=6, backend=backend, max_wait_seconds=0.05)
+    await limiter.acquire()
+
+    started = time.monotonic()
+    with pytest.raises(RateLimitError):
+        await limiter.acquire()
+    assert time.monotonic() - started < 0.05
+
+
+@pytest.mark.asyncio
+async def test_waiters_are_served_by_priority():
+    """Queued callers get tokens most urgent first, FIFO within a priority"""
+    limiter = RateLimiter('test', per_minute=PER_MINUTE)
+    await limiter.acquire()
+    served = []
+
+    async def request(name: str, priority: RequestPriority):
+        current_request_priority.set(priority)
+        await limiter.acquire()
+        served.append(name)
+
+    waiters = []
+    for name, priority in [
+        ('low', RequestPriority.LOW),
+        ('normal-1', RequestPriority.NORMAL),
+        ('critical', RequestPriority.CRITICAL),
+        ('normal-2', RequestPriority.NORMAL)
+    ]:
+        waiters.append(asyncio.ensure_future(request(name, priority)))
+        await asyncio.sleep(0)
+    await asyncio.gather(*waiters)
+
+    assert served == ['critical', 'normal-1', 'normal-2', 'low']
+
+
+@pytest.mark.asyncio
+async def test_cancelled_head_hands_over_to_next_waiter():
+    limiter = RateLimiter('test', per_minute=PER_MINUTE, max_wait_seconds=0.5)
+    await limiter.acquire()
+
+    async def impatient():
+        current_request_priority.set(RequestPriority.CRITICAL)
+        await limiter.acquire()
+
+    first = asyncio.ensure_future(impatient())
+    await asyncio.sleep(0)
+    second = asyncio.ensure_future(limiter.acquire())
+    await asyncio.sleep(0)
+    first.cancel()
+
+    await asyncio.wait_for(second, 0.3)
+    assert limiter._queue == []
+
+
+@pytest.mark.asyncio
+async def test_redis_buckets_are_shared_between_workers():
+    """Limiters in different processes draw from one bucket"""
+    backend = redis_backend()
+    worker_a = RateLimiter('polygon', per_minute=PER_MINUTE, backend=backend)
+    worker_b = RateLimiter('polygon', per_minute=PER_MINUTE, backend=RedisRateLimitBackend(backend.redis_client))
+
+    await worker_a.acquire()
+    started = time.monotonic()
+    await worker_b.acquire()
+
+    assert time.monotonic() - started >= 0.08
+
+
+@pytest.mark.asyncio
+async def test_unreachable_redis_falls_back_to_local_buckets():
+    backend = RedisRateLimitBackend(redis.Redis(host='127.0.0.1', port=1, socket_connect_timeout=0.1))
+    limiter = RateLimiter('test', per_day=1, backend=backend)
+
+    await limiter.acquire()
+    with pytest.raises(RateLimitError):
+        await limiter.acquire()
@@ -0,0 +1,162 @@
+"""
+Tests for provider routing health
+Covers circuit breaker state transitions and provider scoreboard ranking
+"""
+
+import time
+from types import SimpleNamespace
+
+from data.routing import CircuitBreaker, CircuitBreakerRegistry, ProviderScoreboard
+
+
+RESET_TIMEOUT = 0.05
+
+
+def tripped_breaker() -> CircuitBreaker:
+    breaker = CircuitBreaker('polygon/quotes', failure_threshold=2, reset_timeout_seconds=RESET_TIMEOUT)
+    breaker.record_failure()
+    breaker.record_failure()
+    return breaker
+
+
+def test_breaker_opens_after_consecutive_failures():
+    breaker = CircuitBreaker('polygon/quotes', failure_threshold=3)
+
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED and breaker.allow_request()
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.get_state()['times_opened'] == 1
+
+
+def test_open_breaker_rejects_until_reset_timeout():
+    breaker = tripped_breaker()
+
+    assert not breaker.allow_request()
+    assert breaker.get_state()['retry_in_seconds'] is not None
+
+    time.sleep(RESET_TIMEOUT)
+    assert breaker.allow_request()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+
+def test_half_open_breaker_allows_a_single_trial():
+    breaker = tripped_breaker()
+    time.sleep(RESET_TIMEOUT)
+
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+
+def test_successful_trial_closes_the_breaker():
+    breaker = tripped_breaker()
+    time.sleep(RESET_TIMEOUT)
+    breaker.allow_request()
+
+    breaker.record_success()
+
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.consecutive_failures == 0
+    assert breaker.allow_request() and breaker.allow_request()
+
+
+def test_failed_trial_reopens_the_breaker():
+    breaker = tripped_breaker()
+    time.sleep(RESET_TIMEOUT)
+    breaker.allow_request()
+
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+
+
+def test_unreported_trial_expires():
+    """A trial that never reports back doesn't block the provider forever"""
+    breaker = tripped_breaker()
+    time.sleep(RESET_TIMEOUT)
+    assert breaker.allow_request()
+
+    time.sleep(RESET_TIMEOUT)
+    assert breaker.allow_request()
+
+
+def test_registry_trips_each_data_type_independently():
+    registry = CircuitBreakerRegistry({'circuit_breaker_failure_threshold': 1})
+
+    registry.record('polygon', 'options_chains', False)
+
+    assert not registry.allow_request('polygon', 'options_chains')
+    assert registry.allow_request('polygon', 'quotes')
+    assert registry.get_provider_state('polygon')['options_chains']['state'] == CircuitBreaker.OPEN
+
+
+def test_disabled_registry_allows_everything():
+    registry = CircuitBreakerRegistry({'circuit_breaker_enabled': False, 'circuit_breaker_failure_threshold': 1})
+
+    registry.record('polygon', 'quotes', False)
+
+    assert registry.allow_request('polygon', 'quotes')
+
+
+# Provider scoreboard
+
+def provider(name: str, cost: float = 0.0, rate_limit=None) -> SimpleNamespace:
+    return SimpleNamespace(provider_name=name, config={'cost_per_request': cost}, rate_limit=rate_limit, daily_limit=None)
+
+
+def names(providers) -> list:
+    return [p.provider_name for p in providers]
+
+
+def test_rank_orders_by_latency_and_errors():
+    scoreboard = ProviderScoreboard({})
+    for _ in range(10):
+        scoreboard.record('slow', 'quotes', 0.8, True)
+        scoreboard.record('flaky', 'quotes', 0.1, False)
+        scoreboard.record('fast', 'quotes', 0.1, True)
+
+    assert names(scoreboard.rank([provider('slow'), provider('flaky'), provider('fast')], 'quotes')) == ['fast', 'slow', 'flaky']
+
+
+def test_cheaper_provider_does_not_displace_the_default():
+    """Equal quality, so the paid default keeps its place despite the free fallback's cost score"""
+    scoreboard = ProviderScoreboard({})
+
+    ranked = scoreboard.rank([provider('free'), provider('paid', cost=0.01)], 'quotes', default='paid')
+
+    assert names(ranked) == ['paid', 'free']
+    assert names(scoreboard.rank([provider('free'), provider('paid', cost=0.01)], 'quotes')) == ['free', 'paid']
+
+
+def test_better_quality_provider_goes_ahead_of_the_default():
+    scoreboard = ProviderScoreboard({})
+    for _ in range(10):
+        scoreboard.record('default', 'quotes', 2.0, True)
+        scoreboard.record('backup', 'quotes', 0.1, True)
+
+    assert names(scoreboard.rank([provider('default'), provider('backup')], 'quotes', default='default')) == ['backup', 'default']
+
+
+def test_exhausted_budget_ranks_last():
+    scoreboard = ProviderScoreboard({})
+    scoreboard.record('limited', 'quotes', 0.1, True, requests=5)
+
+    limited = provider('limited', rate_limit=5)
+
+    assert scoreboard.budget_remaining(limited) == 0.0
+    assert scoreboard.quality(limited, 'quotes') == 0.0
+    assert names(scoreboard.rank([limited, provider('other')], 'quotes', default='limited')) == ['other', 'limited']
+
+
+def test_disabled_scoreboard_keeps_configured_order():
+    scoreboard = ProviderScoreboard({'enabled': False})
+    for _ in range(10):
+        scoreboard.record('slow', 'quotes', 2.0, False)
+
+    assert names(scoreboard.rank([provider('slow'), provider('fast')], 'quotes')) == ['slow', 'fast']
@@ -0,0 +1,186 @@
+"""
+Tests for streaming quote ingest
+Runs the Polygon streaming provider against the local replay server, without network access
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from data.models import MARKET_TIMEZONE
+from data.providers.http import HttpClientFactory
+from data.providers.streaming import PolygonStreamingProvider, QuoteBook
+from replay_server import ReplayServer
+
+
+# Book entries expire after 50ms
+SHORT_MAX_AGE = 0.05
+
+
+async def eventually(predicate, timeout: float = 2) -> bool:
+    """Poll predicate until it holds or timeout passes"""
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        await asyncio.sleep(0.01)
+    return True
+
+
+# Quote book
+
+def test_quote_updates_build_a_quote_with_a_midpoint_mark():
+    book = QuoteBook('test_stream')
+    exchange_time = datetime(2030, 1, 2, 10, 30, tzinfo=MARKET_TIMEZONE)
+
+    book.apply_quote('AAA', 10.0, 10.5, 3, 4, exchange_time)
+    quote = book.get('AAA')
+
+    assert (quote.bid, quote.ask, quote.mark) == (Decimal('10'), Decimal('10.5'), Decimal('10.25'))
+    assert (quote.bid_size, quote.ask_size) == (3, 4)
+    assert quote.timestamp == exchange_time and quote.source == 'test_stream'
+    assert book.stats['quote_updates'] == 1
+
+
+def test_trades_update_last_and_keep_the_quote():
+    book = QuoteBook('test_stream')
+
+    book.apply_trade('AAA', 12.0, 100)
+    assert book.get('AAA').mark == Decimal('12')
+
+    book.apply_quote('AAA', 11.0, 13.0)
+    book.apply_trade('AAA', 12.5, 50)
+    quote = book.get('AAA')
+
+    assert quote.last == Decimal('12.5') and quote.bid == Decimal('11') and quote.mark == Decimal('12')
+    assert book.stats['trade_updates'] == 2
+
+
+@pytest.mark.asyncio
+async def test_entries_expire_after_max_age():
+    book = QuoteBook('test_stream', max_age_seconds=SHORT_MAX_AGE)
+    assert book.age('AAA') is None and book.get('AAA') is None
+
+    book.apply_quote('AAA', 10.0, 10.5)
+    assert book.age('AAA') < SHORT_MAX_AGE and book.get('AAA') is not None
+
+    await asyncio.sleep(SHORT_MAX_AGE * 2)
+
+    assert book.age('AAA') >= SHORT_MAX_AGE * 2
+    assert book.get('AAA') is None
+    assert book.get('AAA', max_age_seconds=10) is not None
+    assert book.stats['stale_reads'] == 1 and 'AAA' in book
+
+
+def test_discarded_symbols_leave_the_book():
+    book = QuoteBook('test_stream')
+    book.apply_quote('AAA', 10.0, 10.5)
+    book.apply_quote('BBB', 20.0, 20.5)
+
+    book.discard(['AAA', 'ZZZ'])
+
+    assert 'AAA' not in book and len(book) == 1
+
+
+def test_polygon_events_are_applied_with_market_time():
+    stream = PolygonStreamingProvider({'api_key': 'key'})
+    timestamp_ms = 1893601800000
+
+    stream._handle_message(json.dumps([
+        {'ev': 'Q', 'sym': 'AAA', 'bp': 10.0, 'bs': 3, 'ap': 10.5, 'as': 4, 't': timestamp_ms},
+        {'ev': 'T', 'sym': 'AAA', 'p': 10.25, 's': 100, 't': timestamp_ms}
+    ]))
+    quote = stream.get_quote('AAA')
+
+    assert quote.last == Decimal('10.25') and quote.bid_size == 3
+    assert quote.timestamp == datetime.fromtimestamp(timestamp_ms / 1000, MARKET_TIMEZONE)
+    assert quote.timestamp.tzinfo is MARKET_TIMEZONE
+
+
+# Replay server round trips
+
+@asynccontextmanager
+async def replay_server(api_key=None):
+    """Yields (replay, ws_url) for a replay server on a loopback port"""
+    replay = ReplayServer(argparse.Namespace(api_key=api_key))
+    app = web.Application()
+    app.router.add_get('/stocks', replay.handle)
+    server = TestServer(app)
+    await server.start_server()
+    try:
+        yield replay, str(server.make_url('/stocks')).replace('http', 'ws', 1)
+    finally:
+        await server.close()
+
+
+@asynccontextmanager
+async def running_stream(url: str, symbols=(), **config):
+    stream = PolygonStreamingProvider({'api_key': 'key', 'url': url, 'reconnect_delay_seconds': 0.05, **config})
+    stream.set_http_client(HttpClientFactory())
+    await stream.subscribe(symbols)
+    await stream.start()
+    try:
+        yield stream
+    finally:
+        await stream.stop()
+        await stream.http_client.close()
+
+
+def quote_event(symbol: str, bid: float) -> dict:
+    return {'ev': 'Q', 'sym': symbol, 'bp': bid, 'bs': 1, 'ap': bid + 0.5, 'as': 1, 't': int(time.time() * 1000)}
+
+
+def subscribed(replay: ReplayServer, channel: str) -> bool:
+    return any(channel in channels for channels in replay.clients.values())
+
+
+@pytest.mark.asyncio
+async def test_stream_subscribes_and_applies_ticks():
+    async with replay_server() as (replay, url), running_stream(url, ['AAA']) as stream:
+        assert await stream.wait_connected(2)
+        assert await eventually(lambda: subscribed(replay, 'Q.AAA') and subscribed(replay, 'T.AAA'))
+
+        await replay.broadcast([quote_event('AAA', 10.0), quote_event('BBB', 20.0)])
+
+        assert await eventually(lambda: stream.get_quote('AAA') is not None)
+        assert stream.get_quote('AAA').bid == Decimal('10')
+        assert 'BBB' not in stream.book
+
+        # Subscriptions made while connected are sent straight away
+        await stream.subscribe(['BBB'])
+        assert await eventually(lambda: subscribed(replay, 'Q.BBB'))
+        await replay.broadcast([quote_event('BBB', 20.0)])
+        assert await eventually(lambda: stream.get_quote('BBB') is not None)
+
+
+@pytest.mark.asyncio
+async def test_stream_reconnects_and_resubscribes_after_the_server_drops():
+    async with replay_server() as (replay, url), running_stream(url, ['AAA']) as stream:
+        assert await eventually(lambda: subscribed(replay, 'Q.AAA'))
+
+        for ws in list(replay.clients):
+            await ws.close()
+
+        assert await eventually(lambda: stream.stats['connects'] == 2 and subscribed(replay, 'Q.AAA'))
+        assert stream.stats['disconnects'] == 1
+
+        await replay.broadcast([quote_event('AAA', 11.0)])
+        assert await eventually(lambda: stream.get_quote('AAA') is not None)
+        assert stream.get_quote('AAA').bid == Decimal('11')
+
+
+@pytest.mark.asyncio
+async def test_rejected_api_key_stops_reconnecting():
+    async with replay_server(api_key='other') as (replay, url), running_stream(url, ['AAA']) as stream:
+        assert await eventually(lambda: stream._task.done())
+
+        assert not stream.is_connected and stream.stats['connects'] == 0
+        assert 'authentication failed' in stream.last_error